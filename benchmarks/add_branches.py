@@ -0,0 +1,55 @@
+"""Time attaching many zones to one VAV air loop with reheat.
+
+Compares ``AirLoopHVAC.add_branches`` against the per-zone pattern of
+creating a terminal, adding its coil to the plant loop and calling
+``add_branch``. Run from the repository root:
+
+    python benchmarks/add_branches.py [zones]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import osmosis as osmo  # noqa: E402
+
+
+def _setup(zone_count: int):
+    model = osmo.Model.new()
+    loop = model.air_loop.create(name="VAV")
+    hot_water = model.plant_loop.create(name="HW Loop")
+    zones = [model.thermal_zone.create(name=f"Zone {index}") for index in range(zone_count)]
+    return model, loop, hot_water, zones
+
+
+def bench_add_branches(zone_count: int) -> float:
+    model, loop, hot_water, zones = _setup(zone_count)
+    template = model.air_terminal_single_duct_vav_reheat.create(name="Template")
+    start = time.perf_counter()
+    loop.add_branches(zones, template, plant_loop=hot_water)
+    return time.perf_counter() - start
+
+
+def bench_add_branch_loop(zone_count: int) -> float:
+    model, loop, hot_water, zones = _setup(zone_count)
+    start = time.perf_counter()
+    for zone in zones:
+        terminal = model.air_terminal_single_duct_vav_reheat.create(
+            name=f"{zone.name} Air Terminal"
+        )
+        hot_water.add_demand(terminal.reheat_coil)
+        loop.add_branch(zone, terminal=terminal)
+    return time.perf_counter() - start
+
+
+def main(zone_count: int = 500) -> None:
+    print(f"{zone_count} zones")
+    print(f"  add_branches:        {bench_add_branches(zone_count):8.2f} s")
+    print(f"  add_branch per zone: {bench_add_branch_loop(zone_count):8.2f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,64 @@
+"""Time Model.auto_zone on an importer-style model with one zone per space.
+
+Builds a grid of box spaces on several stories, each in its own thermal
+zone, matches their surfaces, then plans (``dry_run=True``) and applies
+story + orientation zoning. Run from the repository root:
+
+    python benchmarks/auto_zone.py [spaces]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openstudio  # noqa: E402
+
+import osmosis as osmo  # noqa: E402
+
+
+def _build(space_count: int) -> osmo.Model:
+    model = osmo.Model.new()
+    per_story = 200
+    stories = [
+        model.building_story.create(name=f"Level {index + 1}")
+        for index in range((space_count + per_story - 1) // per_story)
+    ]
+    for index in range(space_count):
+        x, y = (index % 20) * 10.0, ((index // 20) % 10) * 10.0
+        z = (index // per_story) * 3.0
+        points = openstudio.Point3dVector()
+        for px, py in ((x, y), (x, y + 10), (x + 10, y + 10), (x + 10, y)):
+            points.append(openstudio.Point3d(px, py, z))
+        raw_space = openstudio.model.Space.fromFloorPrint(points, 3.0, model.raw).get()
+        raw_space.setBuildingStory(stories[index // per_story].raw)
+        raw_space.setThermalZone(openstudio.model.ThermalZone(model.raw))
+    model.intersect_and_match(intersect=False)
+    return model
+
+
+def bench_plan(model: osmo.Model) -> tuple[float, dict]:
+    start = time.perf_counter()
+    plan = model.auto_zone(strategy=("story", "orientation"), dry_run=True)
+    return time.perf_counter() - start, plan
+
+
+def bench_apply(model: osmo.Model, remove_empty: bool) -> float:
+    start = time.perf_counter()
+    model.auto_zone(strategy=("story", "orientation"), remove_empty=remove_empty)
+    return time.perf_counter() - start
+
+
+def main(space_count: int = 2000) -> None:
+    model = _build(space_count)
+    elapsed, plan = bench_plan(model)
+    print(f"{space_count} spaces -> {len(plan['zones'])} zones")
+    print(f"  plan (dry run):          {elapsed:8.2f} s")
+    print(f"  apply, keep old zones:   {bench_apply(_build(space_count), False):8.2f} s")
+    print(f"  apply, remove old zones: {bench_apply(model, True):8.2f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
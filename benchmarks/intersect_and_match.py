@@ -0,0 +1,63 @@
+"""Time index-pruned surface intersection against the full SDK pass.
+
+Builds a grid of box spaces on several stories, with some smaller boxes so
+intersection has walls to split, then compares ``Model.intersect_and_match()``
+with ``openstudio.model.intersectSurfaces`` and ``matchSurfaces`` over every
+space. Run from the repository root:
+
+    python benchmarks/intersect_and_match.py [spaces]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openstudio  # noqa: E402
+
+import osmosis as osmo  # noqa: E402
+
+
+def _build(space_count: int) -> osmo.Model:
+    model = osmo.Model.new()
+    per_story = 200
+    for index in range(space_count):
+        column, row = index % 20, (index // 20) % 10
+        x, y, z = column * 10.0, row * 10.0, (index // per_story) * 3.0
+        width = 7.0 if (column + row) % 3 == 0 else 10.0
+        points = openstudio.Point3dVector()
+        for px, py in ((x, y), (x, y + width), (x + width, y + width), (x + width, y)):
+            points.append(openstudio.Point3d(px, py, z))
+        openstudio.model.Space.fromFloorPrint(points, 3.0, model.raw).get()
+    return model
+
+
+def bench_full_sdk(model: osmo.Model) -> float:
+    spaces = openstudio.model.SpaceVector(model.raw.getSpaces())
+    start = time.perf_counter()
+    openstudio.model.intersectSurfaces(spaces)
+    openstudio.model.matchSurfaces(spaces)
+    return time.perf_counter() - start
+
+
+def bench_intersect_and_match(model: osmo.Model) -> tuple[float, dict]:
+    start = time.perf_counter()
+    report = model.intersect_and_match()
+    return time.perf_counter() - start, report
+
+
+def main(space_count: int = 2000) -> None:
+    print(f"{space_count} spaces")
+    print(f"  full SDK pass:         {bench_full_sdk(_build(space_count)):8.2f} s")
+    elapsed, report = bench_intersect_and_match(_build(space_count))
+    print(f"  intersect_and_match(): {elapsed:8.2f} s")
+    print(
+        f"  pairs checked {report['pairs_checked']} of {report['pairs_candidate']} "
+        f"touching ({report['pairs_total']} total)"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,63 @@
+"""Time whole-model space geometry extraction against per-space wrappers.
+
+Builds a grid of box spaces on several stories, then compares
+``Model.space_geometry()`` with reading ``Space.polygon_2d()``,
+``floor_area`` and ``volume`` space by space. Run from the repository root:
+
+    python benchmarks/space_geometry.py [spaces]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openstudio  # noqa: E402
+
+import osmosis as osmo  # noqa: E402
+
+
+def _build(space_count: int) -> osmo.Model:
+    model = osmo.Model.new()
+    per_story = 200
+    stories = [
+        model.building_story.create(name=f"Level {index + 1}")
+        for index in range((space_count + per_story - 1) // per_story)
+    ]
+    for index in range(space_count):
+        x, y = (index % 50) * 10.0, ((index // 50) % 4) * 10.0
+        z = (index // per_story) * 3.0
+        points = openstudio.Point3dVector()
+        for px, py in ((x, y), (x, y + 10), (x + 10, y + 10), (x + 10, y)):
+            points.append(openstudio.Point3d(px, py, z))
+        raw_space = openstudio.model.Space.fromFloorPrint(points, 3.0, model.raw).get()
+        raw_space.setBuildingStory(stories[index // per_story].raw)
+    return model
+
+
+def bench_space_geometry(model: osmo.Model) -> float:
+    start = time.perf_counter()
+    model.space_geometry()
+    return time.perf_counter() - start
+
+
+def bench_per_space(model: osmo.Model) -> float:
+    start = time.perf_counter()
+    for space in model.spaces:
+        space.polygon_2d()
+        space.floor_area
+        space.volume
+    return time.perf_counter() - start
+
+
+def main(space_count: int = 5000) -> None:
+    model = _build(space_count)
+    print(f"{space_count} spaces")
+    print(f"  space_geometry(): {bench_space_geometry(model):8.2f} s")
+    print(f"  per-space loop:   {bench_per_space(model):8.2f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,67 @@
+"""Time building a hospital-style VAV reheat system with a SystemTemplate.
+
+Zones are split into wings, each served by its own VAV air loop; every
+wing shares one hot-water and one chilled-water plant. Run from the
+repository root:
+
+    python benchmarks/system_template.py [zones] [wings]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import osmosis as osmo  # noqa: E402
+
+HOSPITAL_VAV = {
+    "name": "Hospital VAV",
+    "air_loop": {
+        "name": "{group} AHU",
+        "supply": [
+            {"type": "fan_variable_volume", "name": "{loop} Supply Fan"},
+            {"type": "coil_heating_water", "name": "{loop} Preheat Coil", "plant": "hw"},
+            {"type": "coil_cooling_water", "name": "{loop} Cooling Coil", "plant": "chw"},
+        ],
+        "outdoor_air": True,
+        "managers": [{"type": "setpoint_manager_scheduled", "value": 12.8}],
+        "terminal": {
+            "type": "air_terminal_single_duct_vav_reheat",
+            "name": "{zone} VAV",
+            "plant": "hw",
+        },
+    },
+    "plants": {
+        "hw": {
+            "name": "Hot Water Loop",
+            "supply": ["boiler_hot_water"],
+            "managers": [{"type": "setpoint_manager_scheduled", "value": 82.0}],
+            "sizing": {"loop_type": "Heating"},
+        },
+        "chw": {
+            "name": "Chilled Water Loop",
+            "supply": ["chiller_electric_eir"],
+            "managers": [{"type": "setpoint_manager_scheduled", "value": 6.7}],
+            "sizing": {"loop_type": "Cooling"},
+        },
+    },
+}
+
+
+def main(zone_count: int = 1000, wings: int = 20) -> None:
+    model = osmo.Model.new()
+    zones = [model.thermal_zone.create(name=f"Room {index}") for index in range(zone_count)]
+    groups = {f"Wing {wing + 1}": zones[wing::wings] for wing in range(wings)}
+
+    start = time.perf_counter()
+    build = model.apply_system_template(HOSPITAL_VAV, groups)
+    elapsed = time.perf_counter() - start
+
+    print(f"{zone_count} zones, {len(build.air_loops)} air loops: {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    main(*args)
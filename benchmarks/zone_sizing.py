@@ -0,0 +1,65 @@
+"""Time bulk zone sizing against the per-zone ThermalZone helpers.
+
+Applies design supply air temperatures and DOAS sizing to every zone, once
+through ``ThermalZone.set_sizing_supply_air_temperatures`` and
+``configure_dedicated_outdoor_air_sizing`` and once through
+``Model.configure_zone_sizing``. Run from the repository root:
+
+    python benchmarks/zone_sizing.py [zones]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import osmosis as osmo  # noqa: E402
+
+_DOAS = {
+    "low_setpoint_temperature": 18.0,
+    "high_setpoint_temperature": 21.0,
+    "control_strategy": "ColdSupplyAir",
+}
+
+
+def _build(zone_count: int) -> osmo.Model:
+    model = osmo.Model.new()
+    for index in range(zone_count):
+        model.thermal_zone.create(name=f"Zone {index}")
+    return model
+
+
+def bench_per_zone(model: osmo.Model) -> float:
+    start = time.perf_counter()
+    for index, zone in enumerate(model.thermal_zones):
+        zone.set_sizing_supply_air_temperatures(cooling=12.0 + index % 3, heating=35.0)
+        zone.configure_dedicated_outdoor_air_sizing(
+            _DOAS["low_setpoint_temperature"],
+            _DOAS["high_setpoint_temperature"],
+            _DOAS["control_strategy"],
+        )
+    return time.perf_counter() - start
+
+
+def bench_configure_zone_sizing(model: osmo.Model) -> float:
+    zones = model.raw.getThermalZones()
+    start = time.perf_counter()
+    model.configure_zone_sizing(
+        zones,
+        cooling=[12.0 + index % 3 for index in range(len(zones))],
+        heating=35.0,
+        doas=dict(_DOAS, heating_maximum_air_flow_fraction=1.0),
+    )
+    return time.perf_counter() - start
+
+
+def main(zone_count: int = 2000) -> None:
+    print(f"{zone_count} zones")
+    print(f"  per-zone helpers:        {bench_per_zone(_build(zone_count)):8.2f} s")
+    print(f"  configure_zone_sizing(): {bench_configure_zone_sizing(_build(zone_count)):8.2f} s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -9,6 +9,14 @@ from .base import OsmObject
 from .convert import Convert
 from .registry import wrap, wrap_collection, register_custom_wrapper
 from .manager import ComponentManager
+from .property_index import PropertyIndex
+from .setpoint_index import SetpointConflict, SetpointManagerIndex
+from .space_geometry import SpaceGeometry
+from .spatial_index import SpatialIndex
+from .space_type_library import SpaceTypeLibrary
+from .topology import AirLoopTopology
+from .system_template import SystemBuild, SystemTemplate
+from .water_index import WaterComponentIndex
 
 # Import custom wrappers to register them
 from .space import Space
@@ -42,6 +50,7 @@ from .coil_heating_electric import CoilHeatingElectric
 from .water_coil import CoilCoolingWater, CoilHeatingWater
 from .air_loop_hvac_unitary_system import AirLoopHVACUnitarySystem
 from .schedules import create_daily_schedule
+from .export import export_diagrams
 
 # Suppress SWIG memory leak warnings
 warnings.filterwarnings("ignore", message="swig/python detected a memory leak")
@@ -53,6 +62,16 @@ __all__ = [
     "OsmObject",
     "Convert",
     "ComponentManager",
+    "PropertyIndex",
+    "SetpointManagerIndex",
+    "SetpointConflict",
+    "SpaceGeometry",
+    "SpatialIndex",
+    "SpaceTypeLibrary",
+    "AirLoopTopology",
+    "SystemTemplate",
+    "SystemBuild",
+    "WaterComponentIndex",
     "Space",
     "SpaceType",
     "ThermalZone",
@@ -86,6 +105,7 @@ __all__ = [
     "CoilHeatingWater",
     "AirLoopHVACUnitarySystem",
     "create_daily_schedule",
+    "export_diagrams",
     "wrap",
     "wrap_collection",
     "register_custom_wrapper",
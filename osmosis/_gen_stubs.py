@@ -46,6 +46,7 @@ from .plant_loop import PlantLoop
 from .schedule_constant import ScheduleConstant
 from .base import OsmObject
 from .manager import ComponentManager
+from .controller_outdoor_air import OutdoorAirControllerManager
 """
 
 MODEL_HEADER = """\
@@ -66,6 +67,8 @@ class Model:
     def air_loops(self) -> list[AirLoopHVAC]: ...
     @property
     def plant_loops(self) -> list[PlantLoop]: ...
+    @property
+    def outdoor_air_controllers(self) -> OutdoorAirControllerManager: ...
     def __getattr__(self, name: str) -> Any: ...
 """
 
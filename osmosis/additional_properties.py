@@ -1,9 +1,90 @@
 """AdditionalProperties wrapper for custom key-value storage"""
 
-from typing import Any
+from __future__ import annotations
+
+import weakref
+from typing import Any, Mapping
 from .base import OsmObject
 from .registry import register_custom_wrapper
 
+# Stored feature data type -> typed SDK getter
+_FEATURE_GETTERS = {
+    "String": "getFeatureAsString",
+    "Double": "getFeatureAsDouble",
+    "Integer": "getFeatureAsInteger",
+    "Boolean": "getFeatureAsBoolean",
+}
+
+_MISSING = object()
+
+# Live PropertyIndex objects notified when features change through Osmosis
+_feature_listeners: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def _read_feature(raw_props, name: str) -> Any:
+    """Read one feature with a single typed getter, or return ``_MISSING``."""
+    data_type = raw_props.getFeatureDataType(name)
+    if not data_type.is_initialized():
+        return _MISSING
+
+    getter = _FEATURE_GETTERS.get(data_type.get())
+    if getter is None:
+        return _MISSING
+
+    result = getattr(raw_props, getter)(name)
+    if result.is_initialized():
+        return result.get()
+    return _MISSING
+
+
+def _read_features(raw_props) -> dict[str, Any]:
+    """Read every feature on a raw AdditionalProperties object."""
+    values = {}
+    for name in raw_props.featureNames():
+        value = _read_feature(raw_props, name)
+        if value is not _MISSING:
+            values[name] = value
+    return values
+
+
+def _existing_properties(raw_obj):
+    """Return a model object's raw AdditionalProperties without creating one."""
+    has_props = getattr(raw_obj, "hasAdditionalProperties", None)
+    if has_props is not None and not has_props():
+        return None
+    return raw_obj.additionalProperties()
+
+
+def _coerce_feature_value(value: Any) -> Any:
+    """Return a value OpenStudio can store, converting unknown types to str."""
+    if isinstance(value, (str, bool, int, float)):
+        return value
+    return str(value)
+
+
+def _write_feature(raw_props, name: str, value: Any) -> None:
+    """Set one feature, raising ValueError when OpenStudio rejects it."""
+    value = _coerce_feature_value(value)
+    if not raw_props.setFeature(name, value):
+        raise ValueError(f"Failed to set feature '{name}' "
+                         f"with value {value!r}")
+    _notify_feature_changed(raw_props, name, value)
+
+
+def _notify_feature_changed(
+    raw_props,
+    name: str,
+    value: Any = _MISSING,
+    raw_owner=None,
+) -> None:
+    """Tell live property indexes that a feature was set or reset."""
+    if not _feature_listeners:
+        return
+    if raw_owner is None:
+        raw_owner = raw_props.modelObject()
+    for listener in list(_feature_listeners):
+        listener._feature_changed(raw_owner, name, value)
+
 
 @register_custom_wrapper('AdditionalProperties')
 class AdditionalProperties(OsmObject):
@@ -31,6 +112,10 @@ class AdditionalProperties(OsmObject):
 
         # Get all feature names
         print(props.feature_names)
+
+        # Bulk read and write
+        props.update({"tenant": "A", "floor": 3})
+        print(props.to_dict())
     """
 
     @property
@@ -40,54 +125,20 @@ class AdditionalProperties(OsmObject):
 
     def __getattr__(self, name: str):
         """
-        Get feature value by name with automatic type detection.
+        Get feature value by name using the feature's stored data type.
 
-        Tries to get the value in the most appropriate type order:
-        1. String
-        2. Double
-        3. Integer
-        4. Boolean
+        The stored type (String, Double, Integer or Boolean) selects the
+        matching ``getFeatureAs*`` call, so each read is a single typed lookup.
         """
         if name.startswith("_"):
             raise AttributeError(f"'{type(self).__name__}' "
                                  f"has no attribute '{name}'")
 
-        # Try different data types in order of preference
-        try:
-            # Try as string first (most flexible)
-            result = self._os_obj.getFeatureAsString(name)
-            if result.is_initialized():
-                return result.get()
-        except Exception:
-            pass
-
-        try:
-            # Try as double
-            result = self._os_obj.getFeatureAsDouble(name)
-            if result.is_initialized():
-                return result.get()
-        except Exception:
-            pass
-
-        try:
-            # Try as integer
-            result = self._os_obj.getFeatureAsInteger(name)
-            if result.is_initialized():
-                return result.get()
-        except Exception:
-            pass
-
-        try:
-            # Try as boolean
-            result = self._os_obj.getFeatureAsBoolean(name)
-            if result.is_initialized():
-                return result.get()
-        except Exception:
-            pass
-
-        # Feature doesn't exist
-        raise AttributeError(f"'{type(self).__name__}' "
-                             f"has no feature '{name}'")
+        value = _read_feature(self._os_obj, name)
+        if value is _MISSING:
+            raise AttributeError(f"'{type(self).__name__}' "
+                                 f"has no feature '{name}'")
+        return value
 
     def __setattr__(self, name: str, value: Any):
         """
@@ -97,22 +148,7 @@ class AdditionalProperties(OsmObject):
             object.__setattr__(self, name, value)
             return
 
-        # Determine data type and call appropriate setFeature method
-        if isinstance(value, str):
-            success = self._os_obj.setFeature(name, value)
-        elif isinstance(value, float):
-            success = self._os_obj.setFeature(name, value)
-        elif isinstance(value, int):
-            success = self._os_obj.setFeature(name, value)
-        elif isinstance(value, bool):
-            success = self._os_obj.setFeature(name, value)
-        else:
-            # Convert to string as fallback
-            success = self._os_obj.setFeature(name, str(value))
-
-        if not success:
-            raise ValueError(f"Failed to set feature '{name}' "
-                             f"with value {value!r}")
+        _write_feature(self._os_obj, name, value)
 
     def __delattr__(self, name: str):
         """Delete a feature by name"""
@@ -124,6 +160,7 @@ class AdditionalProperties(OsmObject):
         if not success:
             raise AttributeError(f"Feature '{name}' does not exist "
                                  f"or could not be reset")
+        _notify_feature_changed(self._os_obj, name)
 
     def __contains__(self, name: str) -> bool:
         """Check if a feature exists"""
@@ -136,6 +173,16 @@ class AdditionalProperties(OsmObject):
         except AttributeError:
             return default
 
+    def to_dict(self) -> dict[str, Any]:
+        """Return all features as a ``{name: value}`` dictionary."""
+        return _read_features(self._os_obj)
+
+    def update(self, values: Mapping[str, Any] | None = None, **kwargs) -> None:
+        """Set several features at once from a mapping and/or keyword args."""
+        items = dict(values or {}, **kwargs)
+        for name, value in items.items():
+            _write_feature(self._os_obj, name, value)
+
     def setdefault(self, name: str, default: Any) -> Any:
         """Get feature value, setting it to default if it doesn't exist"""
         if name not in self:
@@ -155,11 +202,11 @@ class AdditionalProperties(OsmObject):
         if not features:
             return "<strong>AdditionalProperties:</strong> (empty)"
 
+        values = self.to_dict()
         html = "<strong>AdditionalProperties:</strong><br>"
         for name in sorted(features):
-            try:
-                value = getattr(self, name)
-                html += f"&nbsp;&nbsp;{name}: {value!r}<br>"
-            except Exception:
+            if name in values:
+                html += f"&nbsp;&nbsp;{name}: {values[name]!r}<br>"
+            else:
                 html += f"&nbsp;&nbsp;{name}: (error retrieving)<br>"
         return html
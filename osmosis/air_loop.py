@@ -2,11 +2,50 @@
 
 from __future__ import annotations
 
+import functools
+
 import openstudio
 
 from .base import OsmObject
-from .registry import register_custom_wrapper, wrap, wrap_collection
-from .mermaid import MermaidDiagram, build_mermaid_diagram, _idd_type, _is_oa_system, _cast
+from .registry import (
+    _concrete,
+    in_category,
+    register_custom_wrapper,
+    wrap,
+    wrap_collection,
+)
+from .additional_properties import _MISSING, _existing_properties, _read_feature
+from .mermaid import (
+    AirLoopSnapshot,
+    MermaidDiagram,
+    ZoneGroup,
+    air_loop_snapshot,
+    group_demand,
+    render_air_loop_mermaid,
+    _idd_type,
+    _is_oa_system,
+    _is_unitary_system,
+    _cast,
+    _node_id,
+    _optional_get,
+    _unitary_components,
+)
+from .svg import render_air_loop_svg
+from .topology import AirLoopTopology, air_loop_topology, invalidate_topology
+from .water_index import notify_plant_connected
+
+
+def _invalidates_topology(method):
+    """Drop the loop's cached topology after a composition change."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            invalidate_topology(self._os_obj)
+
+    return wrapper
 
 
 @register_custom_wrapper("AirLoopHVAC")
@@ -35,6 +74,7 @@ class AirLoopHVAC(OsmObject):
 
     # Air loop construction methods
 
+    @_invalidates_topology
     def add_to_supply(self, *components) -> "AirLoopHVAC":
         """
         Add components to the supply side in argument order.
@@ -57,6 +97,7 @@ class AirLoopHVAC(OsmObject):
                 )
         return self
 
+    @_invalidates_topology
     def add_branch(
         self,
         *zones,
@@ -77,6 +118,7 @@ class AirLoopHVAC(OsmObject):
             self._add_branch_for_zone(raw_zone, raw_terminal, priority)
         return self
 
+    @_invalidates_topology
     def add_branch_with_terminal(
         self,
         zone,
@@ -91,6 +133,176 @@ class AirLoopHVAC(OsmObject):
         )
         return self
 
+    @_invalidates_topology
+    def add_branches(
+        self,
+        zones,
+        terminal=None,
+        name_pattern: str = "{zone} Air Terminal",
+        plant_loop=None,
+        priority: int | None = None,
+        first_index: int = 0,
+    ) -> list[OsmObject]:
+        """
+        Attach many thermal zones in one pass, one new terminal per zone.
+
+        ``terminal`` is either a configured template terminal, which is
+        cloned for each zone (its reheat coil and settings come along), or a
+        callable ``factory(zone)`` returning a new terminal. Without one, a
+        constant-volume no-reheat terminal is created per zone. The template
+        itself is never attached.
+
+        Terminals are named with ``name_pattern``, which may use ``{zone}``
+        and ``{index}``; reheat coils are renamed "<terminal> Reheat Coil".
+        When ``plant_loop`` is given, each water reheat coil is added to its
+        demand side in the same pass.
+
+        If any zone fails, every branch added by this call is removed again
+        (with its terminal, coil and plant branch) before the error is
+        raised, so the loop is left as it was.
+
+        Args:
+            zones: Thermal zones to attach.
+            terminal: Template terminal, factory callable, or ``None``.
+            name_pattern: ``str.format`` pattern for terminal names.
+            plant_loop: Optional plant loop for water reheat coils.
+            priority: Zone equipment cooling and heating priority. ``None``
+                keeps OpenStudio's default ordering and skips the extra
+                priority calls per zone.
+            first_index: ``{index}`` of the first zone.
+
+        Returns:
+            The wrapped terminals, in zone order.
+        """
+        raw_loop = self._os_obj
+        raw_model = raw_loop.model()
+        raw_plant = OsmObject.unwrap(plant_loop) if plant_loop is not None else None
+        factory = terminal if callable(terminal) and not isinstance(terminal, OsmObject) else None
+        raw_template = (
+            OsmObject.unwrap(terminal) if terminal is not None and factory is None else None
+        )
+
+        attached = []
+        terminals = []
+        raw_terminal = None
+        try:
+            for index, zone in enumerate(zones, start=first_index):
+                raw_zone = OsmObject.unwrap(zone)
+                zone_name = raw_zone.nameString()
+                if raw_template is not None:
+                    raw_terminal = _concrete(raw_template.clone(raw_model))[0]
+                elif factory is not None:
+                    raw_terminal = _concrete(OsmObject.unwrap(factory(zone)))[0]
+                else:
+                    raw_terminal = self._branch_terminal(raw_zone)
+                terminal_name = name_pattern.format(zone=zone_name, index=index)
+                raw_terminal.setName(terminal_name)
+
+                if not raw_loop.addBranchForZone(raw_zone, raw_terminal):
+                    raise ValueError(
+                        f"OpenStudio rejected adding the zone branch for '{zone_name}'."
+                    )
+                attached.append(raw_zone)
+                placed, raw_terminal = raw_terminal, None
+
+                if priority is not None:
+                    if not raw_zone.setCoolingPriority(placed, priority):
+                        raise ValueError("OpenStudio rejected the terminal cooling priority.")
+                    if not raw_zone.setHeatingPriority(placed, priority):
+                        raise ValueError("OpenStudio rejected the terminal heating priority.")
+
+                reheat_coil = _terminal_reheat_coil(placed)
+                if reheat_coil is not None:
+                    reheat_coil.setName(f"{terminal_name} Reheat Coil")
+                    if raw_plant is not None and _idd_type(reheat_coil).startswith(
+                        "OS:Coil:Heating:Water"
+                    ):
+                        if not raw_plant.addDemandBranchForComponent(reheat_coil):
+                            raise ValueError(
+                                "OpenStudio rejected adding the reheat coil for "
+                                f"'{zone_name}' to plant loop '{raw_plant.nameString()}'."
+                            )
+                        notify_plant_connected(reheat_coil, raw_plant, "demand")
+                terminals.append(placed)
+        except Exception:
+            if raw_terminal is not None:
+                raw_terminal.remove()
+            for raw_zone in reversed(attached):
+                raw_loop.removeBranchForZone(raw_zone)
+            raise
+
+        return [wrap(raw) for raw in terminals]
+
+    def clone_for(
+        self,
+        zones=None,
+        count: int | None = None,
+        name_pattern: str = "{name} {index}",
+        terminal_pattern: str = "{zone} Air Terminal",
+        plant_loops=None,
+        share_schedules: bool = True,
+    ) -> list["AirLoopHVAC"]:
+        """
+        Copy this loop once per zone group, each copy serving its own zones.
+
+        Every copy gets the supply side, outdoor air system, ERV, setpoint
+        and availability managers in one OpenStudio clone. Cloned objects
+        are renamed from the new loop name ("AHU Fan" becomes "AHU 2 Fan").
+        Zones are attached with copies of this loop's first terminal.
+
+        If any copy fails, every object created by this call (loops,
+        terminals, coils and schedule copies) is removed again before the
+        error is raised.
+
+        Args:
+            zones: One entry per copy: a zone, or a list of zones.
+            count: Number of copies without zones, or a check on ``zones``.
+            name_pattern: Copy names; fields ``name``, ``index`` (from 1)
+                and ``zone`` (first zone of the group).
+            terminal_pattern: Terminal names; fields ``zone`` and ``index``
+                (position in the group, from 0).
+            plant_loops: Optional ``{source_plant: target_plant}`` mapping.
+                Water coils on unmapped plants stay on this loop's plants.
+            share_schedules: Reuse this loop's schedules. ``False`` gives
+                each copy its own copies of every non-constant schedule.
+
+        Returns:
+            The wrapped copies, in order.
+        """
+        from .cloning import _plant_map, clone_air_loops
+
+        if zones is None:
+            if count is None:
+                raise ValueError("clone_for() needs zones or a count.")
+            groups = [[] for _ in range(count)]
+        else:
+            groups = [
+                list(entry) if isinstance(entry, (list, tuple, set)) else [entry]
+                for entry in zones
+            ]
+            if count is not None and count != len(groups):
+                raise ValueError(
+                    f"count={count} does not match {len(groups)} zone groups."
+                )
+
+        names = [
+            name_pattern.format(
+                name=self.name,
+                index=index,
+                zone=OsmObject.unwrap(group[0]).nameString() if group else "",
+            )
+            for index, group in enumerate(groups, start=1)
+        ]
+        copies = clone_air_loops(
+            self,
+            groups,
+            names,
+            terminal_pattern,
+            _plant_map(plant_loops),
+            share_schedules,
+        )
+        return copies
+
     def _branch_terminal(self, raw_zone, terminal=None):
         if terminal is not None:
             return OsmObject.unwrap(terminal)
@@ -112,6 +324,7 @@ class AirLoopHVAC(OsmObject):
         if not raw_zone.setHeatingPriority(raw_terminal, priority):
             raise ValueError("OpenStudio rejected the terminal heating priority.")
 
+    @_invalidates_topology
     def add_outdoor_air(self, oa_system, controller_oa, controller_mech_vent):
         """Wire an OA system, OA controller, and mechanical ventilation controller
         together and attach the system to this air loop's supply inlet node.
@@ -131,6 +344,7 @@ class AirLoopHVAC(OsmObject):
 
         return wrap(raw_oa_system)
 
+    @_invalidates_topology
     def add_erv(
         self,
         sensible_effectiveness: float,
@@ -235,39 +449,155 @@ class AirLoopHVAC(OsmObject):
         """Get setpoint managers assigned to the supply outlet node."""
         return wrap_collection(self._os_obj.supplyOutletNode().setpointManagers())
 
+    def components_in(
+        self,
+        category: str,
+        include_subcomponents: bool = False,
+    ) -> list[OsmObject]:
+        """Supply-side components in a category, in airflow order.
+
+        Components are filtered on their IDD type before wrapping. Named so
+        that ``loop.components`` still reaches the SDK's list of every loop
+        component.
+
+        Args:
+            category: A category from ``osmosis.registry.category_index``
+                such as ``"coil"``, ``"coil/heating"``, ``"fan"`` or
+                ``"heat_exchanger"``.
+            include_subcomponents: Also search the outdoor air system's
+                intake and relief streams and inside unitary systems.
+        """
+        candidates = []
+        for raw in self._os_obj.supplyComponents():
+            if include_subcomponents:
+                if _is_oa_system(raw):
+                    oa_system = _cast(raw, "AirLoopHVACOutdoorAirSystem")
+                    candidates.extend(oa_system.oaComponents())
+                    candidates.extend(oa_system.reliefComponents())
+                elif _is_unitary_system(raw):
+                    candidates.extend(_unitary_components(raw))
+            candidates.append(raw)
+
+        matches = {}
+        for raw in candidates:
+            if in_category(raw, category):
+                matches.setdefault(str(raw.handle()), raw)
+        return wrap_collection(list(matches.values()))
+
     @property
     def coils(self) -> list[OsmObject]:
         """Get all supply-side coils on this air loop."""
-        return [
-            component
-            for component in self.supply_components
-            if type(component).__name__.startswith("Coil")
-        ]
+        return self.components_in("coil")
 
     @property
     def fans(self) -> list[OsmObject]:
         """Get all supply-side fans on this air loop."""
-        return [
-            component
-            for component in self.supply_components
-            if type(component).__name__.startswith("Fan")
-        ]
+        return self.components_in("fan")
+
+    def topology(self, refresh: bool = False) -> AirLoopTopology:
+        """Cached airflow graph of this loop's components, nodes and zones.
+
+        The graph is rebuilt after ``add_to_supply``, ``add_branch`` and the
+        other composition methods on this wrapper. Pass ``refresh=True``
+        after changing the loop through the raw SDK. The cache lives on the
+        ``Model`` and is dropped with it.
+        """
+        return air_loop_topology(self._os_obj, refresh=refresh)
+
+    def diagram_snapshot(self, zone_details: bool = False) -> AirLoopSnapshot:
+        """Capture this loop's diagram topology in a single traversal.
+
+        The snapshot's ``fingerprint`` changes whenever the loop structure or
+        any rendered name changes. ``zone_details`` also records each zone's
+        terminal, story and design flow for demand grouping.
+        """
+        return air_loop_snapshot(self._os_obj, zone_details)
+
+    def demand_groups(
+        self,
+        by: str = "terminal",
+        property_name: str | None = None,
+    ) -> dict[str, list[OsmObject]]:
+        """Group this loop's zones by terminal type, story, or space property.
+
+        Args:
+            by: ``"terminal"``, ``"story"``, or ``"property"``.
+            property_name: Space AdditionalProperties feature used when
+                ``by="property"``.
+
+        Returns:
+            ``{group_key: [ThermalZone, ...]}`` in diagram order.
+        """
+        _, groups = self._demand_groups(None, by, property_name)
+        zones = {_node_id(zone): zone for zone in self._os_obj.thermalZones()}
+        return {
+            group.key: [wrap(zones[zone.id]) for zone in group.zones]
+            for group in groups
+        }
+
+    def _demand_groups(
+        self,
+        snapshot: AirLoopSnapshot | None,
+        by: str | None,
+        property_name: str | None = None,
+    ) -> tuple[AirLoopSnapshot, tuple[ZoneGroup, ...] | None]:
+        """Snapshot to render and its zone groups, if grouping is requested.
+
+        Zone details are only read when grouping, so plain renders skip
+        the per-zone terminal, story and flow lookups.
+        """
+        if by is None:
+            return snapshot if snapshot is not None else self.diagram_snapshot(), None
+        if snapshot is None or not snapshot.zone_details:
+            snapshot = self.diagram_snapshot(zone_details=True)
+        values = None
+        if by == "property":
+            if not property_name:
+                raise ValueError("property_name is required when by='property'.")
+            values = _zone_property_values(self._os_obj, property_name)
+        return snapshot, group_demand(snapshot, by, values)
 
     def _build_mermaid(
         self,
         show_names: bool = True,
         minimize_demand: bool = False,
+        snapshot: AirLoopSnapshot | None = None,
+        group_demand: str | None = None,
+        property_name: str | None = None,
+        expand_groups=(),
     ) -> str:
         """Build a Mermaid flowchart string for this air loop.
 
         Nodes render as circles ``(( ))``, equipment as rectangles ``[ ]``,
         system boundaries as stadiums ``([ ])``, and zones as double
-        brackets ``[[ ]]``.
+        brackets ``[[ ]]``. ``group_demand`` draws one box per zone group
+        instead of one node per zone; see ``demand_groups``.
         """
-        return build_mermaid_diagram(
-            self._os_obj,
+        snapshot, groups = self._demand_groups(snapshot, group_demand, property_name)
+        return render_air_loop_mermaid(
+            snapshot,
+            show_names=show_names,
+            minimize_demand=minimize_demand,
+            demand_groups=groups,
+            expand_groups=frozenset(expand_groups),
+        )
+
+    def to_svg(
+        self,
+        show_names: bool = True,
+        minimize_demand: bool = False,
+        group_demand: str | None = None,
+        property_name: str | None = None,
+        expand_groups=(),
+    ) -> str:
+        """Render this air loop as a standalone SVG document without network access."""
+        snapshot, groups = self._demand_groups(None, group_demand, property_name)
+        return render_air_loop_svg(
+            snapshot,
             show_names=show_names,
             minimize_demand=minimize_demand,
+            demand_groups=groups,
+            expand_groups=frozenset(expand_groups),
         )
 
     def show(
@@ -277,23 +607,42 @@ class AirLoopHVAC(OsmObject):
         zoomable: bool = True,
         minimize_demand: bool = False,
         demand_toggle: bool = True,
+        renderer: str = "mermaid",
+        group_demand: str | None = None,
+        property_name: str | None = None,
+        expand_groups=(),
     ) -> None:
-        """Render the air loop as a Mermaid diagram in a Jupyter notebook."""
-        src = self._build_mermaid(
-            show_names=show_names,
-            minimize_demand=minimize_demand,
-        )
+        """Render the air loop as a diagram in a Jupyter notebook.
+
+        Args:
+            renderer: ``"mermaid"`` to fetch images from mermaid.ink, or
+                ``"svg"`` to lay out the diagram locally and embed it inline.
+            group_demand: ``"terminal"``, ``"story"``, or ``"property"`` to
+                draw one box per zone group with counts and design flow.
+            property_name: Space AdditionalProperties feature used when
+                ``group_demand="property"``.
+            expand_groups: Group keys to draw zone by zone.
+        """
+        if renderer not in ("mermaid", "svg"):
+            raise ValueError(f"renderer must be 'mermaid' or 'svg'; got {renderer!r}.")
+        snapshot, groups = self._demand_groups(None, group_demand, property_name)
+        expand = frozenset(expand_groups)
+        src = render_air_loop_mermaid(snapshot, show_names, minimize_demand, groups, expand)
         minimized_src = None
-        if demand_toggle and not minimize_demand and list(self._os_obj.thermalZones()):
-            minimized_src = self._build_mermaid(
-                show_names=show_names,
-                minimize_demand=True,
-            )
+        if demand_toggle and not minimize_demand and snapshot.zones:
+            minimized_src = render_air_loop_mermaid(snapshot, show_names, True)
+        svg = minimized_svg = None
+        if renderer == "svg":
+            svg = render_air_loop_svg(snapshot, show_names, minimize_demand, groups, expand)
+            if minimized_src is not None:
+                minimized_svg = render_air_loop_svg(snapshot, show_names, True)
         diagram = MermaidDiagram(
             src,
             width=width,
             zoomable=zoomable,
             minimized_source=minimized_src,
+            svg=svg,
+            minimized_svg=minimized_svg,
         )
         try:
             from IPython.display import HTML, display
@@ -301,3 +650,40 @@ class AirLoopHVAC(OsmObject):
             display(HTML(diagram._repr_html_()))
         except ImportError:
             print(src)
+
+
+def _terminal_reheat_coil(raw_terminal):
+    """Reheat coil of a concrete terminal, or ``None`` if it has none."""
+    getter = getattr(raw_terminal, "reheatCoil", None)
+    if getter is None:
+        return None
+    coil = getter()
+    if hasattr(coil, "is_initialized"):
+        coil = _optional_get(coil)
+    return _concrete(coil)[0] if coil is not None else None
+
+
+def _zone_property_values(raw_loop, property_name: str) -> dict[str, object]:
+    """First Space AdditionalProperties value per zone, keyed by diagram id."""
+    from .model import Model
+
+    names = tuple(
+        dict.fromkeys(
+            (Model._normalize_additional_property_name(property_name), property_name)
+        )
+    )
+    values = {}
+    for zone in raw_loop.thermalZones():
+        zone_id = _node_id(zone)
+        for space in zone.spaces():
+            raw_props = _existing_properties(space)
+            if raw_props is None:
+                continue
+            for name in names:
+                value = _read_feature(raw_props, name)
+                if value is not _MISSING:
+                    values[zone_id] = value
+                    break
+            if zone_id in values:
+                break
+    return values
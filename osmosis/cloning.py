@@ -0,0 +1,322 @@
+"""Clone air loops and plant loops with renaming and shared resources."""
+from __future__ import annotations
+
+from typing import Any, Iterable, Mapping
+
+from .base import OsmObject
+from .mermaid import _cast, _idd_type, _is_node, _is_oa_system, _optional_get
+from .registry import _concrete, in_category, wrap
+from .water_index import notify_plant_connected, notify_plant_disconnected
+
+
+def _renamed(name: str, old: str, new: str) -> str:
+    """Swap a loop-name prefix, or prefix names that do not carry one."""
+    if name == old:
+        return new
+    if name.startswith(old + " "):
+        return new + name[len(old):]
+    return f"{new} {name}"
+
+
+def _node_managers(raw_node) -> list:
+    return list(raw_node.to_Node().get().setpointManagers())
+
+
+class _Parts:
+    """Named loop parts keyed by where they sit, not by list position.
+
+    A key is ``(role, IDD type, ordinal)``: the role is the loop side
+    ("supply", "oa", "relief"), a fixed slot ("controller") or, for
+    setpoint managers, the node they sit on, itself keyed by the component
+    upstream of it. Source and clone parts are matched by key, so a part
+    missing on either side only affects itself.
+    """
+
+    def __init__(self):
+        self.by_key: dict[tuple, Any] = {}
+        self._seen: set[str] = set()
+        self._counts: dict[tuple, int] = {}
+
+    def add(self, role, raw) -> tuple | None:
+        handle = str(raw.handle())
+        if handle in self._seen:
+            return None
+        self._seen.add(handle)
+        return self.key(role, raw, store=raw)
+
+    def key(self, role, raw, store=None) -> tuple:
+        idd = _idd_type(raw)
+        ordinal = self._counts.get((role, idd), 0)
+        self._counts[(role, idd)] = ordinal + 1
+        key = (role, idd, ordinal)
+        if store is not None:
+            self.by_key[key] = store
+        return key
+
+    def values(self) -> list:
+        return list(self.by_key.values())
+
+
+def _add_side(parts: _Parts, role: str, components, managers: list) -> None:
+    """Add a side's components in flow order and remember each node's
+    managers, keying the node by the component just upstream of it."""
+    upstream: tuple = (role, "inlet")
+    for comp in components:
+        if _is_node(comp):
+            node_key = parts.key(("node", upstream), comp)
+            managers.extend((node_key, manager) for manager in _node_managers(comp))
+        else:
+            upstream = parts.add(role, comp) or upstream
+
+
+def _air_loop_parts(raw_loop) -> _Parts:
+    """Named objects of an air loop's supply side, keyed by position."""
+    parts, managers = _Parts(), []
+    _add_side(parts, "supply", raw_loop.supplyComponents(), managers)
+    for comp in list(parts.values()):
+        if _is_oa_system(comp):
+            oa_system = _cast(comp, "AirLoopHVACOutdoorAirSystem")
+            controller = oa_system.getControllerOutdoorAir()
+            parts.add("controller", controller)
+            parts.add("controller", controller.controllerMechanicalVentilation())
+            _add_side(parts, "oa", oa_system.oaComponents(), managers)
+            _add_side(parts, "relief", oa_system.reliefComponents(), managers)
+    for node_key, manager in managers:
+        parts.add(node_key, manager)
+    for manager in raw_loop.availabilityManagers():
+        parts.add("availability", manager)
+    return parts
+
+
+def _plant_loop_parts(raw_loop) -> _Parts:
+    """Named objects of a plant loop's supply side, keyed by position."""
+    parts, managers = _Parts(), []
+    connectors = {"OS:Connector:Splitter", "OS:Connector:Mixer"}
+    _add_side(
+        parts,
+        "supply",
+        [comp for comp in raw_loop.supplyComponents() if _idd_type(comp) not in connectors],
+        managers,
+    )
+    for node_key, manager in managers:
+        parts.add(node_key, manager)
+    for manager in raw_loop.availabilityManagers():
+        parts.add("availability", manager)
+    return parts
+
+
+def _rename_parts(source_parts: _Parts, cloned_parts: _Parts, old: str, new: str) -> None:
+    # Final names are derived from the new loop name, so each object is
+    # renamed once instead of probing for a free "<name> <n>" suffix.
+    for key, cloned in cloned_parts.by_key.items():
+        source = source_parts.by_key.get(key)
+        if source is not None:
+            cloned.setName(_renamed(source.nameString(), old, new))
+
+
+def _always_on_handles(raw_model) -> set[str]:
+    return {
+        str(raw_model.alwaysOnDiscreteSchedule().handle()),
+        str(raw_model.alwaysOffDiscreteSchedule().handle()),
+        str(raw_model.alwaysOnContinuousSchedule().handle()),
+    }
+
+
+def _duplicate_schedules(parts: Iterable, old: str, new: str) -> None:
+    """Point every schedule field of ``parts`` at a per-loop copy."""
+    parts = list(parts)
+    if not parts:
+        return
+    raw_model = parts[0].model()
+    shared = _always_on_handles(raw_model)
+    copies: dict[str, Any] = {}
+    for raw in parts:
+        for index in range(raw.numFields()):
+            target = _optional_get(raw.getTarget(index))
+            if target is None or not target.iddObject().name().startswith("OS:Schedule"):
+                continue
+            handle = str(target.handle())
+            if handle in shared:
+                continue
+            copy = copies.get(handle)
+            if copy is None:
+                copy = target.to_ModelObject().get().clone(raw_model)
+                copy.setName(_renamed(target.nameString(), old, new))
+                copies[handle] = copy
+            raw.setPointer(index, copy.handle())
+
+
+def _plant_map(plant_loops: Mapping | None) -> dict[str, Any]:
+    if not plant_loops:
+        return {}
+    return {
+        str(OsmObject.unwrap(source).handle()): OsmObject.unwrap(target)
+        for source, target in plant_loops.items()
+    }
+
+
+def _coil_plant(raw_coil):
+    getter = getattr(raw_coil, "plantLoop", None)
+    return _optional_get(getter()) if getter is not None else None
+
+
+def _remap_water_coils(parts, plant_map: dict[str, Any]) -> None:
+    if not plant_map:
+        return
+    for raw in parts:
+        if not _idd_type(raw).startswith(("OS:Coil:Heating:Water", "OS:Coil:Cooling:Water")):
+            continue
+        coil = _concrete(raw)[0]
+        plant = _coil_plant(coil)
+        target = plant_map.get(str(plant.handle())) if plant is not None else None
+        if target is None:
+            continue
+        coil.removeFromPlantLoop()
+        notify_plant_disconnected(coil, plant)
+        if not target.addDemandBranchForComponent(coil):
+            raise ValueError(
+                f"OpenStudio rejected adding {coil.nameString()} to plant loop "
+                f"'{target.nameString()}'."
+            )
+        notify_plant_connected(coil, target, "demand")
+
+
+def _source_terminal(raw_loop):
+    for comp in raw_loop.demandComponents():
+        if in_category(comp, "terminal"):
+            return _concrete(comp)[0]
+    return None
+
+
+def _remove_new_objects(raw_model, existing: set[str], created: list) -> None:
+    """Remove every object not in ``existing`` after a failed clone.
+
+    Tracked loops go first so they unhook their zone branches. Water coils
+    are removed one by one, which takes them off their plant loops; the
+    rest (nodes, terminals, schedule copies) go in one ``removeObjects``.
+    """
+    for raw in reversed(created):
+        if raw.initialized():
+            raw.remove()
+    leftovers = []
+    for handle in raw_model.handles():
+        if str(handle) in existing:
+            continue
+        raw = _optional_get(raw_model.getModelObject(handle))
+        if raw is not None and in_category(raw, "coil/water"):
+            _concrete(raw)[0].remove()
+        else:
+            leftovers.append(handle)
+    leftovers = [handle for handle in leftovers if raw_model.getObject(handle).is_initialized()]
+    if leftovers:
+        raw_model.removeObjects(leftovers)
+
+
+def clone_air_loops(
+    loop,
+    groups: list[list],
+    names: list[str],
+    terminal_pattern: str,
+    plant_map: dict[str, Any],
+    share_schedules: bool,
+) -> list:
+    """Clone an air loop once per zone group and attach each group.
+
+    If any copy fails, every object created by the call is removed again
+    before the error is raised.
+    """
+    from .air_loop import _terminal_reheat_coil
+
+    raw_loop = loop.raw
+    raw_model = raw_loop.model()
+    old_name = raw_loop.nameString()
+    source_parts = _air_loop_parts(raw_loop)
+
+    # Looked up once: plantLoop() searches every plant loop in the model.
+    source_terminal = _source_terminal(raw_loop)
+    reheat_plant = None
+    if source_terminal is not None:
+        source_coil = _terminal_reheat_coil(source_terminal)
+        plant = _coil_plant(source_coil) if source_coil is not None else None
+        if plant is not None:
+            reheat_plant = plant_map.get(str(plant.handle()), plant)
+
+    existing = {str(handle) for handle in raw_model.handles()}
+    created: list = []
+    copies = []
+    try:
+        for zones, name in zip(groups, names):
+            zones = [OsmObject.unwrap(zone) for zone in zones]
+            raw_clone = raw_loop.clone(raw_model).to_AirLoopHVAC().get()
+            created.append(raw_clone)
+            raw_clone.setName(name)
+            cloned_parts = _air_loop_parts(raw_clone)
+            _rename_parts(source_parts, cloned_parts, old_name, name)
+            _remap_water_coils(cloned_parts.values(), plant_map)
+
+            # OpenStudio keeps one zoneless copy of the first terminal on the
+            # demand side. It serves the first zone; the rest are cloned from
+            # the source terminal.
+            cloned_terminal = _source_terminal(raw_clone)
+            terminals = []
+            if cloned_terminal is not None and zones:
+                terminal_name = terminal_pattern.format(zone=zones[0].nameString(), index=0)
+                cloned_terminal.setName(terminal_name)
+                coil = _terminal_reheat_coil(cloned_terminal)
+                if coil is not None:
+                    coil.setName(f"{terminal_name} Reheat Coil")
+                    if reheat_plant is not None and _idd_type(coil).startswith(
+                        "OS:Coil:Heating:Water"
+                    ):
+                        if not reheat_plant.addDemandBranchForComponent(coil):
+                            raise ValueError(
+                                f"OpenStudio rejected adding {coil.nameString()} to plant "
+                                f"loop '{reheat_plant.nameString()}'."
+                            )
+                        notify_plant_connected(coil, reheat_plant, "demand")
+                outlet = cloned_terminal.outletModelObject().get().to_Node().get()
+                if not zones[0].addToNode(outlet):
+                    raise ValueError(
+                        f"OpenStudio rejected adding zone '{zones[0].nameString()}' "
+                        f"to air loop '{name}'."
+                    )
+                terminals.append(cloned_terminal)
+                zones = zones[1:]
+            elif cloned_terminal is not None:
+                cloned_terminal.remove()
+
+            wrapped = wrap(raw_clone)
+            if zones:
+                terminals.extend(
+                    terminal.raw
+                    for terminal in wrapped.add_branches(
+                        zones,
+                        source_terminal,
+                        name_pattern=terminal_pattern,
+                        plant_loop=reheat_plant,
+                        first_index=len(terminals),
+                    )
+                )
+            if not share_schedules:
+                _duplicate_schedules(cloned_parts.values() + terminals, old_name, name)
+            copies.append(wrapped)
+    except Exception:
+        _remove_new_objects(raw_model, existing, created)
+        raise
+    return copies
+
+
+def clone_plant_loop(loop, name: str | None, share_schedules: bool):
+    """Clone a plant loop's supply side, pumps and setpoint managers."""
+    raw_loop = loop.raw
+    raw_model = raw_loop.model()
+    old_name = raw_loop.nameString()
+    raw_clone = raw_loop.clone(raw_model).to_PlantLoop().get()
+    if name is not None:
+        raw_clone.setName(name)
+    name = raw_clone.nameString()
+    cloned_parts = _plant_loop_parts(raw_clone)
+    _rename_parts(_plant_loop_parts(raw_loop), cloned_parts, old_name, name)
+    if not share_schedules:
+        _duplicate_schedules(cloned_parts.values(), old_name, name)
+    return wrap(raw_clone)
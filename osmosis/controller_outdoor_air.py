@@ -2,7 +2,19 @@
 
 from __future__ import annotations
 
+from typing import NamedTuple
+
+import openstudio
+
 from .base import OsmObject
+from .manager import (
+    ComponentManager,
+    _first_existing,
+    _is_autosize_value,
+    _snake_to_autosizer_candidates,
+    _snake_to_setter_candidates,
+)
+from .mermaid import _optional_get
 from .registry import register_custom_wrapper, wrap
 
 
@@ -41,3 +53,162 @@ class ControllerOutdoorAir(OsmObject):
         """Enable or disable DCV on the attached mechanical ventilation controller."""
         self.controller_mechanical_ventilation.demand_controlled_ventilation = enabled
         return self
+
+
+class OutdoorAirTarget(NamedTuple):
+    """One outdoor air controller with what it controls, for filtering."""
+
+    controller: ControllerOutdoorAir
+    mechanical_ventilation: OsmObject
+    air_loop: OsmObject | None
+    zones: list[OsmObject]
+
+
+class OutdoorAirControllerManager(ComponentManager[ControllerOutdoorAir]):
+    """
+    Component manager for Controller:OutdoorAir with bulk configuration.
+
+    Usage
+    -----
+    model.outdoor_air_controllers.configure(economizer_control_type="DifferentialDryBulb")
+    model.outdoor_air_controllers.configure(
+        filter=lambda target: any(zone.name.startswith("Assembly") for zone in target.zones),
+        demand_controlled_ventilation=True,
+    )
+    """
+
+    def targets(self) -> list[OutdoorAirTarget]:
+        """Every controller with its mechanical ventilation controller,
+        air loop and served zones, resolved in one pass over the air loops."""
+        loops: dict[str, tuple] = {}
+        for raw_loop in self._raw_model.getAirLoopHVACs():
+            oa_system = _optional_get(raw_loop.airLoopHVACOutdoorAirSystem())
+            if oa_system is not None:
+                handle = str(oa_system.getControllerOutdoorAir().handle())
+                loops[handle] = (raw_loop, list(raw_loop.thermalZones()))
+
+        targets = []
+        for raw in self._raw_model.getControllerOutdoorAirs():
+            raw_loop, raw_zones = loops.get(str(raw.handle()), (None, []))
+            targets.append(
+                OutdoorAirTarget(
+                    ControllerOutdoorAir(raw),
+                    wrap(raw.controllerMechanicalVentilation()),
+                    wrap(raw_loop) if raw_loop is not None else None,
+                    [wrap(raw_zone) for raw_zone in raw_zones],
+                )
+            )
+        return targets
+
+    def configure(self, filter=None, **settings) -> dict[str, list]:
+        """Apply settings to many outdoor air controllers in one pass.
+
+        Keys are snake_case setters of Controller:OutdoorAir, falling back to
+        its Controller:MechanicalVentilation (``demand_controlled_ventilation``,
+        ``system_outdoor_air_method``). ``fixed_minimum_outdoor_air=True`` (or
+        a schedule) runs ``configure_fixed_minimum_outdoor_air``; its change is
+        reported as ``(minimum_limit_type, schedule_name)``. Values that
+        already match are left alone.
+
+        Args:
+            filter: Optional callable taking an ``OutdoorAirTarget`` and
+                returning whether to configure that controller.
+            **settings: Setting name to value.
+
+        Returns:
+            ``{"changes": [(controller, setting, old, new)], "unchanged": [...],
+            "filtered": [...], "failed": [(controller, setting, value)]}``
+            with controller names.
+
+        Raises:
+            AttributeError: If a setting matches neither controller.
+        """
+        fixed_minimum = settings.pop("fixed_minimum_outdoor_air", None)
+        setters = {key: _resolve_setter(key) for key in settings}
+        report: dict[str, list] = {"changes": [], "unchanged": [], "filtered": [], "failed": []}
+
+        for target in self.targets():
+            controller = target.controller
+            name = controller.name
+            if filter is not None and not filter(target):
+                report["filtered"].append(name)
+                continue
+
+            changes, failures = [], 0
+            if fixed_minimum is not None and fixed_minimum is not False:
+                schedule = None if fixed_minimum is True else fixed_minimum
+                raw_schedule = OsmObject.unwrap(schedule)
+                if raw_schedule is None:
+                    raw_schedule = self._raw_model.alwaysOnDiscreteSchedule()
+                old = _fixed_minimum_state(controller.raw)
+                new = ("FixedMinimum", raw_schedule.nameString())
+                if old != new:
+                    controller.configure_fixed_minimum_outdoor_air(raw_schedule)
+                    changes.append((name, "fixed_minimum_outdoor_air", old, new))
+
+            for key, value in settings.items():
+                owner, setter, autosizer = setters[key]
+                obj = controller if owner == "controller" else target.mechanical_ventilation
+                autosize = autosizer is not None and _is_autosize_value(value)
+                if autosize:
+                    if getattr(obj.raw, f"is{setter[3:]}Autosized", lambda: False)():
+                        continue
+                    old = getattr(obj, key, None)
+                    getattr(obj.raw, autosizer)()
+                    changes.append((name, key, _report_value(old), "Autosize"))
+                    continue
+                old = getattr(obj, key, None)
+                if _same_value(old, value):
+                    continue
+                if getattr(obj.raw, setter)(OsmObject.unwrap(value)) is False:
+                    report["failed"].append((name, key, value))
+                    failures += 1
+                    continue
+                changes.append((name, key, _report_value(old), _report_value(value)))
+
+            report["changes"].extend(changes)
+            if not changes and not failures:
+                report["unchanged"].append(name)
+        return report
+
+
+ControllerOutdoorAir._manager_class = OutdoorAirControllerManager
+
+
+def _resolve_setter(key: str) -> tuple[str, str, str | None]:
+    """Which controller owns a setting, with its setter and autosizer."""
+    candidates = _snake_to_setter_candidates(key)
+    for owner, os_cls in (
+        ("controller", openstudio.model.ControllerOutdoorAir),
+        ("mechanical_ventilation", openstudio.model.ControllerMechanicalVentilation),
+    ):
+        setter = _first_existing(os_cls, candidates)
+        if setter is not None:
+            return owner, setter, _first_existing(os_cls, _snake_to_autosizer_candidates(key))
+    raise AttributeError(
+        f"Neither ControllerOutdoorAir nor ControllerMechanicalVentilation has a "
+        f"setter for '{key}' (tried {', '.join(candidates)})."
+    )
+
+
+def _fixed_minimum_state(raw_controller) -> tuple[str, str | None]:
+    """Minimum limit type and minimum OA fraction schedule name."""
+    schedule = _optional_get(raw_controller.minimumFractionofOutdoorAirSchedule())
+    return (
+        raw_controller.getMinimumLimitType(),
+        schedule.nameString() if schedule is not None else None,
+    )
+
+
+def _same_value(old, new) -> bool:
+    if isinstance(old, OsmObject) or isinstance(new, OsmObject):
+        return (
+            old is not None
+            and new is not None
+            and str(OsmObject.unwrap(old).handle()) == str(OsmObject.unwrap(new).handle())
+        )
+    return old == new
+
+
+def _report_value(value):
+    return value.name if isinstance(value, OsmObject) else value
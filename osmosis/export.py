@@ -0,0 +1,230 @@
+"""Batch export of loop diagrams for many models."""
+from __future__ import annotations
+
+import hashlib
+import html
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable
+
+from .mermaid import (
+    air_loop_snapshot,
+    plant_loop_snapshot,
+    render_air_loop_mermaid,
+    render_plant_loop_mermaid,
+)
+from .model import Model
+from .svg import file_stem, render_air_loop_svg, render_plant_loop_svg
+
+_FORMATS = {"mmd": ".mmd", "svg": ".svg", "html": ".html"}
+_MANIFEST = "diagrams.json"
+
+
+def export_diagrams(
+    models_or_paths: Model | str | os.PathLike | Iterable[Model | str | os.PathLike],
+    out_dir: str,
+    format: str = "mmd",
+    workers: int | None = None,
+    show_names: bool = True,
+) -> dict[str, Any]:
+    """Write one diagram file per air loop and plant loop, plus an index.
+
+    Models given as paths are loaded and rendered in a process pool; model
+    objects are rendered in this process. Each model gets a subdirectory of
+    ``out_dir`` named after its OSM file; model objects without one use
+    their building name, or ``model``. A ``diagrams.json`` manifest records each loop's structure
+    fingerprint, and loops whose fingerprint and render options are
+    unchanged since the last export are skipped. Models exported earlier
+    into the same ``out_dir`` stay in the manifest and index; files of
+    loops that no longer exist in a re-exported model are deleted.
+
+    Args:
+        models_or_paths: A model, an OSM path, or an iterable of either.
+        out_dir: Output directory, created if needed.
+        format: ``"mmd"`` for Mermaid sources, ``"svg"`` for offline
+            renders, or ``"html"`` for standalone pages embedding the SVG.
+        workers: Process count for path inputs. ``1`` renders serially;
+            ``None`` lets the pool choose.
+        show_names: Whether diagrams show component names.
+
+    Returns:
+        ``{"written": [...], "skipped": [...], "removed": [...], "index":
+        path}`` with file paths relative to ``out_dir``.
+    """
+    if format not in _FORMATS:
+        raise ValueError(f"format must be one of {tuple(_FORMATS)}; got {format!r}.")
+    if isinstance(models_or_paths, (Model, str, os.PathLike)):
+        models_or_paths = [models_or_paths]
+
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, _MANIFEST)
+    previous: dict[str, dict[str, dict[str, Any]]] = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as handle:
+            previous = json.load(handle).get("models", {})
+
+    used: set[str] = set()
+    jobs = []
+    for item in models_or_paths:
+        if isinstance(item, Model):
+            stem = file_stem(_model_name(item), used)
+        else:
+            item = os.fspath(item)
+            stem = file_stem(os.path.splitext(os.path.basename(item))[0], used)
+        digests = {
+            file: entry["digest"] for file, entry in previous.get(stem, {}).items()
+        }
+        job_args = (stem, out_dir, format, show_names, digests)
+        jobs.append((item, job_args))
+
+    results: dict[str, list[dict[str, Any]]] = {}
+    paths = [(item, args) for item, args in jobs if not isinstance(item, Model)]
+    if paths and workers != 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                args[0]: pool.submit(_export_path, item, *args) for item, args in paths
+            }
+            for stem, future in futures.items():
+                results[stem] = future.result()
+    else:
+        for item, args in paths:
+            results[args[0]] = _export_path(item, *args)
+    for item, args in jobs:
+        if isinstance(item, Model):
+            results[args[0]] = _export_model(item, *args)
+
+    # Merge into the previous manifest so models exported by earlier calls
+    # keep their entries, and delete outputs of loops that are gone.
+    models = dict(previous)
+    removed = []
+    for _item, args in jobs:
+        stem = args[0]
+        entries = results[stem]
+        current = {entry["file"] for entry in entries}
+        for file in previous.get(stem, {}):
+            path = os.path.join(out_dir, file)
+            if file not in current and os.path.exists(path):
+                os.remove(path)
+                removed.append(file)
+        models[stem] = {
+            entry["file"]: {
+                "kind": entry["kind"],
+                "name": entry["name"],
+                "digest": entry["digest"],
+            }
+            for entry in entries
+        }
+    with open(manifest_path, "w", encoding="utf-8") as handle:
+        json.dump({"models": models}, handle, indent=2)
+
+    index = _write_index(out_dir, models)
+    report: dict[str, Any] = {"written": [], "skipped": [], "removed": removed, "index": index}
+    for _item, args in jobs:
+        for entry in results[args[0]]:
+            report["written" if entry["written"] else "skipped"].append(entry["file"])
+    return report
+
+
+def _model_name(model: Model) -> str:
+    """Directory name for an in-memory model: its OSM file, else its building."""
+    if model.path is not None:
+        return os.path.splitext(os.path.basename(model.path))[0]
+    raw_building = model.raw.building()
+    if raw_building.is_initialized():
+        return raw_building.get().nameString()
+    return "model"
+
+
+def _export_path(path: str, *args) -> list[dict[str, Any]]:
+    return _export_model(Model.load(path), *args)
+
+
+def _export_model(
+    model: Model,
+    stem: str,
+    out_dir: str,
+    format: str,
+    show_names: bool,
+    previous: dict[str, str],
+) -> list[dict[str, Any]]:
+    """Render every loop of one model, skipping loops that have not changed."""
+    model_dir = os.path.join(out_dir, stem)
+    os.makedirs(model_dir, exist_ok=True)
+    raw_model = model.raw
+    used: set[str] = set()
+    entries = []
+
+    loops = [("air", raw_loop) for raw_loop in raw_model.getAirLoopHVACs()]
+    loops += [("plant", raw_loop) for raw_loop in raw_model.getPlantLoops()]
+    for kind, raw_loop in loops:
+        name = raw_loop.nameString()
+        if kind == "air":
+            snapshot = air_loop_snapshot(raw_loop)
+        else:
+            snapshot = plant_loop_snapshot(raw_loop)
+
+        file = f"{stem}/{file_stem(name, used)}{_FORMATS[format]}"
+        digest = hashlib.sha1(
+            repr((snapshot.fingerprint, format, show_names)).encode("utf-8")
+        ).hexdigest()
+        path = os.path.join(out_dir, file)
+        written = previous.get(file) != digest or not os.path.exists(path)
+        if written:
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(_render(kind, snapshot, name, format, show_names))
+        entries.append(
+            {
+                "file": file,
+                "kind": kind,
+                "name": name,
+                "digest": digest,
+                "written": written,
+            }
+        )
+    return entries
+
+
+def _render(kind: str, snapshot, name: str, format: str, show_names: bool) -> str:
+    if format == "mmd":
+        if kind == "air":
+            return render_air_loop_mermaid(snapshot, show_names=show_names)
+        return render_plant_loop_mermaid(snapshot, show_names=show_names)
+
+    if kind == "air":
+        svg = render_air_loop_svg(snapshot, show_names=show_names)
+    else:
+        svg = render_plant_loop_svg(snapshot, show_names=show_names)
+    if format == "svg":
+        return svg
+    title = html.escape(name)
+    return (
+        "<!DOCTYPE html>\n"
+        f'<html><head><meta charset="utf-8"><title>{title}</title></head>\n'
+        f'<body style="background:#f3f4f6;margin:16px"><h2>{title}</h2>\n'
+        f"{svg}\n</body></html>\n"
+    )
+
+
+def _write_index(out_dir: str, models: dict[str, dict[str, dict[str, Any]]]) -> str:
+    lines = [
+        "<!DOCTYPE html>",
+        '<html><head><meta charset="utf-8"><title>Loop Diagrams</title></head>',
+        '<body style="font-family:Segoe UI, Arial, sans-serif;margin:16px">',
+        "<h1>Loop Diagrams</h1>",
+    ]
+    for stem, entries in models.items():
+        lines.append(f"<h2>{html.escape(stem)}</h2>")
+        lines.append("<ul>")
+        for file, entry in entries.items():
+            kind = "Air Loop" if entry["kind"] == "air" else "Plant Loop"
+            href = html.escape(file, quote=True)
+            lines.append(
+                f'<li>{kind}: <a href="{href}">{html.escape(entry["name"])}</a></li>'
+            )
+        lines.append("</ul>")
+    lines.append("</body></html>")
+
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as handle:
+        handle.write("\n".join(lines) + "\n")
+    return "index.html"
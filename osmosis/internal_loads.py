@@ -0,0 +1,165 @@
+"""Columnar people, lighting and equipment rollups by space, zone, story or space type."""
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from .mermaid import _optional_get
+from .space_geometry import _numpy
+
+LEVELS = ("space", "zone", "story", "space_type")
+
+_LOADS = ("people", "lighting", "equipment")
+
+# Coefficient order: fixed, per floor area, per person.
+_ZERO = (0.0, 0.0, 0.0)
+
+
+def _people_coefficients(raw_definition) -> tuple[float, float, float]:
+    method = raw_definition.numberofPeopleCalculationMethod()
+    if method == "People":
+        return (_optional_get(raw_definition.numberofPeople()) or 0.0, 0.0, 0.0)
+    if method == "People/Area":
+        return (0.0, _optional_get(raw_definition.peopleperSpaceFloorArea()) or 0.0, 0.0)
+    area_per_person = _optional_get(raw_definition.spaceFloorAreaperPerson())
+    return (0.0, 1.0 / area_per_person if area_per_person else 0.0, 0.0)
+
+
+def _power_coefficients(raw_definition, level_getter: str) -> tuple[float, float, float]:
+    method = raw_definition.designLevelCalculationMethod()
+    if method == "Watts/Area":
+        return (0.0, _optional_get(raw_definition.wattsperSpaceFloorArea()) or 0.0, 0.0)
+    if method == "Watts/Person":
+        return (0.0, 0.0, _optional_get(raw_definition.wattsperPerson()) or 0.0)
+    return (_optional_get(getattr(raw_definition, level_getter)()) or 0.0, 0.0, 0.0)
+
+
+class _LoadReader:
+    """Load coefficients and schedule names, memoized per definition and space type."""
+
+    def __init__(self):
+        self._definitions: dict[str, tuple[float, float, float]] = {}
+        self._space_types: dict[str, tuple[list, list]] = {}
+
+    def _definition(self, raw_definition, load: str):
+        handle = str(raw_definition.handle())
+        coefficients = self._definitions.get(handle)
+        if coefficients is None:
+            if load == "people":
+                coefficients = _people_coefficients(raw_definition)
+            elif load == "lighting":
+                coefficients = _power_coefficients(raw_definition, "lightingLevel")
+            else:
+                coefficients = _power_coefficients(raw_definition, "designLevel")
+            self._definitions[handle] = coefficients
+        return coefficients
+
+    def read(self, raw_owner) -> tuple[list, list]:
+        """Summed coefficients and schedule-name sets for people, lighting, equipment."""
+        coefficients, schedules = [], []
+        for load, instances, definition, schedule in (
+            ("people", raw_owner.people(), "peopleDefinition", "numberofPeopleSchedule"),
+            ("lighting", raw_owner.lights(), "lightsDefinition", "schedule"),
+            ("equipment", raw_owner.electricEquipment(), "electricEquipmentDefinition", "schedule"),
+        ):
+            total = [0.0, 0.0, 0.0]
+            names: set[str] = set()
+            for raw in instances:
+                multiplier = raw.multiplier()
+                for index, value in enumerate(self._definition(getattr(raw, definition)(), load)):
+                    total[index] += value * multiplier
+                raw_schedule = _optional_get(getattr(raw, schedule)())
+                if raw_schedule is not None:
+                    names.add(raw_schedule.nameString())
+            coefficients.append(total)
+            schedules.append(names)
+        return coefficients, schedules
+
+    def read_space_type(self, raw_space_type) -> tuple[list, list]:
+        handle = str(raw_space_type.handle())
+        if handle not in self._space_types:
+            self._space_types[handle] = self.read(raw_space_type)
+        return self._space_types[handle]
+
+
+def internal_load_summary(raw_model, level: str | Iterable[str] = "space") -> dict[str, Any]:
+    """People, lighting and equipment per space, rolled up to ``level``; see
+    ``Model.internal_load_summary``."""
+    np = _numpy()
+    levels = [level] if isinstance(level, str) else list(level)
+    for name in levels:
+        if name not in LEVELS:
+            raise ValueError(f"Unknown level '{name}'; choose from {', '.join(LEVELS)}.")
+
+    reader = _LoadReader()
+    raw_spaces = list(raw_model.getSpaces())
+    count = len(raw_spaces)
+    area = np.zeros(count)
+    coefficients = np.zeros((count, len(_LOADS), 3))
+    schedules: list[list[set]] = []
+    keys: dict[str, list] = {name: [] for name in LEVELS}
+
+    for row, raw_space in enumerate(raw_spaces):
+        area[row] = raw_space.floorArea()
+        direct, direct_schedules = reader.read(raw_space)
+        coefficients[row] = direct
+        space_schedules = [set(names) for names in direct_schedules]
+
+        raw_space_type = _optional_get(raw_space.spaceType())
+        if raw_space_type is not None:
+            inherited, inherited_schedules = reader.read_space_type(raw_space_type)
+            coefficients[row] += inherited
+            for names, more in zip(space_schedules, inherited_schedules):
+                names |= more
+        schedules.append(space_schedules)
+
+        raw_zone = _optional_get(raw_space.thermalZone())
+        raw_story = _optional_get(raw_space.buildingStory())
+        keys["space"].append(raw_space.nameString())
+        keys["zone"].append(raw_zone.nameString() if raw_zone is not None else None)
+        keys["story"].append(raw_story.nameString() if raw_story is not None else None)
+        keys["space_type"].append(
+            raw_space_type.nameString() if raw_space_type is not None else None
+        )
+
+    # Every load is linear in floor area and, for power, in people.
+    people = coefficients[:, 0, 0] + coefficients[:, 0, 1] * area
+    lighting = coefficients[:, 1, 0] + coefficients[:, 1, 1] * area + coefficients[:, 1, 2] * people
+    equipment = coefficients[:, 2, 0] + coefficients[:, 2, 1] * area + coefficients[:, 2, 2] * people
+    values = {
+        "floor_area": area,
+        "people": people,
+        "lighting_power": lighting,
+        "equipment_power": equipment,
+    }
+
+    tables = {name: _rollup(np, keys[name], values, schedules) for name in levels}
+    return tables[levels[0]] if isinstance(level, str) else tables
+
+
+def _rollup(np, keys: list, values: dict[str, Any], schedules: list[list[set]]) -> dict[str, Any]:
+    """Sum space rows by key and derive densities."""
+    groups: dict[Any, int] = {}
+    for key in keys:
+        groups.setdefault(key, len(groups))
+    rows = np.fromiter((groups[key] for key in keys), dtype=np.int64, count=len(keys))
+    count = len(groups)
+
+    table: dict[str, Any] = {"name": list(groups)}
+    for column, array in values.items():
+        table[column] = np.bincount(rows, array, minlength=count)
+
+    area = table["floor_area"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        table["people_density"] = np.where(area > 0, table["people"] / area, np.nan)
+        table["lighting_power_density"] = np.where(area > 0, table["lighting_power"] / area, np.nan)
+        table["equipment_power_density"] = np.where(
+            area > 0, table["equipment_power"] / area, np.nan
+        )
+
+    merged = [[set() for _ in _LOADS] for _ in range(count)]
+    for row, space_schedules in zip(rows.tolist(), schedules):
+        for names, more in zip(merged[row], space_schedules):
+            names |= more
+    for index, load in enumerate(_LOADS):
+        table[f"{load}_schedules"] = [sorted(names[index]) for names in merged]
+    return table
@@ -0,0 +1,53 @@
+"""Merge identical people, lights and electric equipment definitions."""
+from __future__ import annotations
+
+from typing import Any
+
+# Model getter and instance cast per definition type.
+DEFINITION_TYPES = {
+    "PeopleDefinition": ("getPeopleDefinitions", "to_People"),
+    "LightsDefinition": ("getLightsDefinitions", "to_Lights"),
+    "ElectricEquipmentDefinition": ("getElectricEquipmentDefinitions", "to_ElectricEquipment"),
+}
+
+
+def _field_key(raw_definition) -> tuple:
+    """Every field after handle and name, with numbers compared by value."""
+    key = []
+    for index in range(2, raw_definition.numFields()):
+        value = raw_definition.getString(index)
+        text = value.get() if value.is_initialized() else ""
+        try:
+            key.append(float(text))
+        except ValueError:
+            key.append(text.lower())
+    return tuple(key)
+
+
+def dedupe_load_definitions(raw_model, dry_run: bool = False) -> dict[str, Any]:
+    """Repoint loads to one definition per distinct field set and remove the
+    rest; see ``Model.dedupe_load_definitions``."""
+    report: dict[str, Any] = {"merged": {}, "repointed": [], "removed": []}
+    for getter, cast in DEFINITION_TYPES.values():
+        kept: dict[tuple, Any] = {}
+        # Sorted so the kept definition does not depend on SDK storage order.
+        raw_definitions = sorted(getattr(raw_model, getter)(), key=lambda raw: raw.nameString())
+        for raw_definition in raw_definitions:
+            key = _field_key(raw_definition)
+            raw_kept = kept.get(key)
+            if raw_kept is None:
+                kept[key] = raw_definition
+                continue
+
+            # Instances first: removing a definition removes its loads.
+            for raw_instance in raw_definition.instances():
+                raw_load = getattr(raw_instance, cast)().get()
+                if not dry_run:
+                    raw_load.setDefinition(raw_kept)
+                report["repointed"].append(raw_load.nameString())
+            name = raw_definition.nameString()
+            report["merged"].setdefault(raw_kept.nameString(), []).append(name)
+            report["removed"].append(name)
+            if not dry_run:
+                raw_definition.remove()
+    return report
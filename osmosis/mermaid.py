@@ -4,8 +4,13 @@ from __future__ import annotations
 
 import re
 import html
+import json
+import zlib
 import base64
+import functools
+import hashlib
 import uuid
+from typing import NamedTuple
 
 
 def _idd_type(raw) -> str:
@@ -80,8 +85,64 @@ def _cast(raw, sdk_name: str):
     return raw
 
 
+_MERMAID_INK = "https://mermaid.ink/svg/"
+_ENCODINGS = ("pako", "base64")
+_ALT_SKIP = ("%%", "classDef ", "class ", "linkStyle ", "direction ")
+
+
+def _svg_data_url(svg: str) -> str:
+    encoded = base64.b64encode(svg.encode("utf-8")).decode("ascii")
+    return f"data:image/svg+xml;base64,{encoded}"
+
+
+def _mermaid_ink_url(source: str, encoding: str = "pako") -> str:
+    """mermaid.ink image URL for a source, optionally deflate-compressed."""
+    if encoding == "pako":
+        payload = json.dumps({"code": source, "mermaid": {"theme": "default"}})
+        compressed = zlib.compress(payload.encode("utf-8"), 9)
+        encoded = base64.urlsafe_b64encode(compressed).decode("ascii").rstrip("=")
+        return f"{_MERMAID_INK}pako:{encoded}"
+    encoded = base64.urlsafe_b64encode(source.encode("utf-8")).decode("ascii")
+    return f"{_MERMAID_INK}{encoded}"
+
+
+def _oversize_url(length: int, limit: int) -> str:
+    """Inline placeholder image for diagrams whose URL exceeds the cap."""
+    message = (
+        f"Diagram URL is {length:,} characters (limit {limit:,}). "
+        "Use renderer='svg', minimize_demand or group_demand."
+    )
+    width = 12 + 6.2 * len(message)
+    svg = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="40">'
+        '<rect width="100%" height="100%" fill="#fff7ed" stroke="#c2410c"/>'
+        '<text x="6" y="25" font-family="Segoe UI, Arial, sans-serif" '
+        f'font-size="11" fill="#7c2d12">{html.escape(message)}</text></svg>'
+    )
+    return _svg_data_url(svg)
+
+
+def _alt_text(source: str, limit: int) -> str:
+    """Short description of a Mermaid source for ``alt`` attributes."""
+    lines = [line.strip() for line in source.splitlines()]
+    text = " ".join(line for line in lines if line and not line.startswith(_ALT_SKIP))
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit].rstrip()}… ({len(lines)} lines)"
+
+
 class MermaidDiagram:
-    """IPython-displayable Mermaid diagram."""
+    """IPython-displayable Mermaid diagram.
+
+    Pass ``svg`` (and ``minimized_svg``) to display locally rendered SVG as
+    inline data URLs instead of fetching images from mermaid.ink.
+    ``toggle_label`` names the button that switches to the minimized view.
+
+    mermaid.ink URLs use the deflate-compressed ``pako:`` form by default;
+    ``encoding="base64"`` selects the plain base64 form. Notebook HTML
+    replaces mermaid.ink images whose URL exceeds ``max_url_length`` with a
+    short notice and cuts ``alt`` text to ``alt_length`` characters.
+    """
 
     def __init__(
         self,
@@ -89,38 +150,67 @@ class MermaidDiagram:
         width=760,
         zoomable: bool = True,
         minimized_source: str | None = None,
+        svg: str | None = None,
+        minimized_svg: str | None = None,
+        toggle_label: str = "Minimize Demand",
+        encoding: str = "pako",
+        max_url_length: int | None = 100_000,
+        alt_length: int = 200,
     ):
+        if encoding not in _ENCODINGS:
+            raise ValueError(f"encoding must be one of {_ENCODINGS}; got {encoding!r}.")
         self.source = source
         self.width = width
         self.zoomable = zoomable
         self.minimized_source = minimized_source
+        self.svg = svg
+        self.minimized_svg = minimized_svg
+        self.toggle_label = toggle_label
+        self.encoding = encoding
+        self.max_url_length = max_url_length
+        self.alt_length = alt_length
 
     def __str__(self) -> str:
         return self.source
 
     def _repr_mimebundle_(self, include=None, exclude=None):
-        return {
+        bundle = {
             "text/vnd.mermaid": self.source,
             "text/html": self._repr_html_(),
         }
+        if self.svg is not None:
+            bundle["image/svg+xml"] = self.svg
+        return bundle
 
     def image_url(self) -> str:
-        encoded = base64.urlsafe_b64encode(self.source.encode("utf-8")).decode("ascii")
-        return f"https://mermaid.ink/svg/{encoded}"
+        if self.svg is not None:
+            return _svg_data_url(self.svg)
+        return _mermaid_ink_url(self.source, self.encoding)
 
     def minimized_image_url(self) -> str | None:
+        if self.minimized_svg is not None:
+            return _svg_data_url(self.minimized_svg)
         if self.minimized_source is None:
             return None
-        encoded = base64.urlsafe_b64encode(
-            self.minimized_source.encode("utf-8")
-        ).decode("ascii")
-        return f"https://mermaid.ink/svg/{encoded}"
+        return _mermaid_ink_url(self.minimized_source, self.encoding)
+
+    def _capped(self, url: str) -> str:
+        limit = self.max_url_length
+        if limit is not None and len(url) > limit:
+            return _oversize_url(len(url), limit)
+        return url
 
     def _repr_html_(self) -> str:
-        url = html.escape(self.image_url(), quote=True)
-        alt = html.escape(self.source, quote=True)
+        url = self.image_url()
+        if self.svg is None:
+            url = self._capped(url)
+        url = html.escape(url, quote=True)
+        alt = html.escape(_alt_text(self.source, self.alt_length), quote=True)
         minimized_url = self.minimized_image_url()
-        minimized_url = html.escape(minimized_url, quote=True) if minimized_url else None
+        if minimized_url and self.minimized_svg is None:
+            minimized_url = self._capped(minimized_url)
+        if minimized_url:
+            minimized_url = html.escape(minimized_url, quote=True)
         width = f"{self.width}px" if isinstance(self.width, int) else self.width
         width = html.escape(width, quote=True)
         if self.zoomable:
@@ -179,7 +269,7 @@ class MermaidDiagram:
             )
             minimize_label = (
                 f'<label for="{widget_id}-min-demand" class="demand-toggle">'
-                "Minimize Demand</label>"
+                f"{html.escape(self.toggle_label)}</label>"
             )
             minimize_picture = (
                 '<div class="diagram-stack">'
@@ -436,134 +526,459 @@ class MermaidDiagram:
 """
 
 
-def build_mermaid_diagram(
-    air_loop_hvac_raw,
-    show_names: bool = True,
-    minimize_demand: bool = False,
-) -> str:
-    """Build a Mermaid flowchart string for an air loop.
+_DIAGRAM_INIT = (
+    "%%{init: {"
+    "'theme': 'base', "
+    "'themeVariables': {"
+    "'background': '#f3f4f6', "
+    "'fontSize': '11px', "
+    "'fontFamily': 'Segoe UI, Arial, sans-serif', "
+    "'primaryTextColor': '#111111', "
+    "'lineColor': '#374151', "
+    "'primaryColor': '#ffffff', "
+    "'primaryBorderColor': '#4b5563', "
+    "'clusterBkg': '#f6f8fb', "
+    "'clusterBorder': '#b8c2cc', "
+    "'edgeLabelBackground': '#ffffff'"
+    "}, "
+    "'flowchart': {"
+    "'nodeSpacing': 26, "
+    "'rankSpacing': 38, "
+    "'curve': 'basis', "
+    "'padding': 10"
+    "}, "
+    "'themeCSS': '"
+    ".cluster rect { rx: 4px; stroke-width: 1.2px; } "
+    ".cluster-label text { font-weight: 600; fill: #111827; } "
+    ".nodeLabel { line-height: 1.25; } "
+    ".edgePath .path { stroke-linecap: round; stroke-linejoin: round; }"
+    "'"
+    "}"
+    "}}%%"
+)
+
+_CLASS_DEFS = {
+    "node": "fill:#e1e5ea,stroke:#111827,stroke-width:1.1px,color:#111827;",
+    "equipment": "fill:#ffffff,stroke:#4b5563,stroke-width:1.1px,color:#111827;",
+    "boundary": "fill:#eef1f5,stroke:#111827,stroke-width:1.1px,color:#111827;",
+    "zone": "fill:#ffffff,stroke:#4b5563,stroke-width:1.1px,color:#111827;",
+    "summary": "fill:#ffffff,stroke:#2563eb,stroke-width:1.2px,color:#111827;",
+    "blank": "fill:#c0c6cf,stroke:#c0c6cf,color:#c0c6cf;",
+}
 
-    Nodes render as circles ``(( ))``, equipment as rectangles ``[ ]``,
-    system boundaries as stadiums ``([ ])``, and zones as double
-    brackets ``[[ ]]``.
+_LINK_STYLE = "    linkStyle default stroke:#374151,stroke-width:1.35px;"
 
-    Args:
-        air_loop_hvac_raw: The raw OpenStudio AirLoopHVAC object
-        show_names: Whether to show component names
-        minimize_demand: Whether to minimize demand side zones
 
-    Returns:
-        Mermaid diagram markup as a string
+def _diagram_header(*class_names: str) -> list[str]:
+    return (
+        [_DIAGRAM_INIT, "graph LR"]
+        + [f"    classDef {name} {_CLASS_DEFS[name]}" for name in class_names]
+        + [_LINK_STYLE]
+    )
+
+
+class DiagramItem(NamedTuple):
+    """One rendered loop object: a node or a piece of equipment."""
+
+    id: str
+    type_label: str
+    name: str
+    is_node: bool
+
+    def label(self, show_names: bool = True) -> str:
+        if self.is_node:
+            return _safe(self.name)
+        if show_names and self.name and self.name != self.type_label:
+            return _safe(f"{self.type_label}<br/>{self.name}")
+        return _safe(self.type_label)
+
+
+class UnitaryGroup(NamedTuple):
+    """A unitary system rendered as a subgraph of its fan and coils."""
+
+    item: DiagramItem
+    parts: tuple[DiagramItem, ...]
+
+
+class ZoneItem(NamedTuple):
+    """One thermal zone on an air loop's demand side."""
+
+    id: str
+    name: str
+    air_node: DiagramItem | None
+    terminal: str | None = None
+    story: str | None = None
+    design_flow: float | None = None
+
+
+class ZoneGroup(NamedTuple):
+    """Demand-side zones summarized as one box with counts and design flow."""
+
+    id: str
+    key: str
+    zones: tuple[ZoneItem, ...]
+
+    @property
+    def design_flow(self) -> float | None:
+        """Sum of hard-sized terminal flows in m3/s, or None if all autosized."""
+        flows = [zone.design_flow for zone in self.zones if zone.design_flow is not None]
+        return sum(flows) if flows else None
+
+    def label(self) -> str:
+        count = len(self.zones)
+        lines = [self.key, f"{count} Zone" if count == 1 else f"{count} Zones"]
+        flow = self.design_flow
+        autosized = sum(1 for zone in self.zones if zone.design_flow is None)
+        if flow is None:
+            lines.append("Flow autosized")
+        elif autosized:
+            lines.append(f"{flow:.3f} m³/s + {autosized} autosized")
+        else:
+            lines.append(f"{flow:.3f} m³/s")
+        return _safe("<br/>".join(lines))
+
+
+class AirLoopSnapshot(NamedTuple):
+    """Everything an air loop diagram needs, captured in one traversal.
+
+    Snapshots are immutable and hashable, so rendered Mermaid sources are
+    cached per snapshot and redrawing an unchanged loop skips rendering.
     """
-    raw = air_loop_hvac_raw
-    lines = [
-        "%%{init: {"
-        "'theme': 'base', "
-        "'themeVariables': {"
-        "'background': '#f3f4f6', "
-        "'fontSize': '11px', "
-        "'fontFamily': 'Segoe UI, Arial, sans-serif', "
-        "'primaryTextColor': '#111111', "
-        "'lineColor': '#374151', "
-        "'primaryColor': '#ffffff', "
-        "'primaryBorderColor': '#4b5563', "
-        "'clusterBkg': '#f6f8fb', "
-        "'clusterBorder': '#b8c2cc', "
-        "'edgeLabelBackground': '#ffffff'"
-        "}, "
-        "'flowchart': {"
-        "'nodeSpacing': 26, "
-        "'rankSpacing': 38, "
-        "'curve': 'basis', "
-        "'padding': 10"
-        "}, "
-        "'themeCSS': '"
-        ".cluster rect { rx: 4px; stroke-width: 1.2px; } "
-        ".cluster-label text { font-weight: 600; fill: #111827; } "
-        ".nodeLabel { line-height: 1.25; } "
-        ".edgePath .path { stroke-linecap: round; stroke-linejoin: round; }"
-        "'"
-        "}"
-        "}}%%",
-        "graph LR",
-        "    classDef node fill:#e1e5ea,stroke:#111827,stroke-width:1.1px,color:#111827;",
-        "    classDef equipment fill:#ffffff,stroke:#4b5563,stroke-width:1.1px,color:#111827;",
-        "    classDef boundary fill:#eef1f5,stroke:#111827,stroke-width:1.1px,color:#111827;",
-        "    classDef zone fill:#ffffff,stroke:#4b5563,stroke-width:1.1px,color:#111827;",
-        "    classDef summary fill:#ffffff,stroke:#2563eb,stroke-width:1.2px,color:#111827;",
-        "    classDef blank fill:#c0c6cf,stroke:#c0c6cf,color:#c0c6cf;",
-        "    linkStyle default stroke:#374151,stroke-width:1.35px;",
-    ]
 
-    supply_chain: list[str] = []
-    managers: list[tuple[str, str]] = []
-    oa_raw = None
+    name: str
+    oa_system: DiagramItem | None
+    oa_components: tuple[DiagramItem, ...] | None
+    supply: tuple[DiagramItem | UnitaryGroup, ...]
+    managers: tuple[DiagramItem, ...]
+    zones: tuple[ZoneItem, ...]
+    zone_details: bool = False
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable digest of the loop structure and names."""
+        return _fingerprint(self)
+
+
+class PlantLoopSnapshot(NamedTuple):
+    """Everything a plant loop diagram needs, captured in one traversal."""
+
+    name: str
+    supply: tuple[DiagramItem, ...]
+    demand: tuple[DiagramItem, ...]
+    managers: tuple[DiagramItem, ...]
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable digest of the loop structure and names."""
+        return _fingerprint(self)
+
+
+def _fingerprint(snapshot) -> str:
+    return hashlib.sha1(repr(snapshot).encode("utf-8")).hexdigest()
+
+
+def _diagram_item(raw) -> DiagramItem:
+    return DiagramItem(
+        _node_id(raw),
+        _type_label(raw),
+        raw.nameString().strip(),
+        _is_node(raw),
+    )
+
+
+def _unitary_parts(raw) -> tuple[DiagramItem, ...]:
+    return tuple(_diagram_item(part) for part in _unitary_components(raw))
+
+
+def _unitary_components(raw) -> list:
+    """A unitary system's fan and coils in airflow order."""
+    obj = _cast(raw, "AirLoopHVACUnitarySystem")
+    fan = _optional_get(obj.supplyFan())
+    cooling = _optional_get(obj.coolingCoil())
+    heating = _optional_get(obj.heatingCoil())
+    supplemental = _optional_get(obj.supplementalHeatingCoil())
+    blow_through = obj.fanPlacement() == "BlowThrough"
+
+    parts = []
+    if blow_through and fan:
+        parts.append(fan)
+    for part in (cooling, heating, supplemental):
+        if part:
+            parts.append(part)
+    if not blow_through and fan:
+        parts.append(fan)
+    return parts
+
+
+_FLOW_GETTERS = (
+    "maximumAirFlowRate",
+    "maximumPrimaryAirFlowRate",
+    "maximumTotalAirFlowRate",
+    "designSupplyAirFlowRate",
+)
+
+
+def _design_flow(raw_terminal) -> float | None:
+    idd = _idd_type(raw_terminal)
+    terminal = _cast(raw_terminal, idd.removeprefix("OS:").replace(":", ""))
+    for getter in _FLOW_GETTERS:
+        method = getattr(terminal, getter, None)
+        if method is None:
+            continue
+        try:
+            value = method()
+        except Exception:
+            continue
+        if isinstance(value, (int, float)):
+            return float(value)
+        value = _optional_get(value)
+        return float(value) if value is not None else None
+    return None
+
+
+def _zone_terminal(raw_zone, loop_handle: str) -> tuple[str | None, float | None]:
+    """Type label and hard-sized design flow of the zone's terminal on a loop."""
+    try:
+        terminals = raw_zone.airLoopHVACTerminals()
+    except Exception:
+        return None, None
+    for raw_terminal in terminals:
+        hvac = _cast(raw_terminal, "HVACComponent")
+        loop = _optional_get(hvac.airLoopHVAC()) if hasattr(hvac, "airLoopHVAC") else None
+        if loop is not None and str(loop.handle()) != loop_handle:
+            continue
+        return _type_label(raw_terminal), _design_flow(raw_terminal)
+    return None, None
+
+
+def _zone_story(raw_zone) -> str | None:
+    for space in raw_zone.spaces():
+        story = _optional_get(space.buildingStory())
+        if story is not None:
+            return story.nameString()
+    return None
+
+
+def air_loop_snapshot(air_loop_hvac_raw, zone_details: bool = False) -> AirLoopSnapshot:
+    """Walk an air loop once and capture its diagram topology.
+
+    ``zone_details`` also records each zone's terminal type, story and
+    design flow, which only demand grouping needs.
+    """
+    raw = air_loop_hvac_raw
     supply_components = list(raw.supplyComponents())
 
-    def _label(obj):
-        if _is_node(obj):
-            return _safe(obj.nameString().strip())
-        tl = _type_label(obj)
-        if show_names:
-            nm = obj.nameString().strip()
-            if nm and nm != tl:
-                return _safe(f"{tl}<br/>{nm}")
-        return _safe(tl)
-
-    def _unitary_parts(obj):
-        obj = _cast(obj, "AirLoopHVACUnitarySystem")
-        fan = _optional_get(obj.supplyFan())
-        cooling = _optional_get(obj.coolingCoil())
-        heating = _optional_get(obj.heatingCoil())
-        supplemental = _optional_get(obj.supplementalHeatingCoil())
-
-        parts = []
-        if obj.fanPlacement() == "BlowThrough" and fan:
-            parts.append(fan)
-        for part in (cooling, heating, supplemental):
-            if part:
-                parts.append(part)
-        if obj.fanPlacement() != "BlowThrough" and fan:
-            parts.append(fan)
-        return parts
+    oa_system = None
+    oa_components = None
+    oa_raw = next((comp for comp in supply_components if _is_oa_system(comp)), None)
+    if oa_raw is not None:
+        oa_raw = _cast(oa_raw, "AirLoopHVACOutdoorAirSystem")
+        oa_system = _diagram_item(oa_raw)
+        try:
+            oa_components = tuple(
+                _diagram_item(component) for component in oa_raw.oaComponents()
+            )
+        except Exception:
+            oa_components = None
 
+    supply: list[DiagramItem | UnitaryGroup] = []
     for comp in supply_components:
-        if _is_oa_system(comp):
-            oa_raw = comp
-            break
+        if _is_mixer_splitter(comp) or _is_oa_system(comp):
+            continue
+        if _is_unitary_system(comp):
+            parts = _unitary_parts(comp)
+            if parts:
+                supply.append(UnitaryGroup(_diagram_item(comp), parts))
+                continue
+        supply.append(_diagram_item(comp))
+
+    managers: tuple[DiagramItem, ...] = ()
+    try:
+        managers = tuple(
+            _diagram_item(spm) for spm in raw.supplyOutletNode().setpointManagers()
+        )
+    except Exception:
+        pass
+
+    loop_handle = str(raw.handle())
+    zones = []
+    for zone in raw.thermalZones():
+        air_node = None
+        try:
+            air_node = _diagram_item(zone.zoneAirNode())
+        except Exception:
+            pass
+        if not zone_details:
+            zones.append(ZoneItem(_node_id(zone), zone.nameString(), air_node))
+            continue
+        terminal, design_flow = _zone_terminal(zone, loop_handle)
+        zones.append(
+            ZoneItem(
+                _node_id(zone),
+                zone.nameString(),
+                air_node,
+                terminal,
+                _zone_story(zone),
+                design_flow,
+            )
+        )
+
+    return AirLoopSnapshot(
+        raw.nameString(),
+        oa_system,
+        oa_components,
+        tuple(supply),
+        managers,
+        tuple(zones),
+        zone_details,
+    )
+
+
+def plant_loop_snapshot(plant_loop_raw) -> PlantLoopSnapshot:
+    """Walk a plant loop once and capture its diagram topology."""
+    raw = plant_loop_raw
+
+    def _side(components):
+        return tuple(
+            _diagram_item(comp)
+            for comp in components
+            if not _is_mixer_splitter(comp)
+        )
+
+    managers = []
+    try:
+        managers.extend(
+            _diagram_item(spm)
+            for spm in raw.loopTemperatureSetpointNode().setpointManagers()
+        )
+    except Exception:
+        pass
+    try:
+        managers.extend(_diagram_item(manager) for manager in raw.availabilityManagers())
+    except Exception:
+        pass
+
+    return PlantLoopSnapshot(
+        raw.nameString(),
+        _side(raw.supplyComponents()),
+        _side(raw.demandComponents()),
+        tuple(managers),
+    )
+
+
+def _item_lines(item: DiagramItem, show_names: bool, indent: str) -> list[str]:
+    if item.is_node:
+        return [
+            f'{indent}{item.id}(("{item.label(show_names)}"))',
+            f"{indent}class {item.id} node",
+        ]
+    return [
+        f'{indent}{item.id}["{item.label(show_names)}"]',
+        f"{indent}class {item.id} equipment",
+    ]
+
+
+def _manager_lines(managers: tuple[DiagramItem, ...], show_names: bool) -> list[str]:
+    if not managers:
+        return []
+    lines = ['    subgraph MGRS ["Managers"]', "        direction LR"]
+    for manager in managers:
+        lines.append(f'        {manager.id}["{manager.label(show_names)}"]')
+        lines.append(f"        class {manager.id} equipment")
+    lines.append("    end")
+    return lines
+
+
+_GROUP_MODES = ("terminal", "story", "property")
+
+
+def group_demand(
+    snapshot: AirLoopSnapshot,
+    by: str,
+    values: dict[str, object] | None = None,
+) -> tuple[ZoneGroup, ...]:
+    """Group an air loop's zones by terminal type, story, or property value.
+
+    Args:
+        snapshot: Air loop snapshot whose zones are grouped, taken with
+            ``zone_details=True``.
+        by: ``"terminal"``, ``"story"``, or ``"property"``.
+        values: For ``"property"``, the tag value keyed by zone id. Zones
+            without a value land in an ``"Untagged"`` group.
+
+    Returns:
+        Groups sorted by key, each with a stable Mermaid id.
+    """
+    if by not in _GROUP_MODES:
+        raise ValueError(f"by must be one of {_GROUP_MODES}; got {by!r}.")
+
+    groups: dict[str, list[ZoneItem]] = {}
+    for zone in snapshot.zones:
+        if by == "terminal":
+            key = zone.terminal or "No Terminal"
+        elif by == "story":
+            key = zone.story or "No Story"
+        else:
+            value = (values or {}).get(zone.id)
+            key = "Untagged" if value is None else str(value)
+        groups.setdefault(key, []).append(zone)
+
+    return tuple(
+        ZoneGroup(f"ZGROUP{index}", key, tuple(zones))
+        for index, (key, zones) in enumerate(sorted(groups.items()))
+    )
+
+
+def _zone_lines(zone: ZoneItem, indent: str) -> list[str]:
+    lines = []
+    if zone.air_node is not None:
+        lines.append(f'{indent}{zone.air_node.id}(("{_safe(zone.air_node.name)}"))')
+        lines.append(f"{indent}class {zone.air_node.id} node")
+    lines.append(f'{indent}{zone.id}[["{_safe(zone.name)}"]]')
+    lines.append(f"{indent}class {zone.id} zone")
+    return lines
+
+
+def _zone_path(zone: ZoneItem) -> str:
+    parts = ["ZSPLIT"]
+    if zone.air_node is not None:
+        parts.append(zone.air_node.id)
+    return " --> ".join(parts + [zone.id, "ZMIX"])
+
+
+@functools.lru_cache(maxsize=256)
+def render_air_loop_mermaid(
+    snapshot: AirLoopSnapshot,
+    show_names: bool = True,
+    minimize_demand: bool = False,
+    demand_groups: tuple[ZoneGroup, ...] | None = None,
+    expand_groups: frozenset[str] = frozenset(),
+) -> str:
+    """Render an air loop snapshot as a Mermaid flowchart (cached).
+
+    With ``demand_groups`` the demand side draws one box per group, so the
+    source grows with the number of groups rather than zones. Groups whose
+    key is in ``expand_groups`` are drawn zone by zone inside a subgraph.
+    """
+    lines = _diagram_header("node", "equipment", "boundary", "zone", "summary", "blank")
 
     # Outdoor air
-    if oa_raw is not None:
-        oa_raw = _cast(oa_raw, "AirLoopHVACOutdoorAirSystem")
+    if snapshot.oa_system is not None:
+        mixer_label = snapshot.oa_system.label(show_names)
         lines.append('    subgraph OA ["Outdoor Air"]')
         lines.append("        direction LR")
-        oa_node_rendered = False
-        try:
-            oa_components = list(oa_raw.oaComponents())
-            if oa_components:
-                lines.append('        OA_SRC["Outdoor Air"]')
-                lines.append("        class OA_SRC boundary")
-
-                oa_ids = []
-                for component in oa_components:
-                    cid = _node_id(component)
-                    if _is_node(component):
-                        lines.append(f'        {cid}(("{_label(component)}"))')
-                        lines.append(f"        class {cid} node")
-                    else:
-                        lines.append(f'        {cid}["{_label(component)}"]')
-                        lines.append(f"        class {cid} equipment")
-                    oa_ids.append(cid)
-
-                lines.append(f'        OA_MXR["{_label(oa_raw)}"]')
-                lines.append("        class OA_MXR equipment")
-                lines.append("        " + " --> ".join(["OA_SRC"] + oa_ids + ["OA_MXR"]))
-                oa_node_rendered = True
-        except (AttributeError, Exception):
-            pass
-        if not oa_node_rendered:
+        if snapshot.oa_components:
+            lines.append('        OA_SRC["Outdoor Air"]')
+            lines.append("        class OA_SRC boundary")
+            for component in snapshot.oa_components:
+                lines.extend(_item_lines(component, show_names, "        "))
+            lines.append(f'        OA_MXR["{mixer_label}"]')
+            lines.append("        class OA_MXR equipment")
+            oa_ids = [component.id for component in snapshot.oa_components]
+            lines.append("        " + " --> ".join(["OA_SRC"] + oa_ids + ["OA_MXR"]))
+        else:
             lines.append('        OA_SRC["Outdoor Air"]')
-            lines.append(f'        OA_MXR["{_label(oa_raw)}"]')
+            lines.append(f'        OA_MXR["{mixer_label}"]')
             lines.append("        class OA_SRC boundary")
             lines.append("        class OA_MXR equipment")
             lines.append("        OA_SRC --> OA_MXR")
@@ -573,41 +988,25 @@ def build_mermaid_diagram(
         lines.append("    end")
 
     # Supply side
+    supply_chain: list[str] = []
     lines.append('    subgraph SUPPLY ["Supply Side"]')
     lines.append("        direction LR")
     lines.append('        SI(["Supply Inlet"])')
     lines.append("        class SI boundary")
-
-    for comp in supply_components:
-        if _is_mixer_splitter(comp):
-            continue
-        nid = _node_id(comp)
-
-        if _is_oa_system(comp):
+    for entry in snapshot.supply:
+        if isinstance(entry, UnitaryGroup):
+            lines.append(
+                f'        subgraph {entry.item.id}_GROUP ["{entry.item.label(show_names)}"]'
+            )
+            lines.append("            direction LR")
+            for part in entry.parts:
+                lines.append(f'            {part.id}["{part.label(show_names)}"]')
+                lines.append(f"            class {part.id} equipment")
+                supply_chain.append(part.id)
+            lines.append("        end")
             continue
-
-        if _is_unitary_system(comp):
-            parts = _unitary_parts(comp)
-            if parts:
-                lines.append(f'        subgraph {nid}_GROUP ["{_label(comp)}"]')
-                lines.append("            direction LR")
-                for part in parts:
-                    part_id = _node_id(part)
-                    lines.append(f'            {part_id}["{_label(part)}"]')
-                    lines.append(f"            class {part_id} equipment")
-                    supply_chain.append(part_id)
-                lines.append("        end")
-                continue
-
-        lbl = _label(comp)
-        if _is_node(comp):
-            lines.append(f'        {nid}(("{lbl}"))')
-            lines.append(f"        class {nid} node")
-        else:
-            lines.append(f'        {nid}["{lbl}"]')
-            lines.append(f"        class {nid} equipment")
-        supply_chain.append(nid)
-
+        lines.extend(_item_lines(entry, show_names, "        "))
+        supply_chain.append(entry.id)
     lines.append('        SO(["Supply Outlet"])')
     lines.append("        class SO boundary")
     ids = ["SI"] + supply_chain + ["SO"]
@@ -615,24 +1014,11 @@ def build_mermaid_diagram(
         lines.append(f"        {a} --> {b}")
     lines.append("    end")
 
-    # Setpoint managers (from supply outlet node)
-    try:
-        for spm in raw.supplyOutletNode().setpointManagers():
-            managers.append((_node_id(spm), _label(spm)))
-    except (AttributeError, Exception):
-        pass
-
     # Managers
-    if managers:
-        lines.append('    subgraph MGRS ["Managers"]')
-        lines.append("        direction LR")
-        for nid, lbl in managers:
-            lines.append(f'        {nid}["{lbl}"]')
-            lines.append(f"        class {nid} equipment")
-        lines.append("    end")
+    lines.extend(_manager_lines(snapshot.managers, show_names))
 
     # Demand side
-    zones = list(raw.thermalZones())
+    zones = snapshot.zones
     if zones:
         lines.append('    subgraph DEMAND ["Demand Side"]')
         lines.append("        direction LR")
@@ -644,30 +1030,24 @@ def build_mermaid_diagram(
             lines.append(f'        ZSUMMARY[["{label}"]]')
             lines.append("        class ZSUMMARY summary")
             lines.append("        ZSPLIT --> ZSUMMARY --> ZMIX")
+        elif demand_groups is not None:
+            for group in demand_groups:
+                if group.key in expand_groups:
+                    lines.append(f'        subgraph {group.id} ["{group.label()}"]')
+                    lines.append("            direction LR")
+                    for zone in group.zones:
+                        lines.extend(_zone_lines(zone, "            "))
+                    lines.append("        end")
+                    for zone in group.zones:
+                        lines.append("        " + _zone_path(zone))
+                    continue
+                lines.append(f'        {group.id}[["{group.label()}"]]')
+                lines.append(f"        class {group.id} summary")
+                lines.append(f"        ZSPLIT --> {group.id} --> ZMIX")
         else:
             for zone in zones:
-                zid = _node_id(zone)
-                zname = _safe(zone.nameString())
-
-                # Zone air node (EnergyPlus output variable key)
-                in_nid = None
-                try:
-                    air_node = zone.zoneAirNode()
-                    in_nid = _node_id(air_node)
-                    in_nm = _safe(air_node.nameString().strip())
-                    lines.append(f'        {in_nid}(("{in_nm}"))')
-                    lines.append(f"        class {in_nid} node")
-                except (AttributeError, Exception):
-                    pass
-
-                lines.append(f'        {zid}[["{zname}"]]')
-                lines.append(f"        class {zid} zone")
-
-                parts = ["ZSPLIT"]
-                if in_nid:
-                    parts.append(in_nid)
-                parts += [zid, "ZMIX"]
-                lines.append("        " + " --> ".join(parts))
+                lines.extend(_zone_lines(zone, "        "))
+                lines.append("        " + _zone_path(zone))
 
         lines.append('        ZMIX[" "]')
         lines.append('        RI(["Return"])')
@@ -682,125 +1062,47 @@ def build_mermaid_diagram(
     # Cross-subgraph connections
     if zones:
         lines.append("    SO --> ZSPLIT")
-    if oa_raw is not None:
+    if snapshot.oa_system is not None:
         lines.append("    OA_MXR --> SI")
-    if managers:
+    if snapshot.managers:
         lines.append("    MGRS -.-> SO")
 
     return "\n".join(lines)
 
 
-def build_plant_loop_mermaid_diagram(
-    plant_loop_raw,
+@functools.lru_cache(maxsize=256)
+def render_plant_loop_mermaid(
+    snapshot: PlantLoopSnapshot,
     show_names: bool = True,
 ) -> str:
-    """Build a Mermaid flowchart string for a plant loop.
+    """Render a plant loop snapshot as a Mermaid flowchart (cached)."""
+    lines = _diagram_header("node", "equipment", "boundary")
 
-    Nodes render as circles ``(( ))``, equipment as rectangles ``[ ]``,
-    loop boundaries as stadiums ``([ ])``, and manager links as dashed
-    control connections.
-    """
-    raw = plant_loop_raw
-    lines = [
-        "%%{init: {"
-        "'theme': 'base', "
-        "'themeVariables': {"
-        "'background': '#f3f4f6', "
-        "'fontSize': '11px', "
-        "'fontFamily': 'Segoe UI, Arial, sans-serif', "
-        "'primaryTextColor': '#111111', "
-        "'lineColor': '#374151', "
-        "'primaryColor': '#ffffff', "
-        "'primaryBorderColor': '#4b5563', "
-        "'clusterBkg': '#f6f8fb', "
-        "'clusterBorder': '#b8c2cc', "
-        "'edgeLabelBackground': '#ffffff'"
-        "}, "
-        "'flowchart': {"
-        "'nodeSpacing': 26, "
-        "'rankSpacing': 38, "
-        "'curve': 'basis', "
-        "'padding': 10"
-        "}, "
-        "'themeCSS': '"
-        ".cluster rect { rx: 4px; stroke-width: 1.2px; } "
-        ".cluster-label text { font-weight: 600; fill: #111827; } "
-        ".nodeLabel { line-height: 1.25; } "
-        ".edgePath .path { stroke-linecap: round; stroke-linejoin: round; }"
-        "'"
-        "}"
-        "}}%%",
-        "graph LR",
-        "    classDef node fill:#e1e5ea,stroke:#111827,stroke-width:1.1px,color:#111827;",
-        "    classDef equipment fill:#ffffff,stroke:#4b5563,stroke-width:1.1px,color:#111827;",
-        "    classDef boundary fill:#eef1f5,stroke:#111827,stroke-width:1.1px,color:#111827;",
-        "    linkStyle default stroke:#374151,stroke-width:1.35px;",
-    ]
-
-    def _label(obj):
-        if _is_node(obj):
-            return _safe(obj.nameString().strip())
-        tl = _type_label(obj)
-        if show_names:
-            nm = obj.nameString().strip()
-            if nm and nm != tl:
-                return _safe(f"{tl}<br/>{nm}")
-        return _safe(tl)
-
-    def _side_components(components):
-        rendered = []
-        for comp in components:
-            if _is_mixer_splitter(comp):
-                continue
-            nid = _node_id(comp)
-            lbl = _label(comp)
-            if _is_node(comp):
-                lines.append(f'        {nid}(("{lbl}"))')
-                lines.append(f"        class {nid} node")
-            else:
-                lines.append(f'        {nid}["{lbl}"]')
-                lines.append(f"        class {nid} equipment")
-            rendered.append(nid)
-        return rendered
+    def _side(items):
+        for item in items:
+            lines.extend(_item_lines(item, show_names, "        "))
+        return [item.id for item in items]
 
     # Supply side
     lines.append('    subgraph SUPPLY ["Supply Side"]')
     lines.append("        direction LR")
     lines.append('        SI(["Supply Inlet"])')
     lines.append("        class SI boundary")
-    supply_ids = _side_components(list(raw.supplyComponents()))
+    supply_ids = _side(snapshot.supply)
     lines.append('        SO(["Supply Outlet"])')
     lines.append("        class SO boundary")
     for a, b in zip(["SI"] + supply_ids + ["SO"], supply_ids + ["SO"]):
         lines.append(f"        {a} --> {b}")
     lines.append("    end")
 
-    managers: list[tuple[str, str]] = []
-    try:
-        for spm in raw.loopTemperatureSetpointNode().setpointManagers():
-            managers.append((_node_id(spm), _label(spm)))
-    except (AttributeError, Exception):
-        pass
-    try:
-        for manager in raw.availabilityManagers():
-            managers.append((_node_id(manager), _label(manager)))
-    except (AttributeError, Exception):
-        pass
-
-    if managers:
-        lines.append('    subgraph MGRS ["Managers"]')
-        lines.append("        direction LR")
-        for nid, lbl in managers:
-            lines.append(f'        {nid}["{lbl}"]')
-            lines.append(f"        class {nid} equipment")
-        lines.append("    end")
+    lines.extend(_manager_lines(snapshot.managers, show_names))
 
     # Demand side
     lines.append('    subgraph DEMAND ["Demand Side"]')
     lines.append("        direction LR")
     lines.append('        DI(["Demand Inlet"])')
     lines.append("        class DI boundary")
-    demand_ids = _side_components(list(raw.demandComponents()))
+    demand_ids = _side(snapshot.demand)
     lines.append('        DO(["Demand Outlet"])')
     lines.append("        class DO boundary")
     for a, b in zip(["DI"] + demand_ids + ["DO"], demand_ids + ["DO"]):
@@ -809,7 +1111,49 @@ def build_plant_loop_mermaid_diagram(
 
     lines.append("    SO --> DI")
     lines.append("    DO -. return .-> SI")
-    if managers:
+    if snapshot.managers:
         lines.append("    MGRS -.-> SO")
 
     return "\n".join(lines)
+
+
+def build_mermaid_diagram(
+    air_loop_hvac_raw,
+    show_names: bool = True,
+    minimize_demand: bool = False,
+) -> str:
+    """Build a Mermaid flowchart string for an air loop.
+
+    Nodes render as circles ``(( ))``, equipment as rectangles ``[ ]``,
+    system boundaries as stadiums ``([ ])``, and zones as double
+    brackets ``[[ ]]``.
+
+    Args:
+        air_loop_hvac_raw: The raw OpenStudio AirLoopHVAC object
+        show_names: Whether to show component names
+        minimize_demand: Whether to minimize demand side zones
+
+    Returns:
+        Mermaid diagram markup as a string
+    """
+    return render_air_loop_mermaid(
+        air_loop_snapshot(air_loop_hvac_raw),
+        show_names=show_names,
+        minimize_demand=minimize_demand,
+    )
+
+
+def build_plant_loop_mermaid_diagram(
+    plant_loop_raw,
+    show_names: bool = True,
+) -> str:
+    """Build a Mermaid flowchart string for a plant loop.
+
+    Nodes render as circles ``(( ))``, equipment as rectangles ``[ ]``,
+    loop boundaries as stadiums ``([ ])``, and manager links as dashed
+    control connections.
+    """
+    return render_plant_loop_mermaid(
+        plant_loop_snapshot(plant_loop_raw),
+        show_names=show_names,
+    )
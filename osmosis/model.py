@@ -1,6 +1,7 @@
 """Wrapper for openstudio.model.Model"""
 from __future__ import annotations
 
+import weakref
 from typing import Any
 
 import openstudio
@@ -8,6 +9,12 @@ import openstudio
 from .base import OsmObject
 from .registry import get_wrapper_for_snake, wrap, wrap_collection
 from .manager import ComponentManager
+from .additional_properties import (
+    _MISSING,
+    _existing_properties,
+    _read_feature,
+    _read_features,
+)
 from .space_type import SpaceType
 from .default_schedule_set import DefaultScheduleSet
 from .people_definition import PeopleDefinition
@@ -18,8 +25,25 @@ from .lights import Lights
 from .electric_equipment import ElectricEquipment
 
 
+# Model wrappers currently held by callers; per-model caches live in their
+# ``__dict__`` so they are dropped together with the model.
+_live_models: "weakref.WeakSet[Model]" = weakref.WeakSet()
+
+
+def live_model(raw_model) -> "Model | None":
+    """A live ``Model`` wrapper around ``raw_model``, if the caller holds one."""
+    for model in list(_live_models):
+        if model._os_obj == raw_model:
+            return model
+    return None
+
+
 class Model(OsmObject):
 
+    def __init__(self, os_obj: Any):
+        super().__init__(os_obj)
+        _live_models.add(self)
+
     @classmethod
     def new(cls) -> "Model":
         return cls(openstudio.model.Model())
@@ -30,12 +54,22 @@ class Model(OsmObject):
         translator = openstudio.osversion.VersionTranslator()
         os_model = translator.loadModel(openstudio.toPath(path))
         if os_model.is_initialized():
-            return cls(os_model.get())
+            model = cls(os_model.get())
+            model.__dict__["_path"] = str(path)
+            return model
         raise ValueError(f"Could not load model from {path}")
 
+    @property
+    def path(self) -> str | None:
+        """OSM file this model was last loaded from or saved to, if any."""
+        return self.__dict__.get("_path")
+
     def save(self, path: str, overwrite: bool = False):
         """Save model to an OSM file."""
-        return self._os_obj.save(openstudio.toPath(path), overwrite)
+        saved = self._os_obj.save(openstudio.toPath(path), overwrite)
+        if saved:
+            self.__dict__["_path"] = str(path)
+        return saved
 
     def save_as(self, path: str):
         """Save model to an OSM file without overwriting existing files.
@@ -151,6 +185,11 @@ class Model(OsmObject):
         """Alias for air_loop_hvac for convenience."""
         return self.air_loop_hvac
         
+    @property
+    def outdoor_air_controllers(self):
+        """Alias for controller_outdoor_air, with bulk ``configure()``."""
+        return self.controller_outdoor_air
+
     @property
     def air_loops(self) -> list[OsmObject]:
         """Get all air loops in the model."""
@@ -161,6 +200,81 @@ class Model(OsmObject):
         """Get all plant loops in the model."""
         return [wrap(plant_loop) for plant_loop in self._os_obj.getPlantLoops()]
 
+    def export_loop_svgs(
+        self,
+        out_dir: str,
+        show_names: bool = True,
+        minimize_demand: bool = False,
+    ) -> list[str]:
+        """Write one offline-rendered SVG file per air loop and plant loop.
+
+        Returns:
+            Paths of the written files.
+        """
+        from .svg import render_model_svgs
+
+        return render_model_svgs(
+            self,
+            out_dir,
+            show_names=show_names,
+            minimize_demand=minimize_demand,
+        )
+
+    def system_map(
+        self,
+        show_names: bool = True,
+        max_zones: int = 8,
+        collapse=False,
+        width=3600,
+        zoomable: bool = True,
+    ):
+        """Build one diagram of every air loop, plant loop and zone HVAC unit.
+
+        The model is walked once. Shared equipment is drawn once, water
+        coils link to their plant loops, zone HVAC units are grouped by type,
+        and air loops serving more than ``max_zones`` zones show a single
+        zone summary so large models stay readable.
+
+        Args:
+            show_names: Whether to show component names.
+            max_zones: Zone fan-out limit per air loop before summarizing.
+            collapse: ``True`` to draw every loop as one node, or loop names
+                to collapse only those loops.
+            width: Display width in the notebook.
+            zoomable: Whether to render the zoomable notebook widget.
+
+        Returns:
+            A notebook-displayable ``MermaidDiagram``; ``str()`` gives the
+            Mermaid source.
+        """
+        from .system_map import build_system_map
+
+        return build_system_map(
+            self,
+            show_names=show_names,
+            max_zones=max_zones,
+            collapse=collapse,
+            width=width,
+            zoomable=zoomable,
+        )
+
+    def apply_system_template(self, template, groups, plant_loops=None):
+        """Stamp an HVAC system template onto zone groups.
+
+        Args:
+            template: A ``SystemTemplate`` or its dict definition.
+            groups: ``{group_key: zones}`` or an iterable of zones.
+            plant_loops: Optional existing plant loops by template key.
+
+        Returns:
+            SystemBuild: Air loops, plant loops and terminals by name.
+        """
+        from .system_template import SystemTemplate
+
+        if not isinstance(template, SystemTemplate):
+            template = SystemTemplate.from_dict(template)
+        return template.apply(self, groups, plant_loops=plant_loops)
+
     @property
     def zone_hvacs(self) -> list[OsmObject]:
         """Get all zone HVAC components in the model."""
@@ -196,14 +310,11 @@ class Model(OsmObject):
         """
         properties: dict[str, set[Any]] = {}
 
-        for space in self.spaces:
-            props = space.additional_properties
-            for feature_name in props.feature_names:
-                try:
-                    value = props.get(feature_name)
-                except Exception:
-                    continue
-
+        for raw_space in self._os_obj.getSpaces():
+            raw_props = _existing_properties(raw_space)
+            if raw_props is None:
+                continue
+            for feature_name, value in _read_features(raw_props).items():
                 properties.setdefault(feature_name, set()).add(value)
 
         return {
@@ -211,6 +322,309 @@ class Model(OsmObject):
             for key, values in sorted(properties.items())
         }
 
+    def property_index(self, object_type="space", refresh: bool = False):
+        """Return an inverted AdditionalProperties index for one object type.
+
+        Args:
+            object_type: Snake_case name (``"thermal_zone"``), SDK class name
+                (``"ThermalZone"``) or wrapper class. Defaults to spaces.
+            refresh: Rebuild the cached index from the model.
+
+        Returns:
+            PropertyIndex: Cached per model and object type. It stays current
+            when features are set through Osmosis; pass ``refresh=True`` after
+            editing features through the raw SDK.
+        """
+        from .property_index import PropertyIndex, resolve_sdk_name
+
+        sdk_name = resolve_sdk_name(object_type)
+        indexes = self.__dict__.setdefault("_property_indexes", {})
+        index = indexes.get(sdk_name)
+        if index is None:
+            index = PropertyIndex(self._os_obj, sdk_name)
+            indexes[sdk_name] = index
+        elif refresh:
+            index.refresh()
+        return index
+
+    def space_geometry(self):
+        """Extract every space's floor geometry into NumPy arrays.
+
+        Floor polygons (flat vertices plus offsets), floor area, volume,
+        centroid, bounding box, story and exterior wall area are read in
+        one pass over the model's spaces. Requires NumPy.
+
+        Returns:
+            SpaceGeometry: Per-space arrays in building coordinates.
+        """
+        from .space_geometry import extract_space_geometry
+
+        return extract_space_geometry(self._os_obj)
+
+    def spatial_index(self, refresh: bool = False):
+        """Return a bounding-box spatial index over the model's spaces.
+
+        Args:
+            refresh: Rebuild the cached index from the model.
+
+        Returns:
+            SpatialIndex: Cached per model and rebuilt when spaces or
+            surfaces are added or removed. Its surface table (matched
+            surfaces, boundary conditions) is a snapshot; pass
+            ``refresh=True`` after moving geometry or matching surfaces
+            through the raw SDK. Requires NumPy.
+        """
+        from .spatial_index import SpatialIndex
+
+        index = self.__dict__.get("_spatial_index")
+        if index is None or refresh or not index.is_current():
+            index = SpatialIndex(self._os_obj)
+            self.__dict__["_spatial_index"] = index
+        return index
+
+    def intersect_and_match(
+        self,
+        spaces=None,
+        intersect: bool = True,
+        match: bool = True,
+        tolerance: float = 0.01,
+    ) -> dict:
+        """Intersect and match surfaces between neighboring spaces.
+
+        Same result as ``openstudio.model.intersectSurfaces`` followed by
+        ``matchSurfaces`` over the same spaces, but the SDK only runs on
+        space pairs the spatial index finds with facing, overlapping
+        surfaces. Requires NumPy.
+
+        Args:
+            spaces: Restrict to these spaces (e.g. one story and its
+                vertical neighbors). Defaults to every space.
+            intersect: Split facing surfaces to identical shapes first.
+            match: Set adjacent surfaces and boundary conditions.
+            tolerance: Bounding box growth and plane distance in meters.
+
+        Returns:
+            dict: Pair counts (``pairs_total``, ``pairs_candidate``,
+            ``pairs_checked``, ``pairs_pruned``), ``surfaces_added`` and
+            per-step ``seconds``.
+        """
+        from .surface_matching import intersect_and_match
+
+        report = intersect_and_match(
+            self.spatial_index(refresh=True),
+            spaces=spaces,
+            intersect=intersect,
+            match=match,
+            tolerance=tolerance,
+        )
+        # Split surfaces and new adjacencies leave the cached index stale.
+        self.__dict__.pop("_spatial_index", None)
+        return report
+
+    def auto_zone(
+        self,
+        strategy=("story", "space_type"),
+        property_name: str | None = None,
+        name_pattern: str | None = None,
+        remove_empty: bool = True,
+        dry_run: bool = False,
+    ) -> dict:
+        """Group spaces into thermal zones and assign them in bulk.
+
+        Spaces with the same labels share a zone. Labels are read from the
+        model on every call (a fresh surface table and one pass over the
+        spaces), so edits made after a dry run are picked up:
+
+        - ``"story"``: building story name.
+        - ``"space_type"``: space type name.
+        - ``"orientation"``: ``"North Perimeter"`` ... ``"West Perimeter"``
+          by the largest outdoor wall facade, or ``"Core"``.
+        - ``"exposure"``: outdoor ``Walls``, ``Roof``, ``Floor`` and
+          ``Ground`` contact joined with ``+``, or ``"Interior"``.
+        - ``"property"``: the Space AdditionalProperties value of
+          ``property_name`` (added automatically when it is given).
+
+        A group that already fills one zone on its own keeps that zone.
+        Other zones end up empty and are removed, unless they have zone
+        equipment or an air loop. Requires NumPy.
+
+        Removing zones is the slow step on large models (a few ms per zone
+        in OpenStudio); pass ``remove_empty=False`` to keep them.
+
+        Args:
+            strategy: One label key or a sequence of them.
+            property_name: Space AdditionalProperties feature to group by.
+            name_pattern: Zone name format using the strategy keys, e.g.
+                ``"{story} {orientation}"``. Defaults to the labels joined
+                with spaces.
+            remove_empty: Remove zones left without spaces.
+            dry_run: Return the plan without changing the model.
+
+        Returns:
+            dict: ``{"zones": {zone: [spaces]}, "created": [...],
+            "reused": [...], "removed": [...], "emptied": [...]}`` with
+            names; ``emptied`` zones are left in the model without spaces.
+        """
+        from .zoning import auto_zone
+
+        return auto_zone(
+            self,
+            self.spatial_index(),
+            strategy=strategy,
+            property_name=property_name,
+            name_pattern=name_pattern,
+            remove_empty=remove_empty,
+            dry_run=dry_run,
+        )
+
+    def setpoint_manager_index(self):
+        """Return a node -> control variable -> setpoint manager index.
+
+        Built in one pass over the model's setpoint managers. Use ``check()``
+        for conflicts, loops without supply outlet managers and water coil
+        controllers whose sensor nodes lack setpoints, and
+        ``place_managers(spec)`` to place managers in bulk.
+
+        Returns:
+            SetpointManagerIndex: A fresh index on every call.
+        """
+        from .setpoint_index import SetpointManagerIndex
+
+        return SetpointManagerIndex(self._os_obj)
+
+    def water_component_index(self, refresh: bool = False):
+        """Return the index of water-side components and their plant loops.
+
+        Args:
+            refresh: Rebuild the cached index from the model.
+
+        Returns:
+            WaterComponentIndex: Cached per model. Removed components drop
+            out on their own and connections made through Osmosis are
+            recorded; pass ``refresh=True`` after connecting or
+            disconnecting components through the raw SDK.
+        """
+        from .water_index import live_index
+
+        index = self.__dict__.get("_water_component_index")
+        if index is None:
+            index = live_index(self._os_obj)
+            self.__dict__["_water_component_index"] = index
+        elif refresh:
+            index.refresh()
+        return index
+
+    def set_additional_properties(
+        self,
+        frame,
+        key: str = "name",
+        object_type="space",
+    ) -> dict[str, Any]:
+        """Bulk-set AdditionalProperties from a table of objects x features.
+
+        See ``osmosis.property_table.set_additional_properties``.
+        """
+        from .property_table import set_additional_properties
+
+        return set_additional_properties(
+            self,
+            frame,
+            key=key,
+            object_type=object_type,
+        )
+
+    def internal_load_summary(self, level="space") -> dict[str, Any]:
+        """Roll up people, lighting and equipment loads in one pass.
+
+        Loads assigned directly to spaces and inherited from their space
+        types are both counted. Each definition and space type is read once;
+        per-space totals are then computed as arrays, and ``Watts/Person``
+        loads use the people in the same space. Zone multipliers are not
+        applied. Requires NumPy.
+
+        Args:
+            level: ``"space"``, ``"zone"``, ``"story"`` or ``"space_type"``,
+                or a sequence of them to get every table from one pass.
+
+        Returns:
+            dict: Columns ``name`` (``None`` for unassigned spaces),
+            ``floor_area``, ``people``, ``lighting_power``,
+            ``equipment_power`` and their ``*_density`` per m2 as NumPy
+            arrays, plus ``people_schedules``, ``lighting_schedules`` and
+            ``equipment_schedules`` as lists of schedule names. A sequence
+            of levels returns ``{level: table}``. Pass a table to
+            ``pandas.DataFrame`` for a frame.
+        """
+        from .internal_loads import internal_load_summary
+
+        return internal_load_summary(self._os_obj, level)
+
+    def configure_zone_sizing(
+        self,
+        zones=None,
+        cooling=None,
+        heating=None,
+        doas=None,
+        **fields,
+    ) -> dict[str, list]:
+        """Set Sizing:Zone fields on many thermal zones in one pass.
+
+        Each zone's Sizing:Zone is looked up once and every field's setter
+        is resolved once for the whole call. Values may be scalars (applied
+        to every zone) or per-zone sequences such as NumPy arrays; ``None``
+        or NaN cells are skipped. Fields that already hold the value are
+        left alone.
+
+        Args:
+            zones: Zones or zone names; defaults to every zone. May also be a
+                DataFrame or ``{column: values}`` table whose ``name`` column
+                (or DataFrame index) holds zone names and whose other columns
+                are keyword arguments of this method.
+            cooling: Cooling design supply air temperature; also sets its
+                input method to ``SupplyAirTemperature``.
+            heating: Heating design supply air temperature, likewise.
+            doas: Dedicated outdoor air sizing as in
+                ``ThermalZone.configure_dedicated_outdoor_air_sizing``:
+                ``low_setpoint_temperature``, ``high_setpoint_temperature``,
+                ``control_strategy`` and ``heating_maximum_air_flow_fraction``.
+                Also turns on ``account_for_dedicated_outdoor_air_system``.
+            **fields: Other snake_case Sizing:Zone fields; ``"autosize"`` is
+                accepted for autosizable ones.
+
+        Returns:
+            dict: ``{"changes": [(zone, field, old, new)], "unchanged":
+            [...], "failed": [(zone, field, value)], "unknown_zones": [...]}``
+            with zone names.
+
+        Raises:
+            AttributeError: If Sizing:Zone has no setter for a field.
+        """
+        from .zone_sizing import configure_zone_sizing
+
+        return configure_zone_sizing(
+            self, zones, cooling=cooling, heating=heating, doas=doas, **fields
+        )
+
+    def dedupe_load_definitions(self, dry_run: bool = False) -> dict[str, Any]:
+        """Share one definition among identical people, lights and electric
+        equipment definitions.
+
+        Definitions of the same type whose fields other than the name all
+        match (numbers compared by value) are merged into the first one by
+        name: their loads are repointed to it and the duplicates are
+        removed. Unused duplicates are removed too.
+
+        Args:
+            dry_run: Report what would change without touching the model.
+
+        Returns:
+            dict: ``{"merged": {kept: [duplicates]}, "repointed": [...],
+            "removed": [...]}`` with definition and load names.
+        """
+        from .load_definitions import dedupe_load_definitions
+
+        return dedupe_load_definitions(self._os_obj, dry_run=dry_run)
+
     def group_zones_by_additional_space_property(
         self,
         property_name: str,
@@ -228,24 +642,29 @@ class Model(OsmObject):
         )
         seen_zone_ids: set[str] = set()
 
-        for space in self.spaces:
-            props = space.additional_properties
-            value = props.get(normalized_property_name)
-            if value is None:
-                value = props.get(property_name)
-            if value is None:
+        # Scanned live: the cached property index misses raw SDK edits such
+        # as cloned or removed spaces.
+        for raw_space in self._os_obj.getSpaces():
+            raw_props = _existing_properties(raw_space)
+            if raw_props is None:
+                continue
+            value = _read_feature(raw_props, normalized_property_name)
+            if value is _MISSING:
+                value = _read_feature(raw_props, property_name)
+            if value is _MISSING:
                 continue
 
-            zone = space.thermal_zone
-            if zone is None:
+            raw_zone = raw_space.thermalZone()
+            if not raw_zone.is_initialized():
                 continue
+            raw_zone = raw_zone.get()
 
-            zone_id = zone.handle or str(zone.name) or repr(zone.raw)
+            zone_id = str(raw_zone.handle())
             if zone_id in seen_zone_ids:
                 continue
 
             seen_zone_ids.add(zone_id)
-            groups.setdefault(value, []).append(zone)
+            groups.setdefault(value, []).append(wrap(raw_zone))
 
         return groups
 
@@ -268,7 +687,8 @@ class Model(OsmObject):
                     f"openstudio.model.{sdk_name} does not exist in the "
                     f"installed SDK. Check your OpenStudio version."
                 )
-            return ComponentManager(self._os_obj, os_cls, wrapper_cls)
+            manager_cls = getattr(wrapper_cls, "_manager_class", ComponentManager)
+            return manager_cls(self._os_obj, os_cls, wrapper_cls)
 
         # --- Existing camelCase / collection fallback ---
         original_name = name
@@ -9,6 +9,7 @@ from .plant_loop import PlantLoop
 from .schedule_constant import ScheduleConstant
 from .base import OsmObject
 from .manager import ComponentManager
+from .controller_outdoor_air import OutdoorAirControllerManager
 from .additional_properties import AdditionalProperties
 from .air_loop import AirLoopHVAC
 from .air_loop_hvac_unitary_system import AirLoopHVACUnitarySystem
@@ -57,6 +58,8 @@ class Model:
     def air_loops(self) -> list[AirLoopHVAC]: ...
     @property
     def plant_loops(self) -> list[PlantLoop]: ...
+    @property
+    def outdoor_air_controllers(self) -> OutdoorAirControllerManager: ...
     def __getattr__(self, name: str) -> Any: ...
     @property
     def additional_properties(self) -> ComponentManager[AdditionalProperties]: ...
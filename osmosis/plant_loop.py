@@ -2,13 +2,19 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from .base import OsmObject
 from .registry import register_custom_wrapper, wrap, wrap_collection
 from .mermaid import (
     MermaidDiagram,
-    build_plant_loop_mermaid_diagram,
+    PlantLoopSnapshot,
+    plant_loop_snapshot,
+    render_plant_loop_mermaid,
     _idd_type,
 )
+from .svg import render_plant_loop_svg
+from .water_index import live_index, notify_plant_connected
 
 
 @register_custom_wrapper("PlantLoop")
@@ -47,6 +53,7 @@ class PlantLoop(OsmObject):
                     f"OpenStudio rejected adding {_component_label(raw)} "
                     "to the plant loop supply side."
                 )
+            notify_plant_connected(raw, self._os_obj, "supply")
         return self
 
     def add_demand(self, *components) -> "PlantLoop":
@@ -58,8 +65,68 @@ class PlantLoop(OsmObject):
                     f"OpenStudio rejected adding {_component_label(raw)} "
                     "to the plant loop demand side."
                 )
+            notify_plant_connected(raw, self._os_obj, "demand")
         return self
 
+    def connect_all(
+        self,
+        coils,
+        configure_controllers: bool = True,
+        **controller_settings,
+    ) -> dict[str, Any]:
+        """Add many water coils to the demand side in one pass.
+
+        Coils already on any plant loop are skipped; the check uses the
+        model's cached water component index (``Model.water_component_index``)
+        instead of asking each coil for its plant loop. Connected coils that
+        have a Controller:WaterCoil are configured in the same pass.
+
+        Args:
+            coils: Wrapped or raw coils (or other demand components).
+            configure_controllers: Call ``configure_water_coil_controller``
+                on each connected coil that supports it.
+            **controller_settings: Passed to
+                ``configure_water_coil_controller``.
+
+        Returns:
+            ``{"connected": [...], "skipped": [...], "failed": [...],
+            "controllers": int, "unconnected": [...]}`` with component names;
+            ``unconnected`` lists every water coil in the model still not on
+            a plant loop afterwards.
+        """
+        from .model import live_model
+
+        raw_model = self._os_obj.model()
+        model = live_model(raw_model)
+        index = model.water_component_index() if model is not None else live_index(raw_model)
+        report: dict[str, Any] = {
+            "connected": [],
+            "skipped": [],
+            "failed": [],
+            "controllers": 0,
+        }
+        for coil in coils:
+            raw = OsmObject.unwrap(coil)
+            name = raw.nameString()
+            if index.is_connected(raw):
+                report["skipped"].append(name)
+                continue
+            if not self._os_obj.addDemandBranchForComponent(raw):
+                report["failed"].append(name)
+                continue
+            notify_plant_connected(raw, self._os_obj, "demand")
+            report["connected"].append(name)
+
+            if configure_controllers:
+                wrapped = coil if isinstance(coil, OsmObject) else wrap(raw)
+                configure = getattr(type(wrapped), "configure_water_coil_controller", None)
+                if configure is not None and wrapped.controller_water_coil is not None:
+                    configure(wrapped, **controller_settings)
+                    report["controllers"] += 1
+
+        report["unconnected"] = [coil.name for coil in index.unconnected()]
+        return report
+
     def add_pump(self, *pumps) -> "PlantLoop":
         """Add pumps to the supply inlet node of this plant loop."""
         raw_node = self._os_obj.supplyInletNode()
@@ -91,6 +158,21 @@ class PlantLoop(OsmObject):
                 )
         return self
 
+    def clone(self, name: str | None = None, share_schedules: bool = True) -> "PlantLoop":
+        """Copy this loop's supply side, pumps and setpoint managers.
+
+        The demand side starts empty. Cloned objects are renamed from the
+        new loop name ("HW Pump" becomes "HW 2 Pump").
+
+        Args:
+            name: Name of the copy; OpenStudio's default when omitted.
+            share_schedules: Reuse this loop's schedules. ``False`` gives the
+                copy its own copies of every non-constant schedule.
+        """
+        from .cloning import clone_plant_loop
+
+        return clone_plant_loop(self, name, share_schedules)
+
     @property
     def supply_components(self) -> list[OsmObject]:
         """Get all supply-side plant loop components."""
@@ -113,22 +195,45 @@ class PlantLoop(OsmObject):
         """Get availability managers assigned to this plant loop."""
         return wrap_collection(self._os_obj.availabilityManagers())
 
-    def _build_mermaid(self, show_names: bool = True) -> str:
+    def diagram_snapshot(self) -> PlantLoopSnapshot:
+        """Capture this loop's diagram topology in a single traversal."""
+        return plant_loop_snapshot(self._os_obj)
+
+    def _build_mermaid(
+        self,
+        show_names: bool = True,
+        snapshot: PlantLoopSnapshot | None = None,
+    ) -> str:
         """Build a Mermaid flowchart string for this plant loop."""
-        return build_plant_loop_mermaid_diagram(
-            self._os_obj,
-            show_names=show_names,
-        )
+        if snapshot is None:
+            snapshot = self.diagram_snapshot()
+        return render_plant_loop_mermaid(snapshot, show_names=show_names)
+
+    def to_svg(self, show_names: bool = True) -> str:
+        """Render this plant loop as a standalone SVG document without network access."""
+        return render_plant_loop_svg(self.diagram_snapshot(), show_names=show_names)
 
     def show(
         self,
         show_names: bool = True,
         width=3000,
         zoomable: bool = True,
+        renderer: str = "mermaid",
     ) -> None:
-        """Render the plant loop as a Mermaid diagram in a Jupyter notebook."""
-        src = self._build_mermaid(show_names=show_names)
-        diagram = MermaidDiagram(src, width=width, zoomable=zoomable)
+        """Render the plant loop as a diagram in a Jupyter notebook.
+
+        Args:
+            renderer: ``"mermaid"`` to fetch images from mermaid.ink, or
+                ``"svg"`` to lay out the diagram locally and embed it inline.
+        """
+        if renderer not in ("mermaid", "svg"):
+            raise ValueError(f"renderer must be 'mermaid' or 'svg'; got {renderer!r}.")
+        snapshot = self.diagram_snapshot()
+        src = self._build_mermaid(show_names=show_names, snapshot=snapshot)
+        svg = None
+        if renderer == "svg":
+            svg = render_plant_loop_svg(snapshot, show_names=show_names)
+        diagram = MermaidDiagram(src, width=width, zoomable=zoomable, svg=svg)
         try:
             from IPython.display import HTML, display
 
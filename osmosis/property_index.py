@@ -0,0 +1,227 @@
+"""Inverted index over AdditionalProperties for fast tag queries."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterable, Mapping
+
+import openstudio
+
+from .additional_properties import (
+    _MISSING,
+    _existing_properties,
+    _feature_listeners,
+    _read_features,
+)
+from .registry import get_wrapper_for_snake, wrap
+
+if TYPE_CHECKING:
+    from .base import OsmObject
+
+
+class PropertyIndex:
+    """
+    Feature name -> value -> objects index for one model object type.
+
+    The index is built in a single pass over the model and is kept current
+    when features are set or deleted through Osmosis ``AdditionalProperties``.
+    Call ``refresh()`` after editing features through the raw SDK.
+
+    Usage
+    -----
+    index = model.property_index("space")
+    vestibules = index.find("hvac_system", "vestibule")
+    tenant_a_vav = index.filter({"tenant": "A", "hvac_system": "vav"})
+    either = index.filter({"tenant": "A", "hvac_system": "vav"}, match="any")
+    """
+
+    def __init__(self, raw_model, sdk_name: str):
+        self._raw_model = raw_model
+        self._sdk_name = sdk_name
+        self._idd_name = f"OS:{sdk_name}"
+        self._objects: dict[str, Any] = {}
+        self._features: dict[str, dict[Any, dict[str, None]]] = {}
+        self._values_by_object: dict[str, dict[str, Any]] = {}
+        self.refresh()
+        _feature_listeners.add(self)
+
+    @property
+    def object_type(self) -> str:
+        """SDK class name of the indexed objects."""
+        return self._sdk_name
+
+    @property
+    def feature_names(self) -> list[str]:
+        """Sorted feature names present on at least one indexed object."""
+        return sorted(self._features)
+
+    def refresh(self) -> "PropertyIndex":
+        """Rebuild the index from the model in one pass."""
+        getter = getattr(self._raw_model, f"get{self._sdk_name}s", None)
+        if getter is None:
+            raise ValueError(
+                f"Model has no collection getter for '{self._sdk_name}'."
+            )
+
+        self._objects.clear()
+        self._features.clear()
+        self._values_by_object.clear()
+
+        for raw_obj in getter():
+            handle = str(raw_obj.handle())
+            self._objects[handle] = raw_obj
+            raw_props = _existing_properties(raw_obj)
+            if raw_props is None:
+                continue
+            for name, value in _read_features(raw_props).items():
+                self._add(handle, name, value)
+        return self
+
+    def values(self, name: str) -> list[Any]:
+        """Distinct values stored for a feature, sorted by their text."""
+        return sorted(self._features.get(name, {}), key=lambda value: str(value))
+
+    def find_handles(self, name: str, value: Any) -> list[str]:
+        """Handles of objects whose feature ``name`` equals ``value``."""
+        return list(self._lookup(name, value))
+
+    def find(self, name: str, value: Any) -> list[OsmObject]:
+        """Wrapped objects whose feature ``name`` equals ``value``.
+
+        String values fall back to a case-insensitive match when no exact
+        value is stored.
+        """
+        return self._wrap_handles(self._lookup(name, value))
+
+    def filter(
+        self,
+        criteria: Mapping[str, Any] | None = None,
+        match: str = "all",
+        **kwargs,
+    ) -> list[OsmObject]:
+        """Wrapped objects matching several feature criteria.
+
+        Args:
+            criteria: ``{feature_name: value}``. A list, tuple, or set value
+                matches any of its members.
+            match: ``"all"`` to AND the criteria together, ``"any"`` to OR them.
+            **kwargs: Extra criteria for feature names that are identifiers.
+        """
+        if match not in ("all", "any"):
+            raise ValueError(f"match must be 'all' or 'any'; got {match!r}.")
+
+        items = dict(criteria or {}, **kwargs)
+        if not items:
+            return self._wrap_handles(self._objects)
+
+        selected: dict[str, None] | None = None
+        for name, wanted in items.items():
+            handles: dict[str, None] = {}
+            for value in _as_choices(wanted):
+                handles.update(self._lookup(name, value))
+
+            if selected is None:
+                selected = handles
+            elif match == "all":
+                selected = {handle: None for handle in selected if handle in handles}
+            else:
+                selected.update(handles)
+
+        return self._wrap_handles(selected or {})
+
+    def groups(self, name: str) -> dict[Any, list[OsmObject]]:
+        """Map each value of feature ``name`` to its wrapped objects."""
+        return {
+            value: self._wrap_handles(handles)
+            for value, handles in self._features.get(name, {}).items()
+        }
+
+    def _raw_groups(self, name: str) -> dict[Any, list[tuple[str, Any]]]:
+        return {
+            value: [(handle, self._objects[handle]) for handle in handles]
+            for value, handles in self._features.get(name, {}).items()
+        }
+
+    def _lookup(self, name: str, value: Any) -> dict[str, None]:
+        by_value = self._features.get(name, {})
+        if value in by_value:
+            return by_value[value]
+
+        if isinstance(value, str):
+            normalized_value = value.casefold()
+            for key, handles in by_value.items():
+                if isinstance(key, str) and key.casefold() == normalized_value:
+                    return handles
+
+        return {}
+
+    def _wrap_handles(self, handles: Iterable[str]) -> list[OsmObject]:
+        return [wrap(self._objects[handle]) for handle in handles]
+
+    def _add(self, handle: str, name: str, value: Any) -> None:
+        self._features.setdefault(name, {}).setdefault(value, {})[handle] = None
+        self._values_by_object.setdefault(handle, {})[name] = value
+
+    def _discard(self, handle: str, name: str) -> None:
+        old_value = self._values_by_object.get(handle, {}).pop(name, _MISSING)
+        if old_value is _MISSING:
+            return
+        by_value = self._features[name]
+        by_value[old_value].pop(handle, None)
+        if not by_value[old_value]:
+            del by_value[old_value]
+        if not by_value:
+            del self._features[name]
+
+    def _feature_changed(self, raw_owner, name: str, value: Any) -> None:
+        """Apply one feature change made through Osmosis."""
+        if raw_owner.iddObjectType().valueDescription() != self._idd_name:
+            return
+
+        handle = str(raw_owner.handle())
+        if handle not in self._objects:
+            if not self._raw_model.getObject(raw_owner.handle()).is_initialized():
+                return
+            self._objects[handle] = _cast_owner(raw_owner, self._sdk_name)
+
+        self._discard(handle, name)
+        if value is not _MISSING:
+            self._add(handle, name, value)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._features
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def __repr__(self) -> str:
+        return (
+            f"<PropertyIndex [{self._sdk_name}] objects={len(self._objects)} "
+            f"features={len(self._features)}>"
+        )
+
+
+def resolve_sdk_name(object_type) -> str:
+    """Return the SDK class name for a wrapper class, SDK name, or snake name."""
+    if isinstance(object_type, type):
+        object_type = object_type.__name__
+    if hasattr(openstudio.model, object_type):
+        return object_type
+    result = get_wrapper_for_snake(object_type)
+    if result is None:
+        raise ValueError(f"Unknown OpenStudio object type: {object_type!r}")
+    return result[0]
+
+
+def _as_choices(value: Any) -> Iterable[Any]:
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return value
+    return (value,)
+
+
+def _cast_owner(raw_owner, sdk_name: str):
+    cast_fn = getattr(raw_owner, f"to_{sdk_name}", None)
+    if cast_fn is None:
+        return raw_owner
+    optional = cast_fn()
+    if optional.is_initialized():
+        return optional.get()
+    return raw_owner
@@ -0,0 +1,172 @@
+"""Columnar bulk tagging of AdditionalProperties from a table."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
+
+from .additional_properties import _notify_feature_changed
+from .property_index import resolve_sdk_name
+
+if TYPE_CHECKING:
+    from .model import Model
+
+
+def set_additional_properties(
+    model: "Model",
+    frame,
+    key: str = "name",
+    object_type="space",
+) -> dict[str, Any]:
+    """Set AdditionalProperties on many objects from a table.
+
+    Each feature column is typed once: all-bool columns are stored as
+    Boolean, all-int columns as Integer, numeric columns as Double, and
+    anything else as String. Empty cells (``None`` or NaN) are skipped.
+
+    Args:
+        model: Osmosis Model wrapper.
+        frame: A pandas-style DataFrame, a ``{column: values}`` mapping, or a
+            sequence of row mappings. The ``key`` column identifies objects;
+            a DataFrame without that column uses its index instead.
+        key: ``"name"`` or ``"handle"``. Also the key column's name.
+        object_type: Snake_case name, SDK class name or wrapper class of the
+            objects to tag. Defaults to spaces.
+
+    Returns:
+        ``{"objects": int, "features": int, "unknown_keys": list}`` with the
+        number of objects tagged, features written and keys not found.
+    """
+    if key not in ("name", "handle"):
+        raise ValueError(f"key must be 'name' or 'handle'; got {key!r}.")
+
+    keys, columns = _table_columns(frame, key)
+    sdk_name = resolve_sdk_name(object_type)
+    raw_model = model.raw
+    getter = getattr(raw_model, f"get{sdk_name}s", None)
+    if getter is None:
+        raise ValueError(f"Model has no collection getter for '{sdk_name}'.")
+
+    lookup = {}
+    for raw_obj in getter():
+        if key == "name":
+            lookup[raw_obj.nameString()] = raw_obj
+        else:
+            lookup[_normalize_handle(raw_obj.handle())] = raw_obj
+
+    typed_columns = {
+        name: _typed_column(name, values) for name, values in columns.items()
+    }
+
+    unknown_keys = []
+    tagged = 0
+    written = 0
+    for row, object_key in enumerate(keys):
+        lookup_key = (
+            str(object_key) if key == "name" else _normalize_handle(object_key)
+        )
+        raw_obj = lookup.get(lookup_key)
+        if raw_obj is None:
+            unknown_keys.append(object_key)
+            continue
+
+        raw_props = None
+        for name, values in typed_columns.items():
+            value = values[row]
+            if value is None:
+                continue
+            if raw_props is None:
+                raw_props = raw_obj.additionalProperties()
+            if not raw_props.setFeature(name, value):
+                raise ValueError(
+                    f"Failed to set feature '{name}' with value {value!r} "
+                    f"on {sdk_name} '{object_key}'"
+                )
+            _notify_feature_changed(raw_props, name, value, raw_owner=raw_obj)
+            written += 1
+
+        if raw_props is not None:
+            tagged += 1
+
+    return {"objects": tagged, "features": written, "unknown_keys": unknown_keys}
+
+
+def _table_columns(frame, key: str) -> tuple[list[Any], dict[str, list[Any]]]:
+    """Split a table into its key column and feature columns."""
+    if hasattr(frame, "columns") and hasattr(frame, "index"):
+        columns = {str(name): list(frame[name]) for name in frame.columns}
+        if key in columns:
+            keys = columns.pop(key)
+        else:
+            keys = list(frame.index)
+        return keys, columns
+
+    if isinstance(frame, Mapping):
+        columns = {str(name): list(values) for name, values in frame.items()}
+        if key not in columns:
+            raise KeyError(f"Table has no '{key}' column.")
+        keys = columns.pop(key)
+        lengths = {len(values) for values in columns.values()}
+        if lengths - {len(keys)}:
+            raise ValueError("All table columns must have the same length.")
+        return keys, columns
+
+    if isinstance(frame, Sequence):
+        names: dict[str, None] = {}
+        for row in frame:
+            names.update(dict.fromkeys(str(name) for name in row))
+        if key not in names:
+            raise KeyError(f"Table has no '{key}' column.")
+        del names[key]
+        keys = [row.get(key) for row in frame]
+        columns = {name: [row.get(name) for row in frame] for name in names}
+        return keys, columns
+
+    raise TypeError(
+        "frame must be a DataFrame, a {column: values} mapping, "
+        f"or a sequence of row mappings; got {type(frame).__name__}."
+    )
+
+
+def _typed_column(name: str, values: list[Any]) -> list[Any]:
+    """Coerce one column to a single feature type, keeping empty cells as None."""
+    cells = [None if _is_empty(value) else _python_scalar(value) for value in values]
+    present = [value for value in cells if value is not None]
+
+    if all(isinstance(value, bool) for value in present):
+        cast = bool
+    elif all(
+        isinstance(value, int) and not isinstance(value, bool) for value in present
+    ):
+        cast = int
+    elif all(
+        isinstance(value, (int, float)) and not isinstance(value, bool)
+        for value in present
+    ):
+        cast = float
+    else:
+        cast = str
+
+    return [None if value is None else cast(value) for value in cells]
+
+
+def _is_empty(value: Any) -> bool:
+    if value is None:
+        return True
+    try:
+        return value != value
+    except Exception:
+        return False
+
+
+def _python_scalar(value: Any) -> Any:
+    """Convert NumPy-style scalars to their Python equivalents."""
+    item = getattr(value, "item", None)
+    if item is not None and not isinstance(value, (str, bytes)):
+        try:
+            return item()
+        except (TypeError, ValueError):
+            return value
+    return value
+
+
+def _normalize_handle(handle: Any) -> str:
+    return str(handle).strip().strip("{}").lower()
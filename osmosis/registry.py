@@ -124,3 +124,113 @@ def wrap(os_obj):
 def wrap_collection(collection) -> list:
     """Wrap a collection of OpenStudio SDK objects."""
     return [wrap(item) for item in collection] if collection else []
+
+
+# IDD type -> component categories, e.g. "OS:Coil:Heating:Water" ->
+# {"coil", "coil/heating"}. Built once on first use.
+_CATEGORY_PREFIXES = (
+    ("OS:Coil:", "coil"),
+    ("OS:CoilSystem:", "coil"),
+    ("OS:Fan:", "fan"),
+    ("OS:Pump:", "pump"),
+    ("OS:HeaderedPumps:", "pump"),
+    ("OS:AirTerminal:", "terminal"),
+    ("OS:SetpointManager:", "setpoint_manager"),
+    ("OS:AvailabilityManager:", "availability_manager"),
+    ("OS:HeatExchanger:", "heat_exchanger"),
+    ("OS:Humidifier:", "humidifier"),
+    ("OS:Dehumidifier:", "dehumidifier"),
+    ("OS:EvaporativeCooler:", "evaporative_cooler"),
+    ("OS:AirLoopHVAC:Unitary", "unitary"),
+    ("OS:AirLoopHVAC:OutdoorAirSystem", "oa_system"),
+    ("OS:ZoneHVAC:", "zone_hvac"),
+    ("OS:Boiler:", "boiler"),
+    ("OS:Chiller:", "chiller"),
+    ("OS:Controller:", "controller"),
+    ("OS:Node", "node"),
+    ("OS:ThermalZone", "zone"),
+    ("OS:AirLoopHVAC:ZoneSplitter", "splitter"),
+    ("OS:Connector:Splitter", "splitter"),
+    ("OS:AirLoopHVAC:ZoneMixer", "mixer"),
+    ("OS:Connector:Mixer", "mixer"),
+)
+
+# SDK base classes whose subclasses share a category regardless of IDD name.
+_CATEGORY_BASES = {
+    "ZoneHVACComponent": "zone_hvac",
+    "SetpointManager": "setpoint_manager",
+    "AvailabilityManager": "availability_manager",
+}
+
+_category_index: dict[str, frozenset[str]] | None = None
+
+
+def _idd_categories(idd_name: str) -> set[str]:
+    categories = {
+        category
+        for prefix, category in _CATEGORY_PREFIXES
+        if idd_name.startswith(prefix)
+    }
+    if "coil" in categories:
+        # The service is the IDD segment after "Coil"/"CoilSystem", so
+        # water heating coils are not tagged as space heating.
+        parts = idd_name.split(":")
+        service = parts[2] if len(parts) > 2 else ""
+        if service == "Cooling":
+            categories.add("coil/cooling")
+        elif service == "Heating":
+            categories.add("coil/heating")
+        elif service == "WaterHeating":
+            categories.add("coil/water_heating")
+        if (
+            parts[1] == "Coil"
+            and len(parts) > 3
+            and parts[2] in ("Heating", "Cooling")
+            and parts[3].startswith("Water")
+            and parts[-1] != "SpeedData"
+        ):
+            categories.add("coil/water")
+    return categories
+
+
+def category_index() -> dict[str, frozenset[str]]:
+    """IDD type name -> categories for every categorized OpenStudio type.
+
+    Categories come from IDD name prefixes and from the SDK class hierarchy.
+    Coils also get ``"coil/heating"``, ``"coil/cooling"`` or
+    ``"coil/water_heating"`` from their IDD name, and coils with a
+    plant-side water connection get ``"coil/water"``.
+    """
+    global _category_index
+    if _category_index is not None:
+        return _category_index
+
+    import openstudio
+
+    index = {}
+    for value in openstudio.IddObjectType.getValues():
+        idd_name = openstudio.IddObjectType(value).valueDescription()
+        if not idd_name.startswith("OS:"):
+            continue
+        categories = _idd_categories(idd_name)
+        sdk_class = getattr(
+            openstudio.model, idd_name.removeprefix("OS:").replace(":", ""), None
+        )
+        for base in getattr(sdk_class, "__mro__", ())[1:]:
+            category = _CATEGORY_BASES.get(base.__name__)
+            if category is not None:
+                categories.add(category)
+        if categories:
+            index[idd_name] = frozenset(categories)
+    _category_index = index
+    return index
+
+
+def idd_categories(idd_name: str) -> frozenset[str]:
+    """Categories for an IDD type name such as ``"OS:Coil:Heating:Water"``."""
+    return category_index().get(idd_name, frozenset())
+
+
+def in_category(os_obj, category: str) -> bool:
+    """Whether a raw SDK object's IDD type belongs to ``category``."""
+    return category in idd_categories(os_obj.iddObjectType().valueDescription())
@@ -0,0 +1,295 @@
+"""Model-wide index of setpoint managers by node and control variable."""
+from __future__ import annotations
+
+from typing import Any, Iterable, Mapping, NamedTuple
+
+from .base import OsmObject
+from .mermaid import _idd_type, _optional_get
+from .registry import wrap
+
+
+class SetpointConflict(NamedTuple):
+    """Several managers controlling the same variable on one node."""
+
+    node: OsmObject
+    control_variable: str
+    managers: list[OsmObject]
+
+
+def _required_variable(controller_variable: str | None) -> str:
+    """Setpoint variable a Controller:WaterCoil needs on its sensor node.
+
+    ``TemperatureAndHumidityRatio`` only requires a temperature setpoint; a
+    humidity ratio setpoint is optional and enables dehumidification.
+    """
+    if controller_variable == "HumidityRatio":
+        return "HumidityRatio"
+    return "Temperature"
+
+
+class SetpointManagerIndex:
+    """
+    Node -> control variable -> setpoint managers for one model.
+
+    Built from a single pass over the model's setpoint managers instead of
+    calling ``setpointManagers()`` node by node. ``Model.setpoint_manager_index()``
+    builds a fresh index on each call; ``place_managers`` keeps this one
+    current.
+
+    Usage
+    -----
+    index = model.setpoint_manager_index()
+    index.managers(loop.supply_outlet_node)
+    problems = index.check()
+    index.place_managers({hot_water: {"type": "setpoint_manager_scheduled", "value": 82.0}})
+    """
+
+    def __init__(self, raw_model):
+        self._raw_model = raw_model
+        self._nodes: dict[str, Any] = {}
+        self._managers: dict[str, dict[str, list]] = {}
+        self._placement: dict[str, str] = {}
+        self._unplaced: list = []
+        self.refresh()
+
+    def refresh(self) -> "SetpointManagerIndex":
+        """Rebuild the index from the model in one pass."""
+        self._nodes.clear()
+        self._managers.clear()
+        self._placement.clear()
+        self._unplaced.clear()
+        for raw in self._raw_model.getSetpointManagers():
+            raw_node = _optional_get(raw.setpointNode())
+            if raw_node is None:
+                self._unplaced.append(raw)
+            else:
+                self._record(raw, raw_node)
+        return self
+
+    def _record(self, raw_manager, raw_node) -> None:
+        handle = str(raw_node.handle())
+        self._nodes.setdefault(handle, raw_node)
+        variables = self._managers.setdefault(handle, {})
+        variables.setdefault(raw_manager.controlVariable(), []).append(raw_manager)
+        self._placement[str(raw_manager.handle())] = handle
+
+    def _forget(self, raw_manager) -> None:
+        """Drop a manager moved off its node (or out of the unplaced list)."""
+        manager_handle = str(raw_manager.handle())
+        node_handle = self._placement.pop(manager_handle, None)
+        if node_handle is None:
+            self._unplaced = [
+                raw for raw in self._unplaced if str(raw.handle()) != manager_handle
+            ]
+            return
+        managers = self._managers[node_handle].get(raw_manager.controlVariable(), [])
+        managers[:] = [raw for raw in managers if str(raw.handle()) != manager_handle]
+
+    def _handle(self, obj) -> str:
+        return str(OsmObject.unwrap(obj).handle())
+
+    def managers(self, node, control_variable: str | None = None) -> list[OsmObject]:
+        """Managers on a node, optionally for one control variable."""
+        variables = self._managers.get(self._handle(node), {})
+        if control_variable is not None:
+            return [wrap(raw) for raw in variables.get(control_variable, ())]
+        return [wrap(raw) for managers in variables.values() for raw in managers]
+
+    def control_variables(self, node) -> list[str]:
+        """Control variables that have a manager on a node."""
+        return list(self._managers.get(self._handle(node), {}))
+
+    def has_setpoint(self, node, control_variable: str | None = None) -> bool:
+        """Whether a node carries a manager, optionally for one variable.
+
+        ``control_variable`` matches by substring, so ``"Temperature"``
+        also accepts ``"MinimumTemperature"`` and ``"MaximumTemperature"``.
+        """
+        variables = self._managers.get(self._handle(node), {})
+        if control_variable is None:
+            return bool(variables)
+        return any(control_variable in variable for variable in variables)
+
+    def nodes(self) -> list[OsmObject]:
+        """Nodes that carry at least one setpoint manager."""
+        return [wrap(raw) for raw in self._nodes.values()]
+
+    def unplaced(self) -> list[OsmObject]:
+        """Managers that are not on any node."""
+        return [wrap(raw) for raw in self._unplaced]
+
+    def conflicts(self) -> list[SetpointConflict]:
+        """Nodes with more than one manager for the same control variable."""
+        return [
+            SetpointConflict(
+                wrap(self._nodes[handle]), variable, [wrap(raw) for raw in managers]
+            )
+            for handle, variables in self._managers.items()
+            for variable, managers in variables.items()
+            if len(managers) > 1
+        ]
+
+    def missing_supply_outlets(self) -> list[OsmObject]:
+        """Air and plant loops with no setpoint manager on their supply outlet.
+
+        Plant loops also count a manager on the loop temperature setpoint
+        node when it is not the supply outlet.
+        """
+        missing = []
+        for raw_loop in self._raw_model.getAirLoopHVACs():
+            if not self.has_setpoint(raw_loop.supplyOutletNode(), "Temperature"):
+                missing.append(raw_loop)
+        for raw_loop in self._raw_model.getPlantLoops():
+            nodes = (raw_loop.supplyOutletNode(), raw_loop.loopTemperatureSetpointNode())
+            if not any(self.has_setpoint(node) for node in nodes):
+                missing.append(raw_loop)
+        return [wrap(raw) for raw in missing]
+
+    def unmanaged_controller_sensors(self) -> list[OsmObject]:
+        """Coils whose Controller:WaterCoil sensor node lacks a setpoint.
+
+        Controllers without a sensor node are skipped; OpenStudio assigns
+        it when the coil is connected to both its air and plant loops. The
+        ForwardTranslator adds SetpointManager:MixedAir to some air-loop
+        nodes; this check reports what the model itself carries.
+        """
+        coils = []
+        for raw_controller in self._raw_model.getControllerWaterCoils():
+            raw_node = _optional_get(raw_controller.sensorNode())
+            if raw_node is None:
+                continue
+            variable = _optional_get(raw_controller.controlVariable())
+            if self.has_setpoint(raw_node, _required_variable(variable)):
+                continue
+            # waterCoil() searches the model, so only flagged controllers pay it.
+            coil = _optional_get(raw_controller.waterCoil())
+            coils.append(coil if coil is not None else raw_controller)
+        return [wrap(raw) for raw in coils]
+
+    def check(self) -> dict[str, list]:
+        """Pre-translation summary of setpoint problems.
+
+        Returns:
+            ``{"conflicts": [(node, variable, [managers])], "missing_supply_outlets":
+            [...], "unmanaged_controller_sensors": [...], "unplaced": [...]}``
+            with object names.
+        """
+        return {
+            "conflicts": [
+                (conflict.node.name, conflict.control_variable,
+                 [manager.name for manager in conflict.managers])
+                for conflict in self.conflicts()
+            ],
+            "missing_supply_outlets": [loop.name for loop in self.missing_supply_outlets()],
+            "unmanaged_controller_sensors": [
+                coil.name for coil in self.unmanaged_controller_sensors()
+            ],
+            "unplaced": [manager.name for manager in self.unplaced()],
+        }
+
+    def place_managers(
+        self,
+        spec: Mapping[Any, Any] | Iterable[tuple[Any, Any]],
+        replace: bool = True,
+    ) -> dict[str, list]:
+        """Place setpoint managers on many nodes in one pass.
+
+        Args:
+            spec: Mapping (or ``(target, managers)`` pairs) of target to
+                managers. A target is a node, a node name, an air loop (its
+                supply outlet) or a plant loop (its loop temperature setpoint
+                node). Managers are an existing manager, a component spec as
+                used by ``SystemTemplate`` (a snake_case type or
+                ``{"type": ..., "name": ..., **setters}``) or a list of them.
+                Spec names may use ``{node}`` and ``{loop}`` (the node name
+                for node targets); the default is ``"{loop} Setpoint Manager"``.
+            replace: Replace a manager already controlling the same variable
+                on the node. With ``replace=False`` such targets are skipped.
+
+        Returns:
+            ``{"placed": [...], "replaced": [...], "skipped": [...]}``.
+            ``placed`` and ``replaced`` hold manager names; ``skipped`` holds
+            ``(node, control_variable)`` pairs.
+        """
+        from .model import Model
+        from .system_template import _component_spec, _create
+
+        model = Model(self._raw_model)
+        items = spec.items() if isinstance(spec, Mapping) else spec
+        report: dict[str, list] = {"placed": [], "replaced": [], "skipped": []}
+
+        for target, managers in items:
+            raw_node, loop_name = self._resolve_target(target)
+            node_name = raw_node.nameString()
+            fields = {"node": node_name, "loop": loop_name or node_name}
+            if isinstance(managers, (str, Mapping, OsmObject)) or not isinstance(
+                managers, Iterable
+            ):
+                managers = [managers]
+
+            for manager in managers:
+                if isinstance(manager, (str, Mapping)):
+                    manager_spec = _component_spec(manager, "{loop} Setpoint Manager")
+                    raw = _create(model, manager_spec, fields).raw
+                else:
+                    raw = OsmObject.unwrap(manager)
+
+                variable = raw.controlVariable()
+                handle = str(raw_node.handle())
+                existing = self._managers.get(handle, {}).get(variable, [])
+                if existing and not replace:
+                    report["skipped"].append((node_name, variable))
+                    if isinstance(manager, (str, Mapping)):
+                        raw.remove()
+                    continue
+
+                manager_handle = str(raw.handle())
+                displaced = [old for old in existing if str(old.handle()) != manager_handle]
+                replaced = [old.nameString() for old in displaced]
+                if not raw.addToNode(raw_node):
+                    raise ValueError(
+                        f"OpenStudio rejected adding {_idd_type(raw)} "
+                        f"'{raw.nameString()}' to node '{node_name}'."
+                    )
+                # OpenStudio removes managers displaced from the node.
+                for old in displaced:
+                    self._placement.pop(str(old.handle()), None)
+                self._forget(raw)
+                self._managers.get(handle, {}).pop(variable, None)
+                self._record(raw, raw_node)
+                report["placed"].append(raw.nameString())
+                report["replaced"].extend(replaced)
+        return report
+
+    def _resolve_target(self, target):
+        """Node and loop name for a ``place_managers`` target."""
+        if isinstance(target, str):
+            raw_node = _optional_get(self._raw_model.getNodeByName(target))
+            if raw_node is None:
+                raise ValueError(f"No node named '{target}' in the model.")
+            return raw_node, None
+        raw = OsmObject.unwrap(target)
+        kind = _idd_type(raw)
+        if kind == "OS:AirLoopHVAC":
+            return raw.to_AirLoopHVAC().get().supplyOutletNode(), raw.nameString()
+        if kind == "OS:PlantLoop":
+            return raw.to_PlantLoop().get().loopTemperatureSetpointNode(), raw.nameString()
+        if kind == "OS:Node":
+            return raw.to_Node().get(), None
+        raise ValueError(
+            f"Cannot place setpoint managers on {kind} '{raw.nameString()}'; "
+            "pass a node, air loop or plant loop."
+        )
+
+    def __len__(self) -> int:
+        return sum(
+            len(managers)
+            for variables in self._managers.values()
+            for managers in variables.values()
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"<SetpointManagerIndex nodes={len(self._nodes)} managers={len(self)} "
+            f"conflicts={len(self.conflicts())}>"
+        )
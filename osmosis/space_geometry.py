@@ -0,0 +1,233 @@
+"""Whole-model space geometry extracted into NumPy arrays."""
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any
+
+from .base import OsmObject
+from .mermaid import _optional_get
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as error:
+        raise ImportError(
+            "Model.space_geometry() requires NumPy; install it with "
+            "'pip install numpy' or 'pip install osmosis[geometry]'."
+        ) from error
+    return numpy
+
+
+class SpaceGeometry:
+    """
+    Floor polygons, areas and extents of every space, as NumPy arrays.
+
+    Row ``i`` of every per-space array describes ``names[i]``. Floor polygons
+    are ragged, so their vertices are stored as one flat ``(V, 2)`` array:
+    the polygon of space ``i`` is ``vertices[offsets[i]:offsets[i + 1]]``.
+    Coordinates are building coordinates (space origin and rotation applied).
+
+    Usage
+    -----
+    geometry = model.space_geometry()
+    big = geometry.names_where(geometry.floor_area > 500)
+    polygon = geometry.polygon(geometry.position(space))
+
+    Attributes:
+        names, handles: Space names and handles, one per row.
+        vertices: ``(V, 2)`` floor polygon vertices, all spaces back to back.
+        offsets: ``(n + 1,)`` start of each space's vertices in ``vertices``.
+        floor_area, volume, exterior_wall_area: ``(n,)`` in m2 and m3.
+        centroid: ``(n, 2)`` floor polygon centroid; NaN without a floor.
+        bbox: ``(n, 6)`` as ``xmin, ymin, zmin, xmax, ymax, zmax``; NaN for
+            spaces without surfaces.
+        story: ``(n,)`` index into ``stories``, ``-1`` when unassigned.
+        stories: Building story names.
+    """
+
+    def __init__(
+        self,
+        names: list[str],
+        handles: list[str],
+        vertices: "np.ndarray",
+        offsets: "np.ndarray",
+        floor_area: "np.ndarray",
+        volume: "np.ndarray",
+        centroid: "np.ndarray",
+        bbox: "np.ndarray",
+        story: "np.ndarray",
+        stories: list[str],
+        exterior_wall_area: "np.ndarray",
+    ):
+        self.names = names
+        self.handles = handles
+        self.vertices = vertices
+        self.offsets = offsets
+        self.floor_area = floor_area
+        self.volume = volume
+        self.centroid = centroid
+        self.bbox = bbox
+        self.story = story
+        self.stories = stories
+        self.exterior_wall_area = exterior_wall_area
+        self._positions = {handle: index for index, handle in enumerate(handles)}
+
+    def position(self, space) -> int:
+        """Row of a space (wrapped, raw, handle string or name)."""
+        if isinstance(space, str):
+            if space in self._positions:
+                return self._positions[space]
+            return self.names.index(space)
+        return self._positions[str(OsmObject.unwrap(space).handle())]
+
+    def polygon(self, index: int) -> "np.ndarray":
+        """``(k, 2)`` floor polygon of the space in row ``index``."""
+        return self.vertices[self.offsets[index]:self.offsets[index + 1]]
+
+    def names_where(self, mask) -> list[str]:
+        """Space names for a boolean mask or index array over the rows."""
+        rows = _numpy().asarray(mask)
+        if rows.dtype == bool:
+            rows = rows.nonzero()[0]
+        return [self.names[index] for index in rows]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return (
+            f"<SpaceGeometry spaces={len(self)} vertices={len(self.vertices)} "
+            f"stories={len(self.stories)}>"
+        )
+
+
+def extract_space_geometry(raw_model) -> SpaceGeometry:
+    """Read every space's geometry in one pass and vectorize the rest."""
+    np = _numpy()
+
+    stories: list[str] = []
+    story_rows: dict[str, int] = {}
+    names, handles, story = [], [], []
+    coords: list[float] = []
+    counts: list[int] = []
+    placement: list[float] = []
+    local_bbox: list[float] = []
+    floor_area, volume, exterior_wall_area = [], [], []
+    nan = math.nan
+
+    for raw_space in raw_model.getSpaces():
+        names.append(raw_space.nameString())
+        handles.append(str(raw_space.handle()))
+
+        raw_story = _optional_get(raw_space.buildingStory())
+        if raw_story is None:
+            story.append(-1)
+        else:
+            story_handle = str(raw_story.handle())
+            if story_handle not in story_rows:
+                story_rows[story_handle] = len(stories)
+                stories.append(raw_story.nameString())
+            story.append(story_rows[story_handle])
+
+        area = raw_space.floorArea()
+        floor_area.append(area)
+        volume.append(raw_space.volume())
+        exterior_wall_area.append(raw_space.exteriorWallArea())
+
+        # floorPrint() logs an error for spaces without floors; skip those.
+        points = raw_space.floorPrint() if area > 0 else ()
+        for point in points:
+            coords.append(point.x())
+            coords.append(point.y())
+        counts.append(len(points))
+
+        placement.extend(
+            (
+                raw_space.xOrigin(),
+                raw_space.yOrigin(),
+                raw_space.zOrigin(),
+                raw_space.directionofRelativeNorth(),
+            )
+        )
+        box = raw_space.boundingBox()
+        if box.isEmpty():
+            local_bbox.extend((nan,) * 6)
+        else:
+            local_bbox.extend(
+                (
+                    box.minX().get(), box.minY().get(), box.minZ().get(),
+                    box.maxX().get(), box.maxY().get(), box.maxZ().get(),
+                )
+            )
+
+    count = len(names)
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.asarray(counts, dtype=np.int64), out=offsets[1:])
+    vertices = np.asarray(coords, dtype=float).reshape(-1, 2)
+    placement_array = np.asarray(placement, dtype=float).reshape(count, 4)
+    local_box = np.asarray(local_bbox, dtype=float).reshape(count, 6)
+
+    # Space transformation: rotate by -north about z, then translate to origin.
+    theta = -np.radians(placement_array[:, 3])
+    cos, sin = np.cos(theta), np.sin(theta)
+    owner = np.repeat(np.arange(count), counts)
+    if len(vertices):
+        x, y = vertices[:, 0].copy(), vertices[:, 1].copy()
+        vertices[:, 0] = cos[owner] * x - sin[owner] * y + placement_array[owner, 0]
+        vertices[:, 1] = sin[owner] * x + cos[owner] * y + placement_array[owner, 1]
+
+    return SpaceGeometry(
+        names=names,
+        handles=handles,
+        vertices=vertices,
+        offsets=offsets,
+        floor_area=np.asarray(floor_area, dtype=float),
+        volume=np.asarray(volume, dtype=float),
+        centroid=_polygon_centroids(np, vertices, offsets),
+        bbox=_building_bbox(np, local_box, placement_array, cos, sin),
+        story=np.asarray(story, dtype=np.int64),
+        stories=stories,
+        exterior_wall_area=np.asarray(exterior_wall_area, dtype=float),
+    )
+
+
+def _polygon_centroids(np, vertices, offsets) -> Any:
+    """Shoelace centroids of the ragged polygons, NaN for empty ones."""
+    count = len(offsets) - 1
+    centroid = np.full((count, 2), np.nan)
+    sizes = np.diff(offsets)
+    if not len(vertices):
+        return centroid
+
+    # Next vertex of each vertex, wrapping within its own polygon.
+    owner = np.repeat(np.arange(count), sizes)
+    following = np.arange(len(vertices)) + 1
+    last = offsets[1:][sizes > 0] - 1
+    following[last] = offsets[:-1][sizes > 0]
+    x, y = vertices[:, 0], vertices[:, 1]
+    x_next, y_next = x[following], y[following]
+    cross = x * y_next - x_next * y
+
+    area2 = np.bincount(owner, cross, minlength=count)
+    cx = np.bincount(owner, (x + x_next) * cross, minlength=count)
+    cy = np.bincount(owner, (y + y_next) * cross, minlength=count)
+    valid = area2 != 0
+    centroid[valid, 0] = cx[valid] / (3.0 * area2[valid])
+    centroid[valid, 1] = cy[valid] / (3.0 * area2[valid])
+    return centroid
+
+
+def _building_bbox(np, local_box, placement, cos, sin) -> Any:
+    """Axis-aligned building-coordinate boxes of rotated space boxes."""
+    xs = local_box[:, [0, 3, 3, 0]]
+    ys = local_box[:, [1, 1, 4, 4]]
+    x = cos[:, None] * xs - sin[:, None] * ys + placement[:, [0]]
+    y = sin[:, None] * xs + cos[:, None] * ys + placement[:, [1]]
+    z = local_box[:, [2, 5]] + placement[:, [2]]
+    return np.column_stack(
+        (x.min(axis=1), y.min(axis=1), z[:, 0], x.max(axis=1), y.max(axis=1), z[:, 1])
+    )
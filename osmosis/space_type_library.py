@@ -0,0 +1,237 @@
+"""Indexed library of template space types with cached cloning into models."""
+from __future__ import annotations
+
+import os
+from typing import Any, Iterable, Mapping
+
+from .additional_properties import _MISSING, _existing_properties, _read_feature, _write_feature
+from .base import OsmObject
+from .mermaid import _optional_get
+from .registry import wrap
+
+# (absolute path, mtime) -> loaded library
+_loaded: dict[tuple[str, float], "SpaceTypeLibrary"] = {}
+
+# AdditionalProperties feature holding the library template handle on clones.
+TEMPLATE_FEATURE = "osmosis_library_template"
+
+_STANDARDS_FIELDS = {
+    "template": "standardsTemplate",
+    "building_type": "standardsBuildingType",
+    "space_type": "standardsSpaceType",
+}
+
+
+class SpaceTypeLibrary:
+    """
+    Template space types from a library model, indexed by name and
+    standards fields, cloned into target models at most once.
+
+    ``SpaceType.clone`` already shares schedules and load definitions that
+    are identical to ones in the target model, but every call adds another
+    copy of the space type and its loads. The library marks each clone
+    with the template handle (``TEMPLATE_FEATURE``) and reuses marked
+    clones; an unmarked space type of the same name is a conflict, never
+    taken for the template.
+
+    Usage
+    -----
+    library = SpaceTypeLibrary.load("NECB2017_space_types.osm")
+    library.find(building_type="Space Function")
+    office = library.clone_into(model, "Space Function Office - enclosed")
+    library.assign(model, {"Room 101": "Space Function Office - enclosed"})
+    """
+
+    def __init__(self, source):
+        """
+        Args:
+            source: Library ``Model``, raw OpenStudio model or OSM path.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            from .model import Model
+
+            source = Model.load(os.fspath(source))
+        self._raw_model = OsmObject.unwrap(source)
+        self._by_name: dict[str, Any] = {}
+        self._by_field: dict[str, dict[str, list[str]]] = {field: {} for field in _STANDARDS_FIELDS}
+        for raw in self._raw_model.getSpaceTypes():
+            name = raw.nameString()
+            self._by_name[name] = raw
+            for field, getter in _STANDARDS_FIELDS.items():
+                value = _optional_get(getattr(raw, getter)())
+                if value is not None:
+                    self._by_field[field].setdefault(value, []).append(name)
+
+    @classmethod
+    def load(cls, path) -> "SpaceTypeLibrary":
+        """Load a library OSM once; later calls for the same unchanged file reuse it."""
+        path = os.path.abspath(os.fspath(path))
+        key = (path, os.path.getmtime(path))
+        library = _loaded.get(key)
+        if library is None:
+            library = _loaded[key] = cls(path)
+        return library
+
+    def names(self) -> list[str]:
+        """Space type names in the library."""
+        return list(self._by_name)
+
+    def values(self, field: str) -> list[str]:
+        """Distinct values of a standards field: ``template``,
+        ``building_type`` or ``space_type``."""
+        return sorted(self._field(field))
+
+    def find(self, **criteria: str) -> list[OsmObject]:
+        """Library space types matching every given standards field.
+
+        Example: ``library.find(template="NECB2017", building_type="Office")``.
+        """
+        names = None
+        for field, value in criteria.items():
+            matches = self._field(field).get(value, [])
+            names = list(matches) if names is None else [name for name in names if name in matches]
+        if names is None:
+            names = self.names()
+        return [wrap(self._by_name[name]) for name in names]
+
+    def _field(self, field: str) -> dict[str, list[str]]:
+        if field not in self._by_field:
+            raise ValueError(
+                f"Unknown standards field '{field}'; choose from {', '.join(_STANDARDS_FIELDS)}."
+            )
+        return self._by_field[field]
+
+    def _template(self, space_type):
+        if isinstance(space_type, str):
+            raw = self._by_name.get(space_type)
+            if raw is None:
+                raise KeyError(f"No space type named '{space_type}' in the library.")
+            return raw
+        return OsmObject.unwrap(space_type)
+
+    def clone_into(self, model, space_type) -> OsmObject:
+        """A library space type in ``model``, cloning it only the first time.
+
+        Args:
+            model: Target ``Model`` or raw model.
+            space_type: Library space type or its name.
+
+        Raises:
+            ValueError: ``model`` has a space type of that name that this
+                library did not clone.
+        """
+        raw_model = OsmObject.unwrap(model)
+        raw_template = self._template(space_type)
+        raw, state = self._clone_raw(raw_model, raw_template, self._clones(raw_model))
+        if state == "conflict":
+            raise ValueError(
+                f"Space type '{raw_template.nameString()}' in the model is not a "
+                f"clone of the library template."
+            )
+        return wrap(raw)
+
+    @staticmethod
+    def _clones(raw_model) -> dict[str, Any]:
+        """Template handle -> marked clone, over the target model's space types."""
+        clones: dict[str, Any] = {}
+        for raw in raw_model.getSpaceTypes():
+            raw_props = _existing_properties(raw)
+            if raw_props is None:
+                continue
+            handle = _read_feature(raw_props, TEMPLATE_FEATURE)
+            if handle is not _MISSING:
+                clones.setdefault(handle, raw)
+        return clones
+
+    def _clone_raw(self, raw_model, raw_template, clones: dict[str, Any]) -> tuple[Any, str]:
+        """Target space type for a template and ``"cloned"``, ``"reused"``
+        or ``"conflict"``; a conflict returns the unrelated same-name type."""
+        handle = str(raw_template.handle())
+        raw = clones.get(handle)
+        if raw is not None:
+            return raw, "reused"
+        raw = _optional_get(raw_model.getSpaceTypeByName(raw_template.nameString()))
+        if raw is not None:
+            return raw, "conflict"
+        raw = raw_template.clone(raw_model).to_SpaceType().get()
+        _write_feature(raw.additionalProperties(), TEMPLATE_FEATURE, handle)
+        clones[handle] = raw
+        return raw, "cloned"
+
+    def assign(
+        self,
+        model,
+        mapping: Mapping[Any, Any] | Iterable[tuple[Any, Any]],
+    ) -> dict[str, list]:
+        """Set library space types on many spaces, cloning each type once.
+
+        Args:
+            model: Target ``Model`` or raw model.
+            mapping: Space (wrapped, raw or name) -> library space type (or
+                its name), as a mapping or pairs.
+
+        Returns:
+            ``{"assigned": [...], "cloned": [...], "reused": [...],
+            "conflicts": [...], "unknown_spaces": [...], "unknown_types": [...]}``.
+            ``cloned``, ``reused`` and ``conflicts`` hold space type names;
+            ``reused`` types are earlier clones of this library's templates.
+            ``conflicts`` are unrelated model space types with a template's
+            name; their spaces are left unchanged.
+        """
+        raw_model = OsmObject.unwrap(model)
+        items = mapping.items() if isinstance(mapping, Mapping) else mapping
+        report: dict[str, list] = {
+            "assigned": [], "cloned": [], "reused": [], "conflicts": [],
+            "unknown_spaces": [], "unknown_types": [],
+        }
+        spaces_by_name = None
+        clones = None
+        targets: dict[str, Any] = {}
+        conflicts: set[str] = set()
+
+        for space, space_type in items:
+            if isinstance(space, str):
+                if spaces_by_name is None:
+                    spaces_by_name = {raw.nameString(): raw for raw in raw_model.getSpaces()}
+                raw_space = spaces_by_name.get(space)
+                if raw_space is None:
+                    report["unknown_spaces"].append(space)
+                    continue
+            else:
+                raw_space = OsmObject.unwrap(space)
+
+            try:
+                raw_template = self._template(space_type)
+            except KeyError:
+                report["unknown_types"].append(space_type)
+                continue
+            handle = str(raw_template.handle())
+            if handle in conflicts:
+                continue
+            raw_target = targets.get(handle)
+            if raw_target is None:
+                if clones is None:
+                    clones = self._clones(raw_model)
+                raw_target, state = self._clone_raw(raw_model, raw_template, clones)
+                if state == "conflict":
+                    report["conflicts"].append(raw_target.nameString())
+                    conflicts.add(handle)
+                    continue
+                report[state].append(raw_target.nameString())
+                targets[handle] = raw_target
+
+            raw_space.setSpaceType(raw_target)
+            report["assigned"].append(raw_space.nameString())
+        return report
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def __getitem__(self, name: str) -> OsmObject:
+        return wrap(self._template(name))
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def __repr__(self) -> str:
+        return f"<SpaceTypeLibrary space_types={len(self)} templates={len(self._by_field['template'])}>"
@@ -0,0 +1,328 @@
+"""Uniform-grid spatial index over space and surface bounding boxes."""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Iterable
+
+import openstudio
+
+from .base import OsmObject
+from .registry import wrap
+from .space_geometry import _numpy, extract_space_geometry
+
+_SIGNATURE_TYPES = ("OS:Space", "OS:Surface", "OS:SubSurface")
+
+
+def geometry_signature(raw_model) -> tuple[int, ...]:
+    """Digest of the space, surface and sub-surface handle sets.
+
+    Changes whenever one of these objects is added or removed, even when a
+    removal and an addition leave the counts unchanged.
+    """
+    return tuple(
+        hash(frozenset(
+            str(raw.handle())
+            for raw in raw_model.getObjectsByType(openstudio.IddObjectType(name))
+        ))
+        for name in _SIGNATURE_TYPES
+    )
+
+
+class SpatialIndex:
+    """
+    Bounding-box index over every space, for adjacency and proximity queries.
+
+    Space boxes come from ``Model.space_geometry()`` and are bucketed in a
+    uniform xy grid sized to the median space, so each query only tests the
+    spaces in the cells it touches. Surface boxes are extracted on first use
+    by ``surface_pairs``. Like the space boxes, that surface table is a
+    snapshot: matching or moving surfaces through the raw SDK does not
+    update it, so rebuild with ``Model.spatial_index(refresh=True)``.
+
+    Usage
+    -----
+    index = model.spatial_index()
+    index.neighbors(space)
+    index.stacked_above(space)
+    for a, b in index.surface_pairs():
+        ...
+    """
+
+    def __init__(self, raw_model):
+        self._raw_model = raw_model
+        self.signature = geometry_signature(raw_model)
+        self.geometry = extract_space_geometry(raw_model)
+        raw_spaces = {str(raw.handle()): raw for raw in raw_model.getSpaces()}
+        self._raw_spaces = [raw_spaces[handle] for handle in self.geometry.handles]
+        self._surfaces = None
+        self._build_grid()
+
+    def _build_grid(self) -> None:
+        np = _numpy()
+        bbox = self.geometry.bbox
+        self._valid = ~np.isnan(bbox).any(axis=1)
+        extents = np.concatenate(
+            (bbox[self._valid, 3] - bbox[self._valid, 0], bbox[self._valid, 4] - bbox[self._valid, 1])
+        )
+        self.cell_size = float(np.median(extents)) if len(extents) else 1.0
+        if not self.cell_size > 0:
+            self.cell_size = 1.0
+
+        self._cells: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for row in np.flatnonzero(self._valid):
+            for cell in self._cells_for(bbox[row, 0], bbox[row, 1], bbox[row, 3], bbox[row, 4]):
+                self._cells[cell].append(int(row))
+
+    def _cells_for(self, xmin, ymin, xmax, ymax) -> Iterable[tuple[int, int]]:
+        size = self.cell_size
+        ix0, ix1 = int(xmin // size), int(xmax // size)
+        iy0, iy1 = int(ymin // size), int(ymax // size)
+        return ((ix, iy) for ix in range(ix0, ix1 + 1) for iy in range(iy0, iy1 + 1))
+
+    def _rows_near(self, box, tolerance: float) -> Any:
+        """Rows whose box intersects ``box`` grown by ``tolerance``."""
+        np = _numpy()
+        xmin, ymin, zmin, xmax, ymax, zmax = box
+        rows: set[int] = set()
+        for cell in self._cells_for(xmin - tolerance, ymin - tolerance, xmax + tolerance, ymax + tolerance):
+            rows.update(self._cells.get(cell, ()))
+        if not rows:
+            return np.zeros(0, dtype=np.int64)
+        rows = np.fromiter(sorted(rows), dtype=np.int64)
+        other = self.geometry.bbox[rows]
+        hit = (
+            (other[:, 0] <= xmax + tolerance) & (other[:, 3] >= xmin - tolerance)
+            & (other[:, 1] <= ymax + tolerance) & (other[:, 4] >= ymin - tolerance)
+            & (other[:, 2] <= zmax + tolerance) & (other[:, 5] >= zmin - tolerance)
+        )
+        return rows[hit]
+
+    def _spaces(self, rows) -> list[OsmObject]:
+        return [wrap(self._raw_spaces[row]) for row in rows]
+
+    def spaces_in_bbox(self, bbox, tolerance: float = 0.0) -> list[OsmObject]:
+        """Spaces whose bounding box intersects ``bbox``.
+
+        Args:
+            bbox: ``(xmin, ymin, xmax, ymax)`` for any height, or
+                ``(xmin, ymin, zmin, xmax, ymax, zmax)``.
+            tolerance: Grow the query box by this distance in meters.
+        """
+        if len(bbox) == 4:
+            xmin, ymin, xmax, ymax = bbox
+            bbox = (xmin, ymin, -float("inf"), xmax, ymax, float("inf"))
+        return self._spaces(self._rows_near(bbox, tolerance))
+
+    def neighbors(self, space, tolerance: float = 0.01) -> list[OsmObject]:
+        """Spaces whose bounding box touches or overlaps this space's box."""
+        row = self.geometry.position(space)
+        if not self._valid[row]:
+            return []
+        rows = self._rows_near(self.geometry.bbox[row], tolerance)
+        return self._spaces(rows[rows != row])
+
+    def stacked_above(self, space, tolerance: float = 0.01) -> list[OsmObject]:
+        """Spaces sitting directly on top of this space.
+
+        A space is stacked above when its floor is within ``tolerance`` of
+        this space's ceiling height and the two footprints overlap in plan.
+        """
+        row = self.geometry.position(space)
+        if not self._valid[row]:
+            return []
+        box = self.geometry.bbox[row]
+        rows = self._rows_near(box, tolerance)
+        other = self.geometry.bbox[rows]
+        above = (
+            (rows != row)
+            & (abs(other[:, 2] - box[5]) <= tolerance)
+            & (other[:, 0] < box[3] - tolerance) & (other[:, 3] > box[0] + tolerance)
+            & (other[:, 1] < box[4] - tolerance) & (other[:, 4] > box[1] + tolerance)
+        )
+        return self._spaces(rows[above])
+
+    def candidate_pairs(self, tolerance: float = 0.01) -> list[tuple[OsmObject, OsmObject]]:
+        """Pairs of spaces whose bounding boxes touch or overlap."""
+        return [
+            (wrap(self._raw_spaces[a]), wrap(self._raw_spaces[b]))
+            for a, b in self._pair_rows(tolerance)
+        ]
+
+    def _pair_rows(self, tolerance: float) -> list[tuple[int, int]]:
+        np = _numpy()
+        pairs: set[tuple[int, int]] = set()
+        grown = self._cells
+        if tolerance > 0:
+            # Re-bucket with grown boxes so pairs across a cell edge are kept.
+            grown = defaultdict(list)
+            bbox = self.geometry.bbox
+            for row in np.flatnonzero(self._valid):
+                for cell in self._cells_for(
+                    bbox[row, 0] - tolerance, bbox[row, 1] - tolerance,
+                    bbox[row, 3] + tolerance, bbox[row, 4] + tolerance,
+                ):
+                    grown[cell].append(int(row))
+        for rows in grown.values():
+            for position, a in enumerate(rows):
+                for b in rows[position + 1:]:
+                    pairs.add((a, b) if a < b else (b, a))
+        if not pairs:
+            return []
+
+        pair_array = np.array(sorted(pairs), dtype=np.int64)
+        first = self.geometry.bbox[pair_array[:, 0]]
+        second = self.geometry.bbox[pair_array[:, 1]]
+        overlap = np.all(first[:, :3] <= second[:, 3:] + tolerance, axis=1) & np.all(
+            second[:, :3] <= first[:, 3:] + tolerance, axis=1
+        )
+        return [(int(a), int(b)) for a, b in pair_array[overlap]]
+
+    def surface_pairs(
+        self,
+        tolerance: float = 0.01,
+        unmatched_only: bool = True,
+    ) -> list[tuple[OsmObject, OsmObject]]:
+        """Surface pairs that may need matching, from neighboring spaces.
+
+        Two surfaces are a candidate when they face each other (opposite
+        normals), lie in the same plane within ``tolerance`` and their
+        bounding boxes share an area rather than just an edge.
+
+        Args:
+            tolerance: Plane distance and box growth in meters.
+            unmatched_only: Skip surfaces that already have an adjacent
+                surface.
+        """
+        raw = self._surface_table()["raw"]
+        return [
+            (wrap(raw[i]), wrap(raw[j]))
+            for _, _, surface_rows in self._facing_rows(tolerance, unmatched_only)
+            for i, j in surface_rows
+        ]
+
+    def facing_pairs(self, tolerance: float = 0.01) -> list[tuple[OsmObject, OsmObject]]:
+        """Space pairs with at least one pair of facing, overlapping surfaces.
+
+        These are the only pairs surface intersection or matching can
+        change; ``candidate_pairs`` also keeps spaces that just touch at an
+        edge or corner.
+        """
+        return [
+            (wrap(self._raw_spaces[a]), wrap(self._raw_spaces[b]))
+            for a, b, _ in self._facing_rows(tolerance, unmatched_only=False)
+        ]
+
+    def _facing_rows(self, tolerance: float, unmatched_only: bool):
+        """Yield ``(a, b, [(i, j), ...])`` space rows and their facing surface rows."""
+        np = _numpy()
+        surfaces = self._surface_table()
+        owner, box, normal, offset, matched = (
+            surfaces["owner"], surfaces["bbox"], surfaces["normal"],
+            surfaces["offset"], surfaces["matched"],
+        )
+        by_space: dict[int, Any] = {}
+        order = np.argsort(owner, kind="stable")
+        bounds = np.searchsorted(owner[order], np.arange(len(self.geometry) + 1))
+        for row in range(len(self.geometry)):
+            rows = order[bounds[row]:bounds[row + 1]]
+            if unmatched_only:
+                rows = rows[~matched[rows]]
+            by_space[row] = rows
+
+        for a, b in self._pair_rows(tolerance):
+            first, second = by_space[a], by_space[b]
+            if not len(first) or not len(second):
+                continue
+            facing = normal[first] @ normal[second].T < -0.99
+            coplanar = abs(offset[first][:, None] + offset[second][None, :]) <= tolerance
+            # Overlap lengths per axis; facing surfaces must share an area,
+            # not just an edge, so two axes need a positive overlap.
+            length = np.minimum(box[first, None, 3:], box[None, second, 3:]) - np.maximum(
+                box[first, None, :3], box[None, second, :3]
+            )
+            overlap = np.all(length >= -tolerance, axis=2) & (
+                (length > tolerance).sum(axis=2) >= 2
+            )
+            hits = np.nonzero(facing & coplanar & overlap)
+            if len(hits[0]):
+                yield a, b, [(int(first[i]), int(second[j])) for i, j in zip(*hits)]
+
+    def _surface_table(self) -> dict[str, Any]:
+        """Building-coordinate boxes, unit normals, areas and boundaries of every surface."""
+        if self._surfaces is not None:
+            return self._surfaces
+        np = _numpy()
+        raw_surfaces, owner, matched, coords, counts = [], [], [], [], []
+        surface_types, boundaries = [], []
+        for row, raw_space in enumerate(self._raw_spaces):
+            transformation = raw_space.transformation()
+            for raw_surface in raw_space.surfaces():
+                points = transformation * raw_surface.vertices()
+                raw_surfaces.append(raw_surface)
+                owner.append(row)
+                matched.append(raw_surface.adjacentSurface().is_initialized())
+                surface_types.append(raw_surface.surfaceType())
+                boundaries.append(raw_surface.outsideBoundaryCondition())
+                for point in points:
+                    coords.extend((point.x(), point.y(), point.z()))
+                counts.append(len(points))
+
+        count = len(raw_surfaces)
+        vertices = np.asarray(coords, dtype=float).reshape(-1, 3)
+        offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.asarray(counts, dtype=np.int64), out=offsets[1:])
+        surface_of = np.repeat(np.arange(count), counts)
+
+        bbox = np.full((count, 6), np.nan)
+        if count:
+            starts = offsets[:-1]
+            bbox[:, :3] = np.minimum.reduceat(vertices, starts, axis=0)
+            bbox[:, 3:] = np.maximum.reduceat(vertices, starts, axis=0)
+
+        # Newell's method: robust normals for any planar polygon.
+        following = np.arange(len(vertices)) + 1
+        following[offsets[1:] - 1] = offsets[:-1]
+        current, nxt = vertices, vertices[following]
+        normal = np.zeros((count, 3))
+        for axis, (a, b) in enumerate(((1, 2), (2, 0), (0, 1))):
+            normal[:, axis] = np.bincount(
+                surface_of,
+                (current[:, a] - nxt[:, a]) * (current[:, b] + nxt[:, b]),
+                minlength=count,
+            )
+        # The Newell vector is twice the polygon's area vector.
+        length = np.linalg.norm(normal, axis=1)
+        normal[length > 0] /= length[length > 0, None]
+        first_vertex = vertices[offsets[:-1]] if count else np.zeros((0, 3))
+        offset = np.einsum("ij,ij->i", normal, first_vertex)
+
+        self._surfaces = {
+            "raw": raw_surfaces,
+            "owner": np.asarray(owner, dtype=np.int64),
+            "matched": np.asarray(matched, dtype=bool),
+            "bbox": bbox,
+            "normal": normal,
+            "offset": offset,
+            "area": length / 2.0,
+            "surface_type": np.asarray(surface_types, dtype=object),
+            "boundary": np.asarray(boundaries, dtype=object),
+        }
+        return self._surfaces
+
+    def is_current(self) -> bool:
+        """``False`` once spaces or surfaces are added or removed.
+
+        Moving vertices or matching surfaces through the raw SDK is not
+        detected; rebuild with ``Model.spatial_index(refresh=True)`` after
+        such edits.
+        """
+        return geometry_signature(self._raw_model) == self.signature
+
+    def __len__(self) -> int:
+        return int(self._valid.sum())
+
+    def __repr__(self) -> str:
+        return (
+            f"<SpatialIndex spaces={len(self)} cells={len(self._cells)} "
+            f"cell_size={self.cell_size:.2f}>"
+        )
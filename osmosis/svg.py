@@ -0,0 +1,626 @@
+"""Offline SVG rendering for loop diagrams.
+
+Lays out the same flowcharts ``mermaid.py`` produces directly from loop
+snapshots and writes standalone SVG, so diagrams render without a network
+round trip to mermaid.ink.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import html
+import os
+import re
+from typing import TYPE_CHECKING
+
+from .mermaid import (
+    _CLASS_DEFS,
+    AirLoopSnapshot,
+    PlantLoopSnapshot,
+    UnitaryGroup,
+    ZoneGroup,
+    _safe,
+    air_loop_snapshot,
+    plant_loop_snapshot,
+)
+
+if TYPE_CHECKING:
+    from .model import Model
+
+_FONT_FAMILY = "Segoe UI, Arial, sans-serif"
+_FONT_SIZE = 11
+_CHAR_WIDTH = 6.2
+_LINE_HEIGHT = 14
+_PAD_X = 10
+_PAD_Y = 7
+_NODE_GAP = 26
+_RANK_GAP = 38
+_CLUSTER_PAD = 12
+_CLUSTER_TITLE = 18
+_MARGIN = 16
+_BACKGROUND = "#f3f4f6"
+_CLUSTER_FILL = "#f6f8fb"
+_CLUSTER_STROKE = "#b8c2cc"
+_EDGE_COLOR = "#374151"
+
+
+class _Shape:
+    """A positioned diagram node."""
+
+    __slots__ = ("id", "lines", "kind", "css", "x", "y", "w", "h")
+
+    def __init__(self, node_id: str, label: str, kind: str, css: str):
+        self.id = node_id
+        self.lines = html.unescape(label).split("<br/>")
+        self.kind = kind
+        self.css = css
+        self.x = 0.0
+        self.y = 0.0
+        if css == "blank":
+            self.w = self.h = 16.0
+        else:
+            text_width = max(len(line) for line in self.lines) * _CHAR_WIDTH
+            self.w = max(40.0, text_width + 2 * _PAD_X)
+            self.h = len(self.lines) * _LINE_HEIGHT + 2 * _PAD_Y
+        if kind == "circle":
+            self.w = self.h = max(self.w, self.h)
+
+    @property
+    def left(self) -> float:
+        return self.x
+
+    @property
+    def right(self) -> float:
+        return self.x + self.w
+
+    @property
+    def top(self) -> float:
+        return self.y
+
+    @property
+    def bottom(self) -> float:
+        return self.y + self.h
+
+    @property
+    def cx(self) -> float:
+        return self.x + self.w / 2
+
+    @property
+    def cy(self) -> float:
+        return self.y + self.h / 2
+
+    def place(self, x: float, cy: float) -> None:
+        self.x = x
+        self.y = cy - self.h / 2
+
+
+class _Cluster:
+    """A titled box drawn around already-placed shapes."""
+
+    def __init__(self, title: str, members: list):
+        self.title = html.unescape(title)
+        self.members = members
+        self.x = min(member.left for member in members) - _CLUSTER_PAD
+        self.y = min(member.top for member in members) - _CLUSTER_PAD - _CLUSTER_TITLE
+        self.w = max(member.right for member in members) + _CLUSTER_PAD - self.x
+        self.h = max(member.bottom for member in members) + _CLUSTER_PAD - self.y
+
+    left = _Shape.left
+    right = _Shape.right
+    top = _Shape.top
+    bottom = _Shape.bottom
+    cx = _Shape.cx
+    cy = _Shape.cy
+
+
+class _Group:
+    """A row of shapes inside a nested cluster, such as a unitary system."""
+
+    def __init__(self, title: str, shapes: list[_Shape]):
+        self.title = title
+        self.shapes = shapes
+        self.w = (
+            sum(shape.w for shape in shapes)
+            + _RANK_GAP * (len(shapes) - 1)
+            + 2 * _CLUSTER_PAD
+        )
+        self.h = max(shape.h for shape in shapes) + 2 * _CLUSTER_PAD + _CLUSTER_TITLE
+
+    def place(self, x: float, cy: float) -> None:
+        _row(self.shapes, x + _CLUSTER_PAD, cy + _CLUSTER_TITLE / 2)
+
+
+class _Edge:
+    __slots__ = ("a", "b", "dashed", "label", "route")
+
+    def __init__(
+        self,
+        a,
+        b,
+        dashed: bool = False,
+        label: str | None = None,
+        route: str = "h",
+    ):
+        self.a = a
+        self.b = b
+        self.dashed = dashed
+        self.label = label
+        self.route = route
+
+
+class _Graph:
+    def __init__(self):
+        self.shapes: list[_Shape] = []
+        self.clusters: list[_Cluster] = []
+        self.edges: list[_Edge] = []
+
+    def add(self, node_id: str, label: str, kind: str, css: str) -> _Shape:
+        shape = _Shape(node_id, label, kind, css)
+        self.shapes.append(shape)
+        return shape
+
+    def item(self, item, show_names: bool) -> _Shape:
+        if item.is_node:
+            return self.add(item.id, item.label(show_names), "circle", "node")
+        return self.add(item.id, item.label(show_names), "rect", "equipment")
+
+    def chain(self, shapes: list, dashed: bool = False) -> None:
+        for a, b in zip(shapes, shapes[1:]):
+            self.edges.append(_Edge(a, b, dashed=dashed))
+
+
+def _row(items: list, x: float, cy: float) -> float:
+    """Place items left to right, vertically centred on ``cy``."""
+    for item in items:
+        item.place(x, cy)
+        x += item.w + _RANK_GAP
+    return x - _RANK_GAP if items else x
+
+
+def _row_height(items: list) -> float:
+    return max((item.h for item in items), default=0.0)
+
+
+def _air_loop_graph(
+    snapshot: AirLoopSnapshot,
+    show_names: bool,
+    minimize_demand: bool,
+    demand_groups: tuple[ZoneGroup, ...] | None = None,
+    expand_groups: frozenset[str] = frozenset(),
+) -> _Graph:
+    graph = _Graph()
+    top = _MARGIN + _CLUSTER_TITLE + _CLUSTER_PAD
+    left = _MARGIN + _CLUSTER_PAD
+
+    # Outdoor air and managers share the top band
+    band_bottom = _MARGIN
+    oa_mixer = None
+    band_right = left
+    if snapshot.oa_system is not None:
+        oa_source = graph.add("OA_SRC", "Outdoor Air", "rect", "boundary")
+        oa_parts = [
+            graph.item(item, show_names) for item in snapshot.oa_components or ()
+        ]
+        oa_mixer = graph.add(
+            "OA_MXR", snapshot.oa_system.label(show_names), "rect", "equipment"
+        )
+        relief = graph.add("OA_RELIEF", "Relief Air", "rect", "boundary")
+        oa_row = [oa_source] + oa_parts + [oa_mixer, relief]
+        _row(oa_row, left, top + _row_height(oa_row) / 2)
+        graph.chain([oa_source] + oa_parts + [oa_mixer, relief])
+        oa_cluster = _Cluster("Outdoor Air", oa_row)
+        graph.clusters.append(oa_cluster)
+        band_bottom = oa_cluster.bottom
+        band_right = oa_cluster.right + _RANK_GAP + _CLUSTER_PAD
+
+    managers = [
+        graph.add(item.id, item.label(show_names), "rect", "equipment")
+        for item in snapshot.managers
+    ]
+    managers_cluster = None
+    if managers:
+        _row(managers, band_right, top + _row_height(managers) / 2)
+        managers_cluster = _Cluster("Managers", managers)
+        graph.clusters.append(managers_cluster)
+        band_bottom = max(band_bottom, managers_cluster.bottom)
+
+    # Demand column sizes decide the vertical centre of the supply row
+    zone_rows: list[list[_Shape]] = []
+    if snapshot.zones:
+        if minimize_demand:
+            count = len(snapshot.zones)
+            label = f"{count} Zone" if count == 1 else f"{count} Zones"
+            zone_rows.append([graph.add("ZSUMMARY", label, "subroutine", "summary")])
+        else:
+            zones = snapshot.zones
+            if demand_groups is not None:
+                zones = []
+                for group in demand_groups:
+                    if group.key in expand_groups:
+                        zones.extend(group.zones)
+                        continue
+                    zone_rows.append(
+                        [graph.add(group.id, group.label(), "subroutine", "summary")]
+                    )
+            for zone in zones:
+                row = []
+                if zone.air_node is not None:
+                    air_node = zone.air_node
+                    row.append(
+                        graph.add(air_node.id, _safe(air_node.name), "circle", "node")
+                    )
+                row.append(graph.add(zone.id, _safe(zone.name), "subroutine", "zone"))
+                zone_rows.append(row)
+    zones_height = sum(_row_height(row) for row in zone_rows)
+    zones_height += _NODE_GAP * max(0, len(zone_rows) - 1)
+
+    # Supply side
+    supply_top = band_bottom + _RANK_GAP + _CLUSTER_TITLE + _CLUSTER_PAD
+    supply_inlet = graph.add("SI", "Supply Inlet", "round", "boundary")
+    supply_items: list = [supply_inlet]
+    chain: list = [supply_inlet]
+    groups = []
+    for entry in snapshot.supply:
+        if isinstance(entry, UnitaryGroup):
+            parts = [
+                graph.add(part.id, part.label(show_names), "rect", "equipment")
+                for part in entry.parts
+            ]
+            group = _Group(entry.item.label(show_names), parts)
+            groups.append(group)
+            supply_items.append(group)
+            chain.extend(parts)
+            continue
+        shape = graph.item(entry, show_names)
+        supply_items.append(shape)
+        chain.append(shape)
+    supply_outlet = graph.add("SO", "Supply Outlet", "round", "boundary")
+    supply_items.append(supply_outlet)
+    chain.append(supply_outlet)
+
+    mid = supply_top + max(_row_height(supply_items), zones_height) / 2
+    supply_right = _row(supply_items, left, mid)
+    group_clusters = [_Cluster(group.title, group.shapes) for group in groups]
+    graph.clusters.append(_Cluster("Supply Side", _cluster_members(supply_items)))
+    graph.clusters.extend(group_clusters)
+    graph.chain(chain)
+
+    if oa_mixer is not None:
+        graph.edges.append(_Edge(oa_mixer, supply_inlet, route="v"))
+    if managers_cluster is not None:
+        graph.edges.append(_Edge(managers_cluster, supply_outlet, dashed=True, route="v"))
+
+    # Demand side
+    if zone_rows:
+        x = supply_right + _RANK_GAP + 2 * _CLUSTER_PAD
+        split = graph.add("ZSPLIT", " ", "rect", "blank")
+        split.place(x, mid)
+        x = split.right + _RANK_GAP
+
+        node_width = max(
+            (row[0].w for row in zone_rows if len(row) == 2),
+            default=0.0,
+        )
+        zone_x = x + (node_width + _RANK_GAP if node_width else 0.0)
+        y = mid - zones_height / 2
+        zone_shapes = []
+        for row in zone_rows:
+            height = _row_height(row)
+            zone = row[-1]
+            zone.place(zone_x, y + height / 2)
+            zone_shapes.append(zone)
+            if len(row) == 2:
+                row[0].place(x + (node_width - row[0].w) / 2, y + height / 2)
+                graph.chain([split, row[0], zone])
+            else:
+                graph.chain([split, zone])
+            y += height + _NODE_GAP
+
+        mixer = graph.add("ZMIX", " ", "rect", "blank")
+        mixer.place(max(zone.right for zone in zone_shapes) + _RANK_GAP, mid)
+        return_inlet = graph.add("RI", "Return", "round", "boundary")
+        return_back = graph.add(
+            "RETURN_BACK", "Return<br/>&larr; Supply", "rect", "boundary"
+        )
+        _row([return_inlet, return_back], mixer.right + _RANK_GAP, mid)
+        for zone in zone_shapes:
+            graph.edges.append(_Edge(zone, mixer))
+        graph.chain([mixer, return_inlet])
+        graph.edges.append(_Edge(return_inlet, return_back, dashed=True))
+
+        demand_members = [split, mixer, return_inlet, return_back] + [
+            shape for row in zone_rows for shape in row
+        ]
+        graph.clusters.append(_Cluster("Demand Side", demand_members))
+        graph.edges.append(_Edge(supply_outlet, split))
+
+    return graph
+
+
+def _cluster_members(items: list) -> list:
+    """Replace nested groups with their cluster bounds."""
+    shapes = []
+    for item in items:
+        if isinstance(item, _Group):
+            shapes.append(_Cluster(item.title, item.shapes))
+        else:
+            shapes.append(item)
+    return shapes
+
+
+def _plant_loop_graph(snapshot: PlantLoopSnapshot, show_names: bool) -> _Graph:
+    graph = _Graph()
+    top = _MARGIN + _CLUSTER_TITLE + _CLUSTER_PAD
+    left = _MARGIN + _CLUSTER_PAD
+
+    managers = [
+        graph.add(item.id, item.label(show_names), "rect", "equipment")
+        for item in snapshot.managers
+    ]
+    managers_cluster = None
+    band_bottom = _MARGIN
+    if managers:
+        _row(managers, left, top + _row_height(managers) / 2)
+        managers_cluster = _Cluster("Managers", managers)
+        graph.clusters.append(managers_cluster)
+        band_bottom = managers_cluster.bottom
+
+    supply_inlet = graph.add("SI", "Supply Inlet", "round", "boundary")
+    supply = [supply_inlet] + [graph.item(item, show_names) for item in snapshot.supply]
+    supply_outlet = graph.add("SO", "Supply Outlet", "round", "boundary")
+    supply.append(supply_outlet)
+
+    demand_inlet = graph.add("DI", "Demand Inlet", "round", "boundary")
+    demand = [demand_inlet] + [graph.item(item, show_names) for item in snapshot.demand]
+    demand_outlet = graph.add("DO", "Demand Outlet", "round", "boundary")
+    demand.append(demand_outlet)
+
+    mid = band_bottom + _RANK_GAP + _CLUSTER_TITLE + _CLUSTER_PAD + max(
+        _row_height(supply), _row_height(demand)
+    ) / 2
+    supply_right = _row(supply, left, mid)
+    _row(demand, supply_right + _RANK_GAP + 2 * _CLUSTER_PAD, mid)
+
+    graph.clusters.append(_Cluster("Supply Side", supply))
+    graph.clusters.append(_Cluster("Demand Side", demand))
+    graph.chain(supply)
+    graph.chain(demand)
+    graph.edges.append(_Edge(supply_outlet, demand_inlet))
+    graph.edges.append(
+        _Edge(demand_outlet, supply_inlet, dashed=True, label="return", route="under")
+    )
+    if managers_cluster is not None:
+        graph.edges.append(_Edge(managers_cluster, supply_outlet, dashed=True, route="v"))
+    return graph
+
+
+def _edge_path(edge: _Edge, floor: float) -> tuple[str, float, float]:
+    a, b = edge.a, edge.b
+    if edge.route == "v":
+        mid_y = (a.bottom + b.top) / 2
+        path = f"M{a.cx:.1f},{a.bottom:.1f} V{mid_y:.1f} H{b.cx:.1f} V{b.top:.1f}"
+        return path, (a.cx + b.cx) / 2, mid_y
+    if edge.route == "under":
+        path = (
+            f"M{a.cx:.1f},{a.bottom:.1f} V{floor:.1f} "
+            f"H{b.cx:.1f} V{b.bottom:.1f}"
+        )
+        return path, (a.cx + b.cx) / 2, floor
+    if abs(a.cy - b.cy) < 0.5:
+        path = f"M{a.right:.1f},{a.cy:.1f} H{b.left:.1f}"
+        return path, (a.right + b.left) / 2, a.cy
+    mid_x = (a.right + b.left) / 2
+    path = f"M{a.right:.1f},{a.cy:.1f} H{mid_x:.1f} V{b.cy:.1f} H{b.left:.1f}"
+    return path, mid_x, (a.cy + b.cy) / 2
+
+
+def _class_style(definition: str) -> dict[str, str]:
+    return dict(
+        part.split(":", 1)
+        for part in definition.rstrip(";").split(",")
+        if ":" in part
+    )
+
+
+def _svg_document(graph: _Graph, uid: str) -> str:
+    bounds = graph.shapes + graph.clusters
+    width = max(item.right for item in bounds) + _MARGIN
+    floor = max(item.bottom for item in bounds) + _RANK_GAP / 2
+    has_under = any(edge.route == "under" for edge in graph.edges)
+    height = (floor if has_under else max(item.bottom for item in bounds)) + _MARGIN
+
+    rules = []
+    for name, definition in _CLASS_DEFS.items():
+        style = _class_style(definition)
+        shape_style = (
+            f"fill:{style.get('fill', '#ffffff')};"
+            f"stroke:{style.get('stroke', '#4b5563')};"
+            f"stroke-width:{style.get('stroke-width', '1px')};"
+        )
+        rules.append(
+            f"#{uid} .{name} rect, #{uid} .{name} circle {{{shape_style}}}"
+        )
+        rules.append(
+            f"#{uid} .{name} line {{stroke:{style.get('stroke', '#4b5563')};"
+            f"stroke-width:{style.get('stroke-width', '1px')};}}"
+        )
+        rules.append(f"#{uid} .{name} text {{fill:{style.get('color', '#111827')};}}")
+    rules.append(
+        f"#{uid} .cluster rect {{fill:{_CLUSTER_FILL};stroke:{_CLUSTER_STROKE};"
+        "stroke-width:1.2px;}"
+    )
+    rules.append(f"#{uid} .cluster text {{font-weight:600;fill:#111827;}}")
+    rules.append(
+        f"#{uid} .edge {{fill:none;stroke:{_EDGE_COLOR};stroke-width:1.35px;"
+        "stroke-linecap:round;stroke-linejoin:round;}"
+    )
+    rules.append(f"#{uid} .edge.dashed {{stroke-dasharray:3 3;}}")
+    rules.append(f"#{uid} .edge-label {{fill:#111827;}}")
+
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" id="{uid}" '
+        f'viewBox="0 0 {width:.0f} {height:.0f}" '
+        f'width="{width:.0f}" height="{height:.0f}" '
+        f'font-family="{_FONT_FAMILY}" font-size="{_FONT_SIZE}">',
+        "<style>" + "\n".join(rules) + "</style>",
+        "<defs>"
+        f'<marker id="{uid}-arrow" viewBox="0 0 10 10" refX="9" refY="5" '
+        'markerWidth="7" markerHeight="7" orient="auto-start-reverse">'
+        f'<path d="M0,0 L10,5 L0,10 z" fill="{_EDGE_COLOR}"/></marker>'
+        "</defs>",
+        f'<rect width="100%" height="100%" fill="{_BACKGROUND}"/>',
+    ]
+
+    for cluster in graph.clusters:
+        out.append(
+            '<g class="cluster">'
+            f'<rect x="{cluster.x:.1f}" y="{cluster.y:.1f}" width="{cluster.w:.1f}" '
+            f'height="{cluster.h:.1f}" rx="4"/>'
+            f'<text x="{cluster.cx:.1f}" y="{cluster.y + _CLUSTER_TITLE - 4:.1f}" '
+            f'text-anchor="middle">{html.escape(cluster.title, quote=False)}</text>'
+            "</g>"
+        )
+
+    for edge in graph.edges:
+        path, label_x, label_y = _edge_path(edge, floor)
+        css = "edge dashed" if edge.dashed else "edge"
+        out.append(f'<path class="{css}" d="{path}" marker-end="url(#{uid}-arrow)"/>')
+        if edge.label:
+            out.append(
+                f'<text class="edge-label" x="{label_x:.1f}" y="{label_y - 4:.1f}" '
+                f'text-anchor="middle">{html.escape(edge.label, quote=False)}</text>'
+            )
+
+    for shape in graph.shapes:
+        out.append(f'<g class="{shape.css}">')
+        if shape.kind == "circle":
+            out.append(
+                f'<circle cx="{shape.cx:.1f}" cy="{shape.cy:.1f}" r="{shape.w / 2:.1f}"/>'
+            )
+        else:
+            radius = shape.h / 2 if shape.kind == "round" else 3
+            out.append(
+                f'<rect x="{shape.x:.1f}" y="{shape.y:.1f}" width="{shape.w:.1f}" '
+                f'height="{shape.h:.1f}" rx="{radius:.1f}"/>'
+            )
+            if shape.kind == "subroutine":
+                for line_x in (shape.x + 6, shape.right - 6):
+                    out.append(
+                        f'<line x1="{line_x:.1f}" y1="{shape.y:.1f}" '
+                        f'x2="{line_x:.1f}" y2="{shape.bottom:.1f}"/>'
+                    )
+        if shape.css != "blank":
+            first_y = shape.cy - (len(shape.lines) - 1) * _LINE_HEIGHT / 2
+            tspans = "".join(
+                f'<tspan x="{shape.cx:.1f}" y="{first_y + index * _LINE_HEIGHT:.1f}">'
+                f"{html.escape(line, quote=False)}</tspan>"
+                for index, line in enumerate(shape.lines)
+            )
+            out.append(
+                f'<text text-anchor="middle" dominant-baseline="central">{tspans}</text>'
+            )
+        out.append("</g>")
+
+    out.append("</svg>")
+    return "\n".join(out)
+
+
+def _uid(snapshot, *options) -> str:
+    digest = hashlib.sha1(
+        repr((snapshot.fingerprint,) + options).encode("utf-8")
+    ).hexdigest()
+    return f"osmosis-svg-{digest[:12]}"
+
+
+@functools.lru_cache(maxsize=256)
+def render_air_loop_svg(
+    snapshot: AirLoopSnapshot,
+    show_names: bool = True,
+    minimize_demand: bool = False,
+    demand_groups: tuple[ZoneGroup, ...] | None = None,
+    expand_groups: frozenset[str] = frozenset(),
+) -> str:
+    """Render an air loop snapshot as a standalone SVG document (cached).
+
+    ``demand_groups`` and ``expand_groups`` work as in
+    ``render_air_loop_mermaid``.
+    """
+    graph = _air_loop_graph(
+        snapshot, show_names, minimize_demand, demand_groups, expand_groups
+    )
+    return _svg_document(
+        graph,
+        _uid(
+            snapshot,
+            show_names,
+            minimize_demand,
+            demand_groups,
+            tuple(sorted(expand_groups)),
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def render_plant_loop_svg(
+    snapshot: PlantLoopSnapshot,
+    show_names: bool = True,
+) -> str:
+    """Render a plant loop snapshot as a standalone SVG document (cached)."""
+    graph = _plant_loop_graph(snapshot, show_names)
+    return _svg_document(graph, _uid(snapshot, show_names))
+
+
+def render_model_svgs(
+    model: "Model",
+    out_dir: str,
+    show_names: bool = True,
+    minimize_demand: bool = False,
+) -> list[str]:
+    """Write one SVG file per air loop and plant loop in a model.
+
+    Files are named after their loops; duplicate names get a numeric suffix.
+
+    Returns:
+        Paths of the written files, air loops first.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    raw_model = model.raw
+    used: set[str] = set()
+    paths = []
+
+    for raw_loop in raw_model.getAirLoopHVACs():
+        svg = render_air_loop_svg(
+            air_loop_snapshot(raw_loop),
+            show_names=show_names,
+            minimize_demand=minimize_demand,
+        )
+        paths.append(_write(out_dir, raw_loop.nameString(), svg, used, ".svg"))
+
+    for raw_loop in raw_model.getPlantLoops():
+        svg = render_plant_loop_svg(
+            plant_loop_snapshot(raw_loop),
+            show_names=show_names,
+        )
+        paths.append(_write(out_dir, raw_loop.nameString(), svg, used, ".svg"))
+
+    return paths
+
+
+def file_stem(name: str, used: set[str]) -> str:
+    """A filesystem-safe stem for ``name``, made unique within ``used``."""
+    stem = re.sub(r"[^A-Za-z0-9._-]+", "_", name.strip()).strip("_") or "loop"
+    candidate = stem
+    suffix = 2
+    while candidate.lower() in used:
+        candidate = f"{stem}_{suffix}"
+        suffix += 1
+    used.add(candidate.lower())
+    return candidate
+
+
+def _write(out_dir: str, name: str, text: str, used: set[str], extension: str) -> str:
+    path = os.path.join(out_dir, file_stem(name, used) + extension)
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(text)
+    return path
@@ -0,0 +1,363 @@
+"""Whole-building HVAC system map built from a single model traversal."""
+
+from __future__ import annotations
+
+import functools
+import re
+from typing import TYPE_CHECKING, Iterable, NamedTuple
+
+from .mermaid import (
+    DiagramItem,
+    MermaidDiagram,
+    _cast,
+    _diagram_header,
+    _diagram_item,
+    _fingerprint,
+    _idd_type,
+    _is_mixer_splitter,
+    _is_node,
+    _is_oa_system,
+    _is_unitary_system,
+    _item_lines,
+    _node_id,
+    _optional_get,
+    _safe,
+    _type_label,
+    _unitary_parts,
+)
+
+if TYPE_CHECKING:
+    from .model import Model
+
+_SKIPPED_DEMAND_TYPES = {"OS:Pipe:Adiabatic"}
+
+
+class MapZone(NamedTuple):
+    """A thermal zone served by an air loop."""
+
+    id: str
+    name: str
+
+
+class MapGroup(NamedTuple):
+    """Several objects of one type summarized as a single node."""
+
+    id: str
+    type_label: str
+    count: int
+
+    def label(self) -> str:
+        if self.count == 1:
+            return _safe(self.type_label)
+        return _safe(f"{self.type_label} &times;{self.count}")
+
+
+class MapLoop(NamedTuple):
+    """One air or plant loop cluster on the system map."""
+
+    id: str
+    kind: str
+    name: str
+    components: tuple[DiagramItem, ...]
+    zones: tuple[MapZone, ...] = ()
+    demand: tuple[MapGroup, ...] = ()
+
+
+class SystemMapSnapshot(NamedTuple):
+    """Every loop, zone equipment group, and plant connection in a model.
+
+    ``links`` holds deduplicated ``(plant_loop_id, target_id)`` pairs for
+    water connections, where the target is a component, zone, or zone
+    equipment group already placed elsewhere on the map.
+    """
+
+    loops: tuple[MapLoop, ...]
+    zone_equipment: tuple[MapGroup, ...]
+    links: tuple[tuple[str, str], ...]
+
+    @property
+    def fingerprint(self) -> str:
+        """Stable digest of the map structure and names."""
+        return _fingerprint(self)
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", text).strip("_") or "X"
+
+
+def _air_loop_entry(raw_loop, owners: dict[str, str]) -> MapLoop:
+    loop_id = _node_id(raw_loop)
+    components: list[DiagramItem] = []
+
+    for comp in raw_loop.supplyComponents():
+        if _is_node(comp) or _is_mixer_splitter(comp):
+            continue
+        if _is_oa_system(comp):
+            oa_system = _cast(comp, "AirLoopHVACOutdoorAirSystem")
+            item = _diagram_item(oa_system)
+            try:
+                for oa_comp in oa_system.oaComponents():
+                    if not _is_node(oa_comp):
+                        owners.setdefault(_node_id(oa_comp), item.id)
+            except Exception:
+                pass
+            components.append(item)
+            owners.setdefault(item.id, item.id)
+            continue
+        if _is_unitary_system(comp):
+            parts = _unitary_parts(comp)
+            if parts:
+                for part in parts:
+                    owners.setdefault(part.id, part.id)
+                owners.setdefault(_node_id(comp), parts[0].id)
+                components.extend(parts)
+                continue
+        item = _diagram_item(comp)
+        owners.setdefault(item.id, item.id)
+        components.append(item)
+
+    zones = []
+    for zone in raw_loop.thermalZones():
+        zone_id = _node_id(zone)
+        zones.append(MapZone(zone_id, zone.nameString()))
+        try:
+            for terminal in zone.airLoopHVACTerminals():
+                owners.setdefault(_node_id(terminal), zone_id)
+        except Exception:
+            pass
+
+    return MapLoop(
+        loop_id,
+        "air",
+        raw_loop.nameString(),
+        tuple(components),
+        zones=tuple(zones),
+    )
+
+
+def _resolve_owner(raw, owners: dict[str, str]) -> str | None:
+    """Find the map node a plant demand component belongs to."""
+    target = owners.get(_node_id(raw))
+    if target is not None:
+        return target
+
+    hvac = _cast(raw, "HVACComponent")
+    for getter in ("containingZoneHVACComponent", "containingHVACComponent"):
+        method = getattr(hvac, getter, None)
+        if method is None:
+            continue
+        container = _optional_get(method())
+        if container is not None:
+            target = owners.get(_node_id(container)) or _resolve_owner(
+                container, owners
+            )
+            if target is not None:
+                return target
+    return None
+
+
+def system_map_snapshot(raw_model) -> SystemMapSnapshot:
+    """Walk every loop and zone HVAC component in a model once."""
+    owners: dict[str, str] = {}
+    loops: list[MapLoop] = [
+        _air_loop_entry(raw_loop, owners) for raw_loop in raw_model.getAirLoopHVACs()
+    ]
+
+    zone_groups: dict[str, list] = {}
+    for raw in raw_model.getZoneHVACComponents():
+        label = _type_label(raw)
+        group = zone_groups.setdefault(label, [f"ZEQ_{_slug(label)}", 0])
+        group[1] += 1
+        owners.setdefault(_node_id(raw), group[0])
+    zone_equipment = tuple(
+        MapGroup(group_id, label, count)
+        for label, (group_id, count) in zone_groups.items()
+    )
+
+    # Register every plant supply component before resolving demand sides,
+    # so loop-to-loop equipment (chillers, heat exchangers) is placed once.
+    plants = []
+    for raw_loop in raw_model.getPlantLoops():
+        loop_id = _node_id(raw_loop)
+        supply = []
+        for comp in raw_loop.supplyComponents():
+            if _is_node(comp) or _is_mixer_splitter(comp):
+                continue
+            item = _diagram_item(comp)
+            if item.id in owners:
+                continue
+            owners[item.id] = item.id
+            supply.append(item)
+        plants.append((raw_loop, loop_id, supply))
+
+    links: dict[tuple[str, str], None] = {}
+    for raw_loop, loop_id, supply in plants:
+        local: dict[str, list] = {}
+        for comp in raw_loop.demandComponents():
+            if _is_node(comp) or _is_mixer_splitter(comp):
+                continue
+            if _idd_type(comp) in _SKIPPED_DEMAND_TYPES:
+                continue
+            target = _resolve_owner(comp, owners)
+            if target is None:
+                label = _type_label(comp)
+                group = local.setdefault(label, [f"{loop_id}_{_slug(label)}", 0])
+                group[1] += 1
+                continue
+            links[(loop_id, target)] = None
+
+        loops.append(
+            MapLoop(
+                loop_id,
+                "plant",
+                raw_loop.nameString(),
+                tuple(supply),
+                demand=tuple(
+                    MapGroup(group_id, label, count)
+                    for label, (group_id, count) in local.items()
+                ),
+            )
+        )
+
+    return SystemMapSnapshot(tuple(loops), zone_equipment, tuple(links))
+
+
+def _is_collapsed(loop: MapLoop, collapse) -> bool:
+    if isinstance(collapse, bool):
+        return collapse
+    return loop.name in collapse
+
+
+def _loop_title(loop: MapLoop) -> str:
+    kind = "Air Loop" if loop.kind == "air" else "Plant Loop"
+    return _safe(f"{kind}: {loop.name}")
+
+
+@functools.lru_cache(maxsize=64)
+def render_system_map_mermaid(
+    snapshot: SystemMapSnapshot,
+    show_names: bool = True,
+    max_zones: int = 8,
+    collapse: bool | frozenset[str] = False,
+) -> str:
+    """Render a system map snapshot as a Mermaid flowchart (cached).
+
+    Args:
+        snapshot: Result of ``system_map_snapshot``.
+        show_names: Whether to show component names.
+        max_zones: Air loops serving more zones than this draw a single
+            zone summary node instead of one node per zone.
+        collapse: ``True`` to draw every loop as a single node, or a set of
+            loop names to collapse only those loops.
+    """
+    lines = _diagram_header("node", "equipment", "boundary", "zone", "summary")
+    remap: dict[str, str] = {}
+    declared: set[str] = set()
+
+    for loop in snapshot.loops:
+        if _is_collapsed(loop, collapse):
+            details = [_loop_title(loop)]
+            if loop.zones:
+                count = len(loop.zones)
+                details.append(f"{count} Zone" if count == 1 else f"{count} Zones")
+            lines.append(f'    {loop.id}["{"<br/>".join(details)}"]')
+            lines.append(f"    class {loop.id} summary")
+            for item in loop.components:
+                remap.setdefault(item.id, loop.id)
+            for zone in loop.zones:
+                remap.setdefault(zone.id, loop.id)
+            for group in loop.demand:
+                remap.setdefault(group.id, loop.id)
+            continue
+
+        lines.append(f'    subgraph {loop.id} ["{_loop_title(loop)}"]')
+        lines.append("        direction LR")
+        if not (loop.components or loop.zones or loop.demand):
+            lines.append(f'        {loop.id}_EMPTY(["No Equipment"])')
+            lines.append(f"        class {loop.id}_EMPTY boundary")
+        for item in loop.components:
+            lines.extend(_item_lines(item, show_names, "        "))
+        ids = [item.id for item in loop.components]
+        for a, b in zip(ids, ids[1:]):
+            lines.append(f"        {a} --> {b}")
+        tail = ids[-1] if ids else None
+
+        if len(loop.zones) > max_zones:
+            summary_id = f"{loop.id}_ZONES"
+            lines.append(f'        {summary_id}[["{len(loop.zones)} Zones"]]')
+            lines.append(f"        class {summary_id} summary")
+            if tail:
+                lines.append(f"        {tail} --> {summary_id}")
+            for zone in loop.zones:
+                remap.setdefault(zone.id, summary_id)
+        else:
+            for zone in loop.zones:
+                if zone.id not in declared:
+                    lines.append(f'        {zone.id}[["{_safe(zone.name)}"]]')
+                    lines.append(f"        class {zone.id} zone")
+                    declared.add(zone.id)
+                    remap[zone.id] = zone.id
+                if tail:
+                    lines.append(f"        {tail} --> {zone.id}")
+
+        for group in loop.demand:
+            lines.append(f'        {group.id}["{group.label()}"]')
+            lines.append(f"        class {group.id} equipment")
+            if tail:
+                lines.append(f"        {tail} -.-> {group.id}")
+        lines.append("    end")
+
+    if snapshot.zone_equipment:
+        lines.append('    subgraph ZONE_EQUIPMENT ["Zone Equipment"]')
+        lines.append("        direction LR")
+        for group in snapshot.zone_equipment:
+            lines.append(f'        {group.id}["{group.label()}"]')
+            lines.append(f"        class {group.id} equipment")
+        lines.append("    end")
+
+    drawn: set[tuple[str, str]] = set()
+    for source, target in snapshot.links:
+        source = remap.get(source, source)
+        target = remap.get(target, target)
+        if source == target or (source, target) in drawn:
+            continue
+        drawn.add((source, target))
+        lines.append(f"    {source} -.-> {target}")
+
+    return "\n".join(lines)
+
+
+def _collapse_key(collapse: bool | Iterable[str]) -> bool | frozenset[str]:
+    if isinstance(collapse, bool):
+        return collapse
+    if isinstance(collapse, str):
+        return frozenset((collapse,))
+    return frozenset(collapse)
+
+
+def build_system_map(
+    model: "Model",
+    show_names: bool = True,
+    max_zones: int = 8,
+    collapse: bool | Iterable[str] = False,
+    width=3600,
+    zoomable: bool = True,
+) -> MermaidDiagram:
+    """Build a displayable whole-building HVAC map for a model.
+
+    The expanded map and a fully collapsed overview are rendered from the
+    same snapshot; the notebook widget toggles between them.
+    """
+    snapshot = system_map_snapshot(model.raw)
+    collapse_key = _collapse_key(collapse)
+    source = render_system_map_mermaid(snapshot, show_names, max_zones, collapse_key)
+    collapsed = None
+    if collapse_key is not True and snapshot.loops:
+        collapsed = render_system_map_mermaid(snapshot, show_names, max_zones, True)
+    return MermaidDiagram(
+        source,
+        width=width,
+        zoomable=zoomable,
+        minimized_source=collapsed,
+        toggle_label="Collapse Loops",
+    )
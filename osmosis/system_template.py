@@ -0,0 +1,427 @@
+"""Declarative HVAC system templates applied to zone groups in batch."""
+from __future__ import annotations
+
+import copy
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, NamedTuple
+
+from .base import OsmObject
+from .manager import (
+    _first_existing,
+    _is_autosize_value,
+    _snake_to_autosizer_candidates,
+    _snake_to_setter_candidates,
+)
+from .mermaid import _idd_type
+from .registry import _concrete, get_wrapper_for_snake, wrap
+
+if TYPE_CHECKING:
+    from .air_loop import AirLoopHVAC
+    from .model import Model
+    from .plant_loop import PlantLoop
+
+_RESERVED_KEYS = {"type", "name", "plant"}
+
+
+class SystemBuild(NamedTuple):
+    """Objects created by ``SystemTemplate.apply``, keyed by name."""
+
+    air_loops: dict[str, "AirLoopHVAC"]
+    plant_loops: dict[str, "PlantLoop"]
+    terminals: dict[str, list[OsmObject]]
+
+
+class SystemTemplate:
+    """
+    An HVAC system defined once as data and stamped onto zone groups.
+
+    The definition is a plain dict (JSON/YAML friendly). Components are
+    given by their ``model.<snake_case>`` manager name plus setter kwargs,
+    exactly as they would be passed to ``.create()``; a ``"plant"`` key
+    names the shared plant loop a water coil is connected to.
+
+    Name patterns are ``str.format`` strings with the fields ``name``
+    (template name), ``group`` (zone group key), ``zone`` (zone name, for
+    per-zone systems and terminals), ``loop`` (air loop name; the template
+    name inside the air loop's own name) and ``index`` (zone position within
+    its group).
+
+    Usage
+    -----
+    template = SystemTemplate.from_dict({
+        "name": "VAV Reheat",
+        "air_loop": {
+            "name": "{group} VAV",
+            "supply": [
+                {"type": "fan_variable_volume", "name": "{loop} Fan"},
+                {"type": "coil_cooling_water", "name": "{loop} CC", "plant": "chw"},
+            ],
+            "outdoor_air": True,
+            "managers": [{"type": "setpoint_manager_scheduled", "value": 12.8}],
+            "terminal": {
+                "type": "air_terminal_single_duct_vav_reheat",
+                "name": "{zone} VAV",
+                "plant": "hw",
+            },
+        },
+        "plants": {
+            "hw": {"name": "Hot Water Loop", "supply": ["boiler_hot_water"]},
+            "chw": {"name": "Chilled Water Loop", "supply": ["chiller_electric_eir"]},
+        },
+    })
+    build = template.apply(model, {"Wing A": zones_a, "Wing B": zones_b})
+    """
+
+    def __init__(
+        self,
+        name: str,
+        air_loop: Mapping[str, Any],
+        plants: Mapping[str, Mapping[str, Any]] | None = None,
+        per_zone: bool = False,
+    ):
+        self.name = name
+        self.per_zone = per_zone
+        self.plants = {
+            key: _plant_spec(key, spec) for key, spec in (plants or {}).items()
+        }
+        self.air_loop = _air_loop_spec(air_loop, per_zone)
+        for component in self._water_components():
+            if component["plant"] not in self.plants:
+                raise ValueError(
+                    f"Template '{name}' connects {component['type']} to unknown "
+                    f"plant {component['plant']!r}; define it under 'plants'."
+                )
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "SystemTemplate":
+        """Build a template from its dict definition."""
+        data = copy.deepcopy(dict(data))
+        try:
+            name = data.pop("name")
+            air_loop = data.pop("air_loop")
+        except KeyError as error:
+            raise ValueError(f"System template is missing {error.args[0]!r}.") from None
+        return cls(name, air_loop, **data)
+
+    def to_dict(self) -> dict[str, Any]:
+        """The template definition as plain data."""
+        return copy.deepcopy(
+            {
+                "name": self.name,
+                "air_loop": self.air_loop,
+                "plants": self.plants,
+                "per_zone": self.per_zone,
+            }
+        )
+
+    def _water_components(self) -> Iterable[dict[str, Any]]:
+        components = list(self.air_loop["supply"])
+        if self.air_loop["terminal"] is not None:
+            components.append(self.air_loop["terminal"])
+        return [component for component in components if component.get("plant")]
+
+    def apply(
+        self,
+        model: "Model",
+        groups: Mapping[str, Iterable] | Iterable,
+        plant_loops: Mapping[str, "PlantLoop"] | None = None,
+    ) -> SystemBuild:
+        """Build this system for every zone group in one pass.
+
+        One air loop is built per group, or per zone when the template is
+        ``per_zone``. Plant loops are shared by every system: a loop passed
+        in ``plant_loops`` or already present in the model under the
+        template's plant name is reused, otherwise it is created once.
+        All water coils and reheat coils are connected to their plants in a
+        single bulk pass before zones are attached, which keeps the
+        OpenStudio demand-branch calls cheap on large models.
+
+        If any system fails, every object created by this call (air loops,
+        terminals, coils and new plant loops) is removed again before the
+        error is raised, so the model is left as it was.
+
+        Args:
+            model: Target model.
+            groups: ``{group_key: zones}``, or a plain iterable of zones
+                forming one group keyed by the template name.
+            plant_loops: Optional existing plant loops by template key.
+
+        Returns:
+            SystemBuild: Air loops, plant loops and terminals by name.
+
+        Raises:
+            ValueError: If a zone is listed more than once, or OpenStudio
+                rejects a connection.
+        """
+        if isinstance(groups, Mapping):
+            groups = {str(key): list(zones) for key, zones in groups.items()}
+        else:
+            groups = {self.name: list(groups)}
+        _check_unique_zones(groups)
+
+        raw_model = model.raw
+        existing = {str(handle) for handle in raw_model.handles()}
+        created: list = []
+        try:
+            return self._apply(model, groups, plant_loops or {}, created)
+        except Exception:
+            # Tracked objects first, so loops and plants unhook their
+            # connections; then anything their constructors made, such as
+            # setpoint schedules.
+            for raw in reversed(created):
+                if raw.initialized():
+                    raw.remove()
+            leftovers = [
+                handle for handle in raw_model.handles() if str(handle) not in existing
+            ]
+            if leftovers:
+                raw_model.removeObjects(leftovers)
+            raise
+
+    def _apply(
+        self,
+        model: "Model",
+        groups: dict[str, list],
+        plant_loops: Mapping[str, "PlantLoop"],
+        created: list,
+    ) -> SystemBuild:
+        plants = self._resolve_plants(model, plant_loops, created)
+        coils: dict[str, list] = {key: [] for key in plants}
+
+        systems = []
+        for group, zones in groups.items():
+            if self.per_zone:
+                for index, zone in enumerate(zones):
+                    zone_name = OsmObject.unwrap(zone).nameString()
+                    systems.append((group, [zone], zone_name, index))
+            else:
+                systems.append((group, zones, "", 0))
+
+        built = []
+        for group, zones, zone_name, index in systems:
+            fields = {"name": self.name, "group": group, "zone": zone_name, "index": index}
+            loop = self._build_air_loop(model, fields, zones, coils, created)
+            built.append((loop, zones, {**fields, "loop": loop.name}))
+
+        terminal_spec = self.air_loop["terminal"]
+        template = None
+        prebuilt: dict[str, Any] = {}
+        if terminal_spec is not None:
+            template = _create(
+                model,
+                {**terminal_spec, "name": f"{self.name} Terminal Template"},
+                {},
+                created,
+            )
+            raw_model = model.raw
+            for _loop, zones, _fields in built:
+                for zone in zones:
+                    raw_terminal = _concrete(template.raw.clone(raw_model))[0]
+                    created.append(raw_terminal)
+                    prebuilt[str(OsmObject.unwrap(zone).handle())] = raw_terminal
+                    if terminal_spec.get("plant"):
+                        coil = _reheat_coil(raw_terminal)
+                        if coil is not None:
+                            coils[terminal_spec["plant"]].append(coil)
+
+        for key, raw_coils in coils.items():
+            if raw_coils:
+                plants[key].add_demand(*raw_coils)
+
+        terminals: dict[str, list[OsmObject]] = {}
+        for loop, zones, fields in built:
+            if terminal_spec is not None:
+                pattern = _zone_pattern(terminal_spec["name"], fields)
+                factory = lambda zone: prebuilt.pop(str(OsmObject.unwrap(zone).handle()))
+                terminals[loop.name] = loop.add_branches(zones, factory, name_pattern=pattern)
+            else:
+                pattern = _zone_pattern("{zone} Air Terminal", fields)
+                terminals[loop.name] = loop.add_branches(zones, name_pattern=pattern)
+        if template is not None:
+            template.raw.remove()
+
+        return SystemBuild(
+            {loop.name: loop for loop, _zones, _fields in built},
+            {plant.name: plant for plant in plants.values()},
+            terminals,
+        )
+
+    def _resolve_plants(self, model: "Model", given: Mapping[str, "PlantLoop"], created: list):
+        existing = {loop.nameString(): loop for loop in model.raw.getPlantLoops()}
+        plants = {}
+        for key, spec in self.plants.items():
+            if key in given:
+                plants[key] = given[key]
+            elif spec["name"] in existing:
+                plants[key] = wrap(existing[spec["name"]])
+            else:
+                plants[key] = _build_plant(model, spec, created)
+        return plants
+
+    def _build_air_loop(self, model: "Model", fields, zones, coils, created) -> "AirLoopHVAC":
+        spec = self.air_loop
+        # The loop's own name has no loop name yet; {loop} is the template name.
+        loop = model.air_loop.create(name=spec["name"].format(**{"loop": self.name, **fields}))
+        created.append(loop.raw)
+        fields = {**fields, "loop": loop.name}
+
+        components = [
+            _create(model, component, fields, created) for component in spec["supply"]
+        ]
+        if components:
+            loop.add_to_supply(*components)
+        for component, obj in zip(spec["supply"], components):
+            if component.get("plant"):
+                coils[component["plant"]].append(obj.raw)
+
+        if spec["outdoor_air"]:
+            oa_system = model.air_loop_hvac_outdoor_air_system.create(
+                name=f"{loop.name} OA System"
+            )
+            created.append(oa_system.raw)
+            controller = oa_system.raw.getControllerOutdoorAir()
+            controller.setName(f"{loop.name} OA Controller")
+            mech_vent = controller.controllerMechanicalVentilation()
+            mech_vent.setName(f"{loop.name} MV Controller")
+            loop.add_outdoor_air(oa_system, controller, mech_vent)
+        if spec["erv"] is not None:
+            loop.add_erv(*spec["erv"])
+
+        outlet = loop.raw.supplyOutletNode()
+        for manager_spec in spec["managers"]:
+            manager = _create(model, manager_spec, fields, created)
+            raw_zone = OsmObject.unwrap(zones[0]) if zones else None
+            if raw_zone is not None and hasattr(manager.raw, "setControlZone"):
+                manager.raw.setControlZone(raw_zone)
+            if not manager.raw.addToNode(outlet):
+                raise ValueError(
+                    f"OpenStudio rejected adding {manager_spec['type']} to "
+                    f"air loop '{loop.name}'."
+                )
+        return loop
+
+    def __repr__(self) -> str:
+        kind = "per zone" if self.per_zone else "per group"
+        return f"<SystemTemplate [{self.name}] {kind}, plants={list(self.plants)}>"
+
+
+def _component_spec(spec, default_name: str | None = None) -> dict[str, Any]:
+    if isinstance(spec, str):
+        spec = {"type": spec}
+    spec = dict(spec)
+    kind = spec.get("type")
+    if not kind or get_wrapper_for_snake(kind) is None:
+        raise ValueError(f"Unknown component type {kind!r} in system template.")
+    if default_name is not None:
+        spec.setdefault("name", default_name)
+    return spec
+
+
+def _air_loop_spec(spec: Mapping[str, Any], per_zone: bool) -> dict[str, Any]:
+    spec = dict(spec)
+    erv = spec.get("erv")
+    terminal = spec.get("terminal")
+    return {
+        "name": spec.get("name", "{zone} {name}" if per_zone else "{group} {name}"),
+        "supply": [_component_spec(item) for item in spec.get("supply", ())],
+        "outdoor_air": bool(spec.get("outdoor_air", False)),
+        "erv": tuple(erv) if erv is not None else None,
+        "managers": [
+            _component_spec(item, "{loop} Setpoint Manager")
+            for item in spec.get("managers", ())
+        ],
+        "terminal": (
+            _component_spec(terminal, "{zone} Air Terminal") if terminal is not None else None
+        ),
+    }
+
+
+def _plant_spec(key: str, spec: Mapping[str, Any]) -> dict[str, Any]:
+    spec = dict(spec)
+    pump = spec.get("pump", "pump_variable_speed")
+    return {
+        "name": spec.get("name", key),
+        "supply": [_component_spec(item) for item in spec.get("supply", ())],
+        "pump": _component_spec(pump) if pump is not None else None,
+        "managers": [
+            _component_spec(item, "{loop} Setpoint Manager")
+            for item in spec.get("managers", ())
+        ],
+        "sizing": dict(spec.get("sizing", {})),
+    }
+
+
+def _check_unique_zones(groups: Mapping[str, list]) -> None:
+    """Reject zones listed twice, which would get two competing systems."""
+    seen: dict[str, str] = {}
+    for group, zones in groups.items():
+        for zone in zones:
+            raw_zone = OsmObject.unwrap(zone)
+            handle = str(raw_zone.handle())
+            if handle in seen:
+                raise ValueError(
+                    f"Zone '{raw_zone.nameString()}' is listed in group "
+                    f"'{seen[handle]}' and again in '{group}'."
+                )
+            seen[handle] = group
+
+
+def _format_name(pattern: str | None, fields: Mapping[str, Any]) -> str | None:
+    return pattern.format(**fields) if pattern is not None else None
+
+
+def _zone_pattern(pattern: str, fields: Mapping[str, Any]) -> str:
+    """Fill every field except ``zone`` and ``index``, left for add_branches."""
+    return pattern.format(**{**fields, "zone": "{zone}", "index": "{index}"})
+
+
+def _create(
+    model: "Model",
+    spec: Mapping[str, Any],
+    fields: Mapping[str, Any],
+    created: list | None = None,
+) -> OsmObject:
+    kwargs = {key: value for key, value in spec.items() if key not in _RESERVED_KEYS}
+    manager = getattr(model, spec["type"])
+    obj = manager.create(name=_format_name(spec.get("name"), fields), **kwargs)
+    if created is not None:
+        created.append(obj.raw)
+    return obj
+
+
+def _apply_setters(raw, values: Mapping[str, Any]) -> None:
+    for key, value in values.items():
+        autosizer = _first_existing(raw, _snake_to_autosizer_candidates(key))
+        if _is_autosize_value(value) and autosizer is not None:
+            getattr(raw, autosizer)()
+            continue
+        setter = _first_existing(raw, _snake_to_setter_candidates(key))
+        if setter is None:
+            raise AttributeError(f"{_idd_type(raw)} has no setter for '{key}'.")
+        if getattr(raw, setter)(value) is False:
+            raise ValueError(
+                f"OpenStudio rejected {key}={value!r} for {_idd_type(raw)}."
+            )
+
+
+def _build_plant(model: "Model", spec: Mapping[str, Any], created: list) -> "PlantLoop":
+    fields = {"name": spec["name"], "group": "", "zone": "", "loop": spec["name"], "index": 0}
+    plant = model.plant_loop.create(name=spec["name"])
+    created.append(plant.raw)
+    if spec["sizing"]:
+        _apply_setters(plant.raw.sizingPlant(), spec["sizing"])
+    if spec["pump"] is not None:
+        plant.add_pump(_create(model, spec["pump"], fields, created))
+    for component in spec["supply"]:
+        plant.add_supply(_create(model, component, fields, created))
+    for manager in spec["managers"]:
+        plant.add_manager(_create(model, manager, fields, created))
+    return plant
+
+
+def _reheat_coil(raw_terminal):
+    from .air_loop import _terminal_reheat_coil
+
+    coil = _terminal_reheat_coil(raw_terminal)
+    if coil is None or not _idd_type(coil).startswith("OS:Coil:Heating:Water"):
+        return None
+    return coil
@@ -0,0 +1,285 @@
+"""Cached directed graph of an air loop's components and nodes."""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Iterable
+
+from .base import OsmObject
+from .mermaid import _cast, _idd_type, _is_oa_system, _optional_get
+from .registry import idd_categories, wrap
+
+
+class AirLoopTopology:
+    """
+    Airflow graph of one air loop: supply, outdoor air, relief and demand.
+
+    Edges follow the direction of airflow. The graph is built from every
+    node's inlet and outlet connections in a single pass, so branches on
+    the demand side (and dual-duct supply sides) are represented exactly.
+    Zone port lists are folded into their thermal zones, and the return
+    path from the demand outlet to the supply inlet closes the loop.
+
+    Queries accept wrapped objects, raw SDK objects, or handle strings and
+    return wrapped objects, which are cached per topology.
+
+    Usage
+    -----
+    topo = air_loop.topology()
+    topo.upstream(air_loop.supply_outlet_node)
+    topo.components_of_kind("coil")
+    topo.path(oa_node, zone)
+    """
+
+    def __init__(self, raw_loop):
+        self._raw_loop = raw_loop
+        self._raw_model = raw_loop.model()
+        self._objects: dict[str, Any] = {}
+        self._sides: dict[str, str] = {}
+        self._succ: dict[str, dict[str, None]] = {}
+        self._pred: dict[str, dict[str, None]] = {}
+        self._wrapped: dict[str, OsmObject] = {}
+        self._terminals: dict[str, str] = {}
+        self._build()
+
+    # Construction
+
+    def _build(self) -> None:
+        raw = self._raw_loop
+        loop_handle = str(raw.handle())
+        oa_system = None
+
+        for comp in raw.supplyComponents():
+            self._add(comp, "supply")
+            if _is_oa_system(comp):
+                oa_system = _cast(comp, "AirLoopHVACOutdoorAirSystem")
+        if oa_system is not None:
+            for comp in oa_system.oaComponents():
+                self._add(comp, "outdoor_air")
+            for comp in oa_system.reliefComponents():
+                self._add(comp, "relief")
+        for comp in raw.demandComponents():
+            self._add(comp, "demand")
+
+        for handle, side in list(self._sides.items()):
+            raw_obj = self._objects[handle]
+            if _idd_type(raw_obj) != "OS:Node":
+                continue
+            node = raw_obj.to_Node().get()
+            inlet = self._resolve(_optional_get(node.inletModelObject()), side)
+            outlet = self._resolve(_optional_get(node.outletModelObject()), side)
+            if inlet is not None and inlet != loop_handle:
+                self._link(inlet, handle)
+            if outlet is not None and outlet != loop_handle:
+                self._link(handle, outlet)
+
+        # The loop object itself joins the supply and demand sides.
+        for outlet_node in raw.supplyOutletNodes():
+            for inlet_node in raw.demandInletNodes():
+                self._link(str(outlet_node.handle()), str(inlet_node.handle()))
+        self._link(str(raw.demandOutletNode().handle()), str(raw.supplyInletNode().handle()))
+
+        for handle in self._objects:
+            if _idd_type(self._objects[handle]).startswith("OS:AirTerminal:"):
+                zone = next(
+                    (
+                        succ
+                        for succ in self._walk(handle, self._succ)
+                        if _idd_type(self._objects[succ]) == "OS:ThermalZone"
+                    ),
+                    None,
+                )
+                if zone is not None:
+                    self._terminals.setdefault(zone, handle)
+
+    def _add(self, raw_obj, side: str) -> str:
+        handle = str(raw_obj.handle())
+        if handle not in self._objects:
+            self._objects[handle] = raw_obj
+            self._sides[handle] = side
+            self._succ[handle] = {}
+            self._pred[handle] = {}
+        return handle
+
+    def _resolve(self, raw_obj, side: str) -> str | None:
+        if raw_obj is None:
+            return None
+        if _idd_type(raw_obj) == "OS:PortList":
+            port_list = raw_obj.to_PortList().get()
+            raw_obj = port_list.thermalZone()
+        handle = str(raw_obj.handle())
+        if handle not in self._objects and handle != str(self._raw_loop.handle()):
+            self._add(raw_obj, side)
+        return handle
+
+    def _link(self, source: str, target: str) -> None:
+        self._succ[source][target] = None
+        self._pred[target][source] = None
+
+    def _walk(self, start: str, edges: dict[str, dict[str, None]]) -> Iterable[str]:
+        seen = {start}
+        queue = deque(edges[start])
+        while queue:
+            handle = queue.popleft()
+            if handle in seen:
+                continue
+            seen.add(handle)
+            yield handle
+            queue.extend(edges[handle])
+
+    # Queries
+
+    def _key(self, obj) -> str:
+        if isinstance(obj, str):
+            handle = obj if obj.startswith("{") else f"{{{obj}}}"
+        else:
+            handle = str(OsmObject.unwrap(obj).handle())
+        if handle not in self._objects:
+            raise KeyError(f"Object is not part of air loop '{self.name}'.")
+        return handle
+
+    def _wrap(self, handles: Iterable[str]) -> list[OsmObject]:
+        wrapped = []
+        for handle in handles:
+            obj = self._wrapped.get(handle)
+            if obj is None:
+                obj = self._wrapped[handle] = wrap(self._objects[handle])
+            wrapped.append(obj)
+        return wrapped
+
+    @property
+    def name(self) -> str:
+        """Name of the air loop."""
+        return self._raw_loop.nameString()
+
+    def upstream(self, obj, transitive: bool = False) -> list[OsmObject]:
+        """Objects feeding air into ``obj``, nearest first.
+
+        Args:
+            obj: Component, node, or zone on this loop.
+            transitive: Return every upstream object instead of only the
+                immediate ones.
+        """
+        handle = self._key(obj)
+        if transitive:
+            return self._wrap(self._walk(handle, self._pred))
+        return self._wrap(self._pred[handle])
+
+    def downstream(self, obj, transitive: bool = False) -> list[OsmObject]:
+        """Objects receiving air from ``obj``, nearest first."""
+        handle = self._key(obj)
+        if transitive:
+            return self._wrap(self._walk(handle, self._succ))
+        return self._wrap(self._succ[handle])
+
+    def path(self, source, target) -> list[OsmObject]:
+        """Shortest airflow path from ``source`` to ``target``, inclusive.
+
+        Returns an empty list when ``target`` is not downstream of ``source``.
+        """
+        start, goal = self._key(source), self._key(target)
+        previous: dict[str, str | None] = {start: None}
+        queue = deque([start])
+        while queue:
+            handle = queue.popleft()
+            if handle == goal:
+                chain = []
+                while handle is not None:
+                    chain.append(handle)
+                    handle = previous[handle]
+                return self._wrap(reversed(chain))
+            for succ in self._succ[handle]:
+                if succ not in previous:
+                    previous[succ] = handle
+                    queue.append(succ)
+        return []
+
+    def components_of_kind(self, kind: str, side: str | None = None) -> list[OsmObject]:
+        """Objects in a component category, in traversal order.
+
+        Args:
+            kind: A category from ``osmosis.registry.category_index`` such as
+                ``"coil"``, ``"coil/heating"``, ``"fan"``, ``"terminal"``,
+                ``"zone"``, ``"node"`` or ``"heat_exchanger"``.
+            side: Optional ``"supply"``, ``"outdoor_air"``, ``"relief"`` or
+                ``"demand"`` filter.
+        """
+        return self._wrap(
+            handle
+            for handle, raw_obj in self._objects.items()
+            if kind in idd_categories(_idd_type(raw_obj))
+            and (side is None or self._sides[handle] == side)
+        )
+
+    def side(self, obj) -> str:
+        """``"supply"``, ``"outdoor_air"``, ``"relief"`` or ``"demand"``."""
+        return self._sides[self._key(obj)]
+
+    @property
+    def zones(self) -> list[OsmObject]:
+        """Thermal zones served by this loop."""
+        return self.components_of_kind("zone")
+
+    def zone(self, name: str) -> OsmObject:
+        """Thermal zone on this loop by name."""
+        for handle, raw_obj in self._objects.items():
+            if _idd_type(raw_obj) == "OS:ThermalZone" and raw_obj.nameString() == name:
+                return self._wrap((handle,))[0]
+        raise KeyError(f"No zone named {name!r} on air loop '{self.name}'.")
+
+    def terminal(self, zone) -> OsmObject | None:
+        """Air terminal serving ``zone`` on this loop, if any."""
+        handle = self._terminals.get(self._key(zone))
+        return self._wrap((handle,))[0] if handle is not None else None
+
+    def zone_for(self, obj) -> OsmObject | None:
+        """First thermal zone downstream of ``obj``, if any."""
+        for handle in self._walk(self._key(obj), self._succ):
+            if _idd_type(self._objects[handle]) == "OS:ThermalZone":
+                return self._wrap((handle,))[0]
+        return None
+
+    def __contains__(self, obj) -> bool:
+        try:
+            self._key(obj)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def __repr__(self) -> str:
+        edges = sum(len(succ) for succ in self._succ.values())
+        return (
+            f"<AirLoopTopology [{self.name}] objects={len(self._objects)} "
+            f"edges={edges}>"
+        )
+
+
+def _topology_cache(raw_loop) -> dict[str, "AirLoopTopology"]:
+    """Per-model topology cache, kept on the loop's live ``Model`` wrapper.
+
+    Without a live wrapper nothing is cached, so the cache never keeps a
+    model alive and models loaded from the same file never share entries.
+    """
+    from .model import live_model
+
+    model = live_model(raw_loop.model())
+    if model is None:
+        return {}
+    return model.__dict__.setdefault("_air_loop_topologies", {})
+
+
+def air_loop_topology(raw_loop, refresh: bool = False) -> AirLoopTopology:
+    """Cached topology for a raw air loop; rebuilt when ``refresh`` is set."""
+    cache = _topology_cache(raw_loop)
+    handle = str(raw_loop.handle())
+    topology = cache.get(handle)
+    if refresh or topology is None:
+        topology = cache[handle] = AirLoopTopology(raw_loop)
+    return topology
+
+
+def invalidate_topology(raw_loop) -> None:
+    """Drop the cached topology for a raw air loop."""
+    _topology_cache(raw_loop).pop(str(raw_loop.handle()), None)
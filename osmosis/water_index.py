@@ -0,0 +1,254 @@
+"""Index of water-side components and the plant loops they connect to."""
+from __future__ import annotations
+
+import weakref
+from typing import Any, Iterable
+
+from .base import OsmObject
+from .mermaid import _idd_type, _is_mixer_splitter, _is_node
+from .registry import _concrete, category_index, in_category, wrap
+
+# Live WaterComponentIndex objects notified of plant connections made or
+# broken through Osmosis
+_plant_listeners: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def _water_coil_getters() -> list[str]:
+    return [
+        f"get{idd_name.removeprefix('OS:').replace(':', '')}s"
+        for idd_name, categories in sorted(category_index().items())
+        if "coil/water" in categories
+    ]
+
+
+class WaterComponentIndex:
+    """
+    Water-side component -> plant loop index for one model.
+
+    Built in one pass over every plant loop's supply and demand sides plus
+    every water coil in the model, so unconnected coils are listed without
+    asking each coil for its plant loop. Components and plant loops removed
+    from the model drop out of every query, and ``unconnected()`` picks up
+    water coils created since the last build. Connections made or moved
+    through Osmosis (``PlantLoop.add_demand``, ``add_supply``,
+    ``connect_all``, ``AirLoopHVAC.add_branches``, ``clone_for``) are
+    recorded; call ``refresh()`` after connecting or disconnecting
+    components through the raw SDK.
+
+    Usage
+    -----
+    index = model.water_component_index()
+    index.plant_loop(coil)                     # PlantLoop or None
+    loose = index.unconnected("coil/heating")
+    hot_water.connect_all(loose)
+    """
+
+    def __init__(self, raw_model):
+        self._raw_model = raw_model
+        self._objects: dict[str, Any] = {}
+        self._connections: dict[str, dict[str, str]] = {}
+        self._plants: dict[str, Any] = {}
+        self.refresh()
+        _plant_listeners.add(self)
+
+    def refresh(self) -> "WaterComponentIndex":
+        """Rebuild the index from the model in one pass."""
+        self._objects.clear()
+        self._connections.clear()
+        self._plants.clear()
+
+        for raw_plant in self._raw_model.getPlantLoops():
+            plant_handle = str(raw_plant.handle())
+            self._plants[plant_handle] = raw_plant
+            for side, components in (
+                ("supply", raw_plant.supplyComponents()),
+                ("demand", raw_plant.demandComponents()),
+            ):
+                for raw in components:
+                    if _is_node(raw) or _is_mixer_splitter(raw):
+                        continue
+                    if _idd_type(raw) == "OS:Pipe:Adiabatic":
+                        continue
+                    self._record(raw, plant_handle, side)
+
+        self._scan_coils()
+        return self
+
+    def _scan_coils(self, check_plants: bool = False) -> None:
+        """Add water coils missing from the index.
+
+        Args:
+            check_plants: Ask each new coil for its plant loop; coils
+                created after the build may have been connected through the
+                raw SDK.
+        """
+        for getter in _water_coil_getters():
+            method = getattr(self._raw_model, getter, None)
+            if method is None:
+                continue
+            for raw in method():
+                handle = str(raw.handle())
+                if handle in self._objects:
+                    continue
+                self._objects[handle] = raw
+                self._connections[handle] = {}
+                raw_plant = raw.plantLoop() if check_plants else None
+                if raw_plant is not None and raw_plant.is_initialized():
+                    self._plant_connected(raw, raw_plant.get(), "demand")
+
+    def _record(self, raw, plant_handle: str, side: str) -> None:
+        handle = str(raw.handle())
+        if handle not in self._objects:
+            self._objects[handle] = _concrete(raw)[0]
+        self._connections.setdefault(handle, {})[plant_handle] = side
+
+    def _plant_connected(self, raw, raw_plant, side: str) -> None:
+        """Record one connection made through Osmosis."""
+        if not raw_plant.model() == self._raw_model:
+            return
+        plant_handle = str(raw_plant.handle())
+        self._plants.setdefault(plant_handle, raw_plant)
+        self._record(raw, plant_handle, side)
+
+    def _plant_disconnected(self, raw, raw_plant) -> None:
+        """Record one disconnection made through Osmosis."""
+        links = self._connections.get(str(raw.handle()))
+        if links is not None:
+            links.pop(str(raw_plant.handle()), None)
+
+    def _handle(self, obj) -> str:
+        return str(OsmObject.unwrap(obj).handle())
+
+    def _live(self, handle: str) -> bool:
+        raw = self._objects.get(handle)
+        return raw is not None and raw.initialized()
+
+    def _links(self, handle: str) -> dict[str, str]:
+        """Plant handle -> side for a live component, skipping removed plants."""
+        if not self._live(handle):
+            return {}
+        return {
+            plant: side
+            for plant, side in self._connections.get(handle, {}).items()
+            if self._plants[plant].initialized()
+        }
+
+    def connections(self, obj) -> list[tuple[OsmObject, str]]:
+        """``(plant_loop, side)`` pairs for a component, in loop order."""
+        links = self._links(self._handle(obj))
+        return [(wrap(self._plants[plant]), side) for plant, side in links.items()]
+
+    def plant_loop(self, obj, side: str | None = None) -> OsmObject | None:
+        """Plant loop a component is connected to, or ``None``.
+
+        Args:
+            obj: Wrapped or raw component.
+            side: Optional ``"supply"`` or ``"demand"`` filter, for
+                components such as chillers that sit on two loops.
+        """
+        for plant, plant_side in self._links(self._handle(obj)).items():
+            if side is None or plant_side == side:
+                return wrap(self._plants[plant])
+        return None
+
+    def is_connected(self, obj) -> bool:
+        """Whether a component is on at least one plant loop."""
+        handle = self._handle(obj)
+        if handle not in self._objects:
+            self._scan_coils(check_plants=True)
+        return bool(self._links(handle))
+
+    def components(
+        self,
+        plant_loop=None,
+        side: str | None = None,
+        category: str | None = None,
+    ) -> list[OsmObject]:
+        """Indexed components, optionally filtered.
+
+        Args:
+            plant_loop: Only components on this plant loop.
+            side: Only components on the ``"supply"`` or ``"demand"`` side.
+            category: A ``category_index`` category such as ``"coil/water"``.
+        """
+        plant = self._handle(plant_loop) if plant_loop is not None else None
+
+        def matches(links: dict[str, str]) -> bool:
+            if plant is not None:
+                return plant in links and (side is None or links[plant] == side)
+            return side is None or side in links.values()
+
+        return self._wrap(
+            handle
+            for handle in self._connections
+            if matches(self._links(handle))
+            and (category is None or in_category(self._objects[handle], category))
+        )
+
+    def unconnected(self, category: str = "coil/water") -> list[OsmObject]:
+        """Water coils (or another category) not on any plant loop.
+
+        Water coils created since the index was built are included.
+        """
+        self._scan_coils(check_plants=True)
+        return self._wrap(
+            handle
+            for handle in self._connections
+            if self._live(handle)
+            and not self._links(handle)
+            and in_category(self._objects[handle], category)
+        )
+
+    def by_plant(self) -> dict[str, list[OsmObject]]:
+        """Plant loop name -> components on that loop, both sides."""
+        names = {
+            handle: raw.nameString()
+            for handle, raw in self._plants.items()
+            if raw.initialized()
+        }
+        grouped: dict[str, list[str]] = {name: [] for name in names.values()}
+        for handle in self._connections:
+            for plant in self._links(handle):
+                grouped[names[plant]].append(handle)
+        return {name: self._wrap(handles) for name, handles in grouped.items()}
+
+    def _wrap(self, handles: Iterable[str]) -> list[OsmObject]:
+        # Objects removed since the last refresh are uninitialized; skip them.
+        objects = (self._objects[handle] for handle in handles)
+        return [wrap(raw) for raw in objects if raw.initialized()]
+
+    def __contains__(self, obj) -> bool:
+        return self._live(self._handle(obj))
+
+    def __len__(self) -> int:
+        return sum(1 for handle in self._objects if self._live(handle))
+
+    def __repr__(self) -> str:
+        loose = sum(
+            1 for handle in self._objects if self._live(handle) and not self._links(handle)
+        )
+        plants = sum(1 for raw in self._plants.values() if raw.initialized())
+        return (
+            f"<WaterComponentIndex components={len(self)} "
+            f"plants={plants} unconnected={loose}>"
+        )
+
+
+def notify_plant_connected(raw, raw_plant, side: str) -> None:
+    """Tell live water component indexes about a new plant connection."""
+    for listener in list(_plant_listeners):
+        listener._plant_connected(raw, raw_plant, side)
+
+
+def notify_plant_disconnected(raw, raw_plant) -> None:
+    """Tell live water component indexes a component left a plant loop."""
+    for listener in list(_plant_listeners):
+        listener._plant_disconnected(raw, raw_plant)
+
+
+def live_index(raw_model) -> WaterComponentIndex:
+    """A live index for ``raw_model``, building one if none exists."""
+    for index in list(_plant_listeners):
+        if index._raw_model == raw_model:
+            return index
+    return WaterComponentIndex(raw_model)
@@ -0,0 +1,171 @@
+"""Bulk Sizing:Zone configuration from scalars, per-zone arrays or a table."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Mapping
+
+import openstudio
+
+from .base import OsmObject
+from .manager import (
+    _first_existing,
+    _is_autosize_value,
+    _snake_to_autosizer_candidates,
+    _snake_to_setter_candidates,
+)
+from .property_table import _is_empty, _python_scalar, _table_columns
+
+if TYPE_CHECKING:
+    from .model import Model
+
+# Keyword -> Sizing:Zone fields it sets; ``None`` takes the keyword's value.
+_SHORTCUTS = {
+    "cooling": (
+        ("zone_cooling_design_supply_air_temperature_input_method", "SupplyAirTemperature"),
+        ("zone_cooling_design_supply_air_temperature", None),
+    ),
+    "heating": (
+        ("zone_heating_design_supply_air_temperature_input_method", "SupplyAirTemperature"),
+        ("zone_heating_design_supply_air_temperature", None),
+    ),
+}
+
+# ``doas`` keys, as in ThermalZone.configure_dedicated_outdoor_air_sizing
+_DOAS_FIELDS = {
+    "low_setpoint_temperature": "dedicated_outdoor_air_low_setpoint_temperature_for_design",
+    "high_setpoint_temperature": "dedicated_outdoor_air_high_setpoint_temperature_for_design",
+    "control_strategy": "dedicated_outdoor_air_system_control_strategy",
+    "heating_maximum_air_flow_fraction": "heating_maximum_air_flow_fraction",
+}
+
+
+class _FieldAccess:
+    """Setter, getter and autosizer of one Sizing:Zone field, resolved once."""
+
+    def __init__(self, key: str):
+        os_cls = openstudio.model.SizingZone
+        candidates = _snake_to_setter_candidates(key)
+        self.key = key
+        self.setter = _first_existing(os_cls, candidates)
+        if self.setter is None:
+            raise AttributeError(
+                f"SizingZone has no setter for '{key}' (tried {', '.join(candidates)})."
+            )
+        stem = self.setter[3:]
+        self.getter = _first_existing(os_cls, [stem[0].lower() + stem[1:], f"is{stem}"])
+        self.autosizer = _first_existing(os_cls, _snake_to_autosizer_candidates(key))
+        self.is_autosized = _first_existing(os_cls, [f"is{stem}Autosized"])
+
+    def read(self, raw_sizing) -> Any:
+        if self.is_autosized is not None and getattr(raw_sizing, self.is_autosized)():
+            return "Autosize"
+        if self.getter is None:
+            return None
+        return OsmObject._unwrap(getattr(raw_sizing, self.getter)())
+
+    def write(self, raw_sizing, value) -> bool:
+        if self.autosizer is not None and _is_autosize_value(value):
+            getattr(raw_sizing, self.autosizer)()
+            return True
+        return getattr(raw_sizing, self.setter)(value) is not False
+
+
+def _column(key: str, value, count: int) -> list:
+    """Broadcast a scalar, or check a per-zone sequence's length."""
+    if isinstance(value, (str, bytes, bool, int, float)) or value is None:
+        return [value] * count
+    values = list(value)
+    if len(values) != count:
+        raise ValueError(f"'{key}' has {len(values)} values for {count} zones.")
+    return values
+
+
+def configure_zone_sizing(
+    model: "Model",
+    zones=None,
+    cooling=None,
+    heating=None,
+    doas: Mapping[str, Any] | None = None,
+    **fields,
+) -> dict[str, list]:
+    """Set Sizing:Zone fields on many zones; see ``Model.configure_zone_sizing``."""
+    raw_model = model.raw
+    columns: dict[str, Any] = {}
+
+    if zones is not None and (
+        isinstance(zones, Mapping) or (hasattr(zones, "columns") and hasattr(zones, "index"))
+    ):
+        zones, table = _table_columns(zones, "name")
+        columns.update(table)
+
+    for key, value in (("cooling", cooling), ("heating", heating)):
+        if value is not None:
+            columns[key] = value
+    if doas:
+        columns["account_for_dedicated_outdoor_air_system"] = True
+        for key, value in doas.items():
+            if key not in _DOAS_FIELDS:
+                raise ValueError(
+                    f"Unknown doas setting '{key}'; choose from {', '.join(_DOAS_FIELDS)}."
+                )
+            columns[_DOAS_FIELDS[key]] = value
+    columns.update(fields)
+
+    # Zones, with their Sizing:Zone objects, resolved once.
+    if zones is None:
+        raw_zones = list(raw_model.getThermalZones())
+        unknown: list = []
+    else:
+        by_name = None
+        raw_zones, unknown = [], []
+        for zone in zones:
+            if isinstance(zone, str):
+                if by_name is None:
+                    by_name = {raw.nameString(): raw for raw in raw_model.getThermalZones()}
+                raw_zone = by_name.get(zone)
+                if raw_zone is None:
+                    unknown.append(zone)
+                    raw_zones.append(None)
+                    continue
+                raw_zones.append(raw_zone)
+            else:
+                raw_zones.append(OsmObject.unwrap(zone))
+    count = len(raw_zones)
+
+    # Expand shortcuts into Sizing:Zone fields, each with a resolved setter.
+    plan: list[tuple[_FieldAccess, list]] = []
+    accessors: dict[str, _FieldAccess] = {}
+    for key, value in columns.items():
+        values = _column(key, value, count)
+        targets = _SHORTCUTS.get(key, ((key, None),))
+        for field, fixed in targets:
+            access = accessors.get(field)
+            if access is None:
+                access = accessors[field] = _FieldAccess(field)
+            plan.append((access, values if fixed is None else [
+                None if _is_empty(cell) else fixed for cell in values
+            ]))
+
+    report: dict[str, list] = {"changes": [], "unchanged": [], "failed": [], "unknown_zones": unknown}
+    for row, raw_zone in enumerate(raw_zones):
+        if raw_zone is None:
+            continue
+        raw_sizing = raw_zone.sizingZone()
+        name = raw_zone.nameString()
+        changed = failed = False
+        for access, values in plan:
+            value = values[row]
+            if _is_empty(value):
+                continue
+            value = _python_scalar(value)
+            old = access.read(raw_sizing)
+            if old == value or (_is_autosize_value(value) and old == "Autosize"):
+                continue
+            if not access.write(raw_sizing, value):
+                report["failed"].append((name, access.key, value))
+                failed = True
+                continue
+            report["changes"].append((name, access.key, old, value))
+            changed = True
+        if not changed and not failed:
+            report["unchanged"].append(name)
+    return report
@@ -0,0 +1,225 @@
+"""Group spaces into thermal zones by story, space type, orientation and tags."""
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from .additional_properties import _MISSING, _existing_properties, _read_feature
+from .mermaid import _optional_get
+from .registry import wrap
+from .space_geometry import _numpy
+
+STRATEGY_KEYS = ("story", "space_type", "orientation", "exposure", "property")
+
+_FACADES = ("North", "East", "South", "West")
+
+
+def _strategy(strategy: str | Iterable[str], property_name: str | None) -> list[str]:
+    keys = [strategy] if isinstance(strategy, str) else list(strategy)
+    if property_name is not None and "property" not in keys:
+        keys.append("property")
+    for key in keys:
+        if key not in STRATEGY_KEYS:
+            raise ValueError(
+                f"Unknown zoning key '{key}'; choose from {', '.join(STRATEGY_KEYS)}."
+            )
+    if "property" in keys and property_name is None:
+        raise ValueError("Zoning by 'property' needs a property_name.")
+    return keys
+
+
+def _north_axis(raw_model) -> float:
+    raw_building = _optional_get(raw_model.building())
+    return raw_building.northAxis() if raw_building is not None else 0.0
+
+
+def orientation_labels(index) -> list[str]:
+    """``"<Facade> Perimeter"`` or ``"Core"`` per space row of a spatial index.
+
+    A space is perimeter when it has outdoor walls; its facade is the
+    compass direction (building north axis applied) with the most outdoor
+    wall area.
+    """
+    np = _numpy()
+    surfaces = index._surface_table()
+    normal, area, owner = surfaces["normal"], surfaces["area"], surfaces["owner"]
+    walls = (surfaces["boundary"] == "Outdoors") & (surfaces["surface_type"] == "Wall")
+
+    azimuth = np.degrees(np.arctan2(normal[:, 0], normal[:, 1])) + _north_axis(index._raw_model)
+    facade = ((azimuth % 360.0 + 45.0) // 90.0).astype(np.int64) % 4
+    wall_area = np.zeros((len(index.geometry), 4))
+    np.add.at(wall_area, (owner[walls], facade[walls]), area[walls])
+
+    dominant = wall_area.argmax(axis=1)
+    perimeter = wall_area.sum(axis=1) > 0
+    return [
+        f"{_FACADES[side]} Perimeter" if is_perimeter else "Core"
+        for side, is_perimeter in zip(dominant.tolist(), perimeter.tolist())
+    ]
+
+
+def exposure_labels(index) -> list[str]:
+    """Exterior exposure per space row, e.g. ``"Walls+Roof"`` or ``"Interior"``."""
+    np = _numpy()
+    surfaces = index._surface_table()
+    owner, surface_type, boundary = (
+        surfaces["owner"], surfaces["surface_type"], surfaces["boundary"]
+    )
+    outdoors = boundary == "Outdoors"
+    ground = np.array([value.startswith(("Ground", "Foundation")) for value in boundary], dtype=bool)
+    flags = (
+        ("Walls", outdoors & (surface_type == "Wall")),
+        ("Roof", outdoors & (surface_type == "RoofCeiling")),
+        ("Floor", outdoors & (surface_type == "Floor")),
+        ("Ground", ground),
+    )
+    count = len(index.geometry)
+    exposed = {
+        label: np.bincount(owner[mask], minlength=count) > 0 for label, mask in flags
+    }
+    return [
+        "+".join(label for label, _ in flags if exposed[label][row]) or "Interior"
+        for row in range(count)
+    ]
+
+
+def plan_zones(
+    index,
+    property_values: dict[str, Any],
+    strategy: str | Iterable[str] = ("story", "space_type"),
+    property_name: str | None = None,
+    name_pattern: str | None = None,
+) -> dict[str, list[int]]:
+    """Zone name -> space rows of ``index``, in first-seen order.
+
+    Stories, space types and ``property_values`` (keyed by space handle)
+    are read from the model, not from the cached index geometry.
+    """
+    keys = _strategy(strategy, property_name)
+    raw_spaces = index._raw_spaces
+    count = len(raw_spaces)
+
+    columns: dict[str, list[str]] = {}
+    if "story" in keys:
+        names = []
+        for raw_space in raw_spaces:
+            raw_story = _optional_get(raw_space.buildingStory())
+            names.append(raw_story.nameString() if raw_story is not None else "No Story")
+        columns["story"] = names
+    if "space_type" in keys:
+        names = []
+        for raw_space in raw_spaces:
+            raw_type = _optional_get(raw_space.spaceType())
+            names.append(raw_type.nameString() if raw_type is not None else "No Space Type")
+        columns["space_type"] = names
+    if "orientation" in keys:
+        columns["orientation"] = orientation_labels(index)
+    if "exposure" in keys:
+        columns["exposure"] = exposure_labels(index)
+    if "property" in keys:
+        columns["property"] = [
+            str(property_values.get(str(raw_space.handle()), f"No {property_name}"))
+            for raw_space in raw_spaces
+        ]
+
+    plan: dict[str, list[int]] = {}
+    for row in range(count):
+        labels = {key: columns[key][row] for key in keys}
+        if name_pattern is not None:
+            name = name_pattern.format(**labels)
+        else:
+            name = " ".join(labels.values()) or "Zone"
+        plan.setdefault(name, []).append(row)
+    return plan
+
+
+def auto_zone(
+    model,
+    index,
+    strategy: str | Iterable[str] = ("story", "space_type"),
+    property_name: str | None = None,
+    name_pattern: str | None = None,
+    remove_empty: bool = True,
+    dry_run: bool = False,
+) -> dict[str, Any]:
+    """Group spaces into thermal zones and assign them; see ``Model.auto_zone``."""
+    raw_spaces = index._raw_spaces
+    # Read live: the cached property index misses features set through the
+    # raw SDK between a dry run and the apply.
+    property_values: dict[str, Any] = {}
+    if property_name is not None:
+        for raw_space in raw_spaces:
+            raw_props = _existing_properties(raw_space)
+            if raw_props is None:
+                continue
+            value = _read_feature(raw_props, property_name)
+            if value is not _MISSING:
+                property_values[str(raw_space.handle())] = value
+    # Boundary conditions change without adding or removing surfaces, so
+    # the surface table is rebuilt rather than reused from the cache.
+    index._surfaces = None
+
+    plan = plan_zones(index, property_values, strategy, property_name, name_pattern)
+
+    # Current zone of every space, and the spaces each zone holds.
+    current: list[Any] = []
+    members: dict[str, set[int]] = {}
+    zones: dict[str, Any] = {}
+    for row, raw_space in enumerate(raw_spaces):
+        raw_zone = _optional_get(raw_space.thermalZone())
+        current.append(raw_zone)
+        if raw_zone is not None:
+            handle = str(raw_zone.handle())
+            zones[handle] = raw_zone
+            members.setdefault(handle, set()).add(row)
+
+    report: dict[str, Any] = {
+        "zones": {name: [raw_spaces[row].nameString() for row in rows] for name, rows in plan.items()},
+        "created": [],
+        "reused": [],
+        "removed": [],
+        "emptied": [],
+    }
+
+    # A group already filling one zone on its own keeps that zone.
+    targets: dict[str, Any] = {}
+    for name, rows in plan.items():
+        raw_zone = current[rows[0]]
+        if raw_zone is not None and members[str(raw_zone.handle())] == set(rows):
+            targets[name] = raw_zone
+            report["reused"].append(name)
+        else:
+            report["created"].append(name)
+
+    kept = {str(raw_zone.handle()) for raw_zone in targets.values()}
+    removable = []
+    for handle, raw_zone in zones.items():
+        if handle in kept:
+            continue
+        # Zones with HVAC are left in place rather than removed with it.
+        if not remove_empty or len(raw_zone.equipment()) or len(raw_zone.airLoopHVACs()):
+            report["emptied"].append(raw_zone.nameString())
+        else:
+            report["removed"].append(raw_zone.nameString())
+            removable.append(raw_zone)
+
+    if dry_run:
+        return report
+
+    created = []
+    for name, rows in plan.items():
+        if name in targets:
+            continue
+        zone = model.thermal_zone.create(name=name)
+        for row in rows:
+            zone.add_space(wrap(raw_spaces[row]))
+        created.append((name, zone.raw))
+    # Zones are removed once empty, which is much cheaper in the SDK than
+    # removing zones that still hold spaces.
+    for raw_zone in removable:
+        raw_zone.remove()
+    # Names taken by the removed zones are free now.
+    for name, raw_zone in list(targets.items()) + created:
+        if raw_zone.nameString() != name:
+            raw_zone.setName(name)
+    report["created"] = [raw_zone.nameString() for _, raw_zone in created]
+    return report
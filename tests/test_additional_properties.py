@@ -0,0 +1,172 @@
+import osmosis as osmo
+
+
+def test_additional_properties_read_back_stored_types():
+    model = osmo.Model.new()
+    space = model.space.create(name="Office")
+    props = space.additional_properties
+
+    props.tenant = "Acme"
+    props.power_factor = 0.95
+    props.count = 42
+    props.is_active = True
+
+    assert props.tenant == "Acme"
+    assert props.power_factor == 0.95
+    assert props.count == 42
+    assert isinstance(props.count, int)
+    assert props.is_active is True
+    assert props.get("missing", "default") == "default"
+
+
+def test_additional_properties_bulk_update_and_to_dict():
+    model = osmo.Model.new()
+    props = model.space.create(name="Office").additional_properties
+
+    props.update({"hvac_system": "vav", "floor": 3}, occupied=False)
+
+    assert props.to_dict() == {
+        "hvac_system": "vav",
+        "floor": 3,
+        "occupied": False,
+    }
+
+
+def test_model_additional_space_properties_skips_untagged_spaces():
+    model = osmo.Model.new()
+    tagged = model.space.create(name="Tagged")
+    untagged = model.space.create(name="Untagged")
+    tagged.additional_properties.hvac_system = "vestibule"
+
+    properties = model.additional_space_properties()
+
+    assert properties == {"hvac_system": ["vestibule"]}
+    assert not untagged.raw.hasAdditionalProperties()
+
+
+def test_property_index_finds_and_filters_tagged_spaces():
+    model = osmo.Model.new()
+    lobby = model.space.create(name="Lobby")
+    office = model.space.create(name="Office")
+    lab = model.space.create(name="Lab")
+    lobby.additional_properties.update({"hvac_system": "vestibule", "tenant": "A"})
+    office.additional_properties.update({"hvac_system": "vav", "tenant": "A"})
+    lab.additional_properties.update({"hvac_system": "vav", "tenant": "B"})
+
+    index = model.property_index("space")
+
+    assert [space.name for space in index.find("hvac_system", "Vestibule")] == ["Lobby"]
+    assert index.values("tenant") == ["A", "B"]
+    assert [
+        space.name for space in index.filter({"hvac_system": "vav", "tenant": "A"})
+    ] == ["Office"]
+    assert sorted(
+        space.name
+        for space in index.filter(hvac_system="vestibule", tenant="B", match="any")
+    ) == ["Lab", "Lobby"]
+    assert [space.name for space in index.filter(tenant=["A", "B"], hvac_system="vav")] == [
+        "Office",
+        "Lab",
+    ]
+
+
+def test_property_index_refreshes_when_properties_change_through_osmosis():
+    model = osmo.Model.new()
+    office = model.space.create(name="Office")
+    index = model.property_index("Space")
+    assert index.find("hvac_system", "vav") == []
+
+    office.additional_properties.hvac_system = "vav"
+    late = model.space.create(name="Late")
+    late.additional_properties.hvac_system = "vav"
+
+    assert model.property_index("space") is index
+    assert [space.name for space in index.find("hvac_system", "vav")] == ["Office", "Late"]
+
+    office.additional_properties.hvac_system = "doas"
+    del late.additional_properties.hvac_system
+
+    assert index.find("hvac_system", "vav") == []
+    assert [space.name for space in index.find("hvac_system", "doas")] == ["Office"]
+
+
+def test_group_zones_by_additional_space_property_uses_unique_zones():
+    model = osmo.Model.new()
+    zone = model.thermal_zone.create(name="Zone 1")
+    for name in ("Space A", "Space B"):
+        space = model.space.create(name=name)
+        space.raw.setThermalZone(zone.raw)
+        space.additional_properties.hvac_system = "vestibule"
+
+    groups = model.group_zones_by_additional_space_property("HVAC System")
+
+    assert [zone.name for zone in groups("vestibule")] == ["Zone 1"]
+
+
+def test_group_zones_by_additional_space_property_sees_raw_clone_and_remove():
+    model = osmo.Model.new()
+    zone_1 = model.thermal_zone.create(name="Zone 1")
+    zone_2 = model.thermal_zone.create(name="Zone 2")
+    space = model.space.create(name="Space A")
+    space.raw.setThermalZone(zone_1.raw)
+    space.additional_properties.hvac_system = "vav"
+    model.property_index("space")
+
+    clone = space.raw.clone(model.raw).to_Space().get()
+    clone.setThermalZone(zone_2.raw)
+    groups = model.group_zones_by_additional_space_property("HVAC System")
+    assert sorted(zone.name for zone in groups("vav")) == ["Zone 1", "Zone 2"]
+
+    space.raw.remove()
+    groups = model.group_zones_by_additional_space_property("HVAC System")
+    assert [zone.name for zone in groups("vav")] == ["Zone 2"]
+
+
+def test_property_index_ignores_objects_from_other_models():
+    model = osmo.Model.new()
+    other = osmo.Model.new()
+    index = model.property_index("space")
+
+    other.space.create(name="Elsewhere").additional_properties.tenant = "A"
+
+    assert index.find("tenant", "A") == []
+
+
+def test_model_set_additional_properties_types_columns_and_reports_unknown_keys():
+    model = osmo.Model.new()
+    model.space.create(name="Office")
+    model.space.create(name="Lab")
+
+    report = model.set_additional_properties(
+        {
+            "name": ["Office", "Lab", "Missing"],
+            "tenant": ["A", "B", "C"],
+            "occupancy": [10, 2.5, 1],
+            "floor": [1, None, 3],
+        }
+    )
+
+    spaces = {space.name: space for space in model.spaces}
+    office, lab = spaces["Office"], spaces["Lab"]
+    assert report == {"objects": 2, "features": 5, "unknown_keys": ["Missing"]}
+    assert office.additional_properties.to_dict() == {
+        "tenant": "A",
+        "occupancy": 10.0,
+        "floor": 1,
+    }
+    assert isinstance(office.additional_properties.occupancy, float)
+    assert "floor" not in lab.additional_properties
+
+
+def test_model_set_additional_properties_accepts_rows_keyed_by_handle():
+    model = osmo.Model.new()
+    zone = model.thermal_zone.create(name="Zone 1")
+    index = model.property_index("thermal_zone")
+
+    model.set_additional_properties(
+        [{"handle": zone.handle.upper(), "hvac_system": "vav"}],
+        key="handle",
+        object_type="thermal_zone",
+    )
+
+    assert [found.name for found in index.find("hvac_system", "vav")] == ["Zone 1"]
@@ -350,3 +350,455 @@ def test_mermaid_diagram_can_render_non_zoomable_html():
 
     assert "Zoom" not in html
     assert "<img" in html
+
+
+def test_air_loop_diagram_snapshot_renders_both_views_and_fingerprints_changes():
+    model = osmo.Model.new()
+    loop = model.air_loop.create(name="Main Loop")
+    loop.add_to_supply(model.coil_heating_electric.create(name="Heating Coil"))
+    loop.add_branch(model.thermal_zone.create(name="Zone 1"))
+
+    snapshot = loop.diagram_snapshot()
+    full = loop._build_mermaid(snapshot=snapshot)
+    minimized = loop._build_mermaid(minimize_demand=True, snapshot=snapshot)
+
+    assert full == loop._build_mermaid()
+    assert full is loop._build_mermaid(snapshot=loop.diagram_snapshot())
+    assert "Zone 1" in full
+    assert 'ZSUMMARY[["1 Zone"]]' in minimized
+    assert loop.diagram_snapshot().fingerprint == snapshot.fingerprint
+
+    loop.raw.thermalZones()[0].setName("Renamed Zone")
+
+    changed = loop.diagram_snapshot()
+    assert changed.fingerprint != snapshot.fingerprint
+    assert "Renamed Zone" in loop._build_mermaid(snapshot=changed)
+
+
+def test_air_loop_to_svg_renders_offline_and_model_exports_files(tmp_path):
+    import xml.etree.ElementTree as ET
+
+    model = osmo.Model.new()
+    loop = model.air_loop.create(name="Main Loop")
+    loop.add_to_supply(model.coil_heating_electric.create(name="Heating Coil"))
+    loop.add_branch(model.thermal_zone.create(name="Zone 1"))
+    model.plant_loop.create(name="Hot Water Loop")
+
+    svg = loop.to_svg()
+    root = ET.fromstring(svg)
+
+    assert root.tag.endswith("svg")
+    assert "Zone 1" in svg
+    assert "Heating Coil" in svg
+    assert "#e1e5ea" in svg
+    assert "1 Zone" in loop.to_svg(minimize_demand=True)
+
+    diagram = MermaidDiagram("flowchart LR\nA-->B", svg=svg)
+    assert diagram.image_url().startswith("data:image/svg+xml;base64,")
+    assert diagram._repr_mimebundle_()["image/svg+xml"] == svg
+
+    paths = model.export_loop_svgs(str(tmp_path))
+    assert sorted(p.rsplit("/", 1)[-1] for p in paths) == [
+        "Hot_Water_Loop.svg",
+        "Main_Loop.svg",
+    ]
+    assert (tmp_path / "Main_Loop.svg").read_text(encoding="utf-8") == svg
+
+
+def test_air_loop_groups_demand_by_terminal_story_and_property():
+    model = osmo.Model.new()
+    loop = model.air_loop.create(name="Main Loop")
+    first = model.building_story.create(name="Level 1")
+    second = model.building_story.create(name="Level 2")
+
+    for index in range(6):
+        zone = model.thermal_zone.create(name=f"Zone {index}")
+        space = model.space.create(name=f"Space {index}")
+        space.raw.setThermalZone(zone.raw)
+        space.raw.setBuildingStory((first if index < 4 else second).raw)
+        if index % 2 == 0:
+            space.additional_properties.tenant = "A"
+        if index < 4:
+            terminal = openstudio.model.AirTerminalSingleDuctConstantVolumeNoReheat(
+                model.raw, model.raw.alwaysOnDiscreteSchedule()
+            )
+            terminal.setMaximumAirFlowRate(0.5)
+            loop.add_branch(zone, terminal=terminal)
+        else:
+            loop.add_branch(zone)
+
+    snapshot = loop.diagram_snapshot()
+    assert not snapshot.zone_details
+    assert all(zone.terminal is None and zone.story is None for zone in snapshot.zones)
+    assert loop.diagram_snapshot(zone_details=True).zones[0].story == "Level 1"
+    grouped = loop._build_mermaid(snapshot=snapshot, group_demand="story")
+    assert 'ZGROUP0[["Level 1<br/>4 Zones<br/>2.000 m³/s"]]' in grouped
+    assert 'ZGROUP1[["Level 2<br/>2 Zones<br/>Flow autosized"]]' in grouped
+    assert "Zone 0" not in grouped
+    assert len(grouped) < len(loop._build_mermaid(snapshot=snapshot))
+
+    expanded = loop._build_mermaid(
+        snapshot=snapshot, group_demand="story", expand_groups=["Level 2"]
+    )
+    assert "Zone 5" in expanded and "Zone 0" not in expanded
+
+    terminal_groups = loop.demand_groups("terminal")
+    label = "Air Terminal Single Duct Constant Volume No Reheat"
+    assert list(terminal_groups) == [label]
+    assert len(terminal_groups[label]) == 6
+
+    tenant_groups = loop.demand_groups("property", property_name="Tenant")
+    assert sorted(zone.name for zone in tenant_groups["A"]) == [
+        "Zone 0",
+        "Zone 2",
+        "Zone 4",
+    ]
+    assert len(tenant_groups["Untagged"]) == 3
+    svg = loop.to_svg(group_demand="property", property_name="tenant")
+    assert ">Untagged</tspan>" in svg and "Zone 1" not in svg
+
+
+def test_mermaid_diagram_uses_compressed_urls_capped_size_and_short_alt():
+    import base64
+    import json
+    import zlib
+
+    source = "graph LR\n" + "\n".join(f"    Z{i}[[Zone {i}]] --> MIX" for i in range(400))
+    diagram = MermaidDiagram(source, zoomable=False)
+
+    url = diagram.image_url()
+    assert url.startswith("https://mermaid.ink/svg/pako:")
+    payload = url.split("pako:", 1)[1]
+    decoded = zlib.decompress(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    assert json.loads(decoded)["code"] == source
+
+    plain = MermaidDiagram(source, encoding="base64").image_url()
+    assert len(url) * 5 < len(plain)
+
+    html = diagram._repr_html_()
+    assert len(html) < len(url) + 1000
+    assert "lines)" in html and "Zone 399" not in html
+
+    capped = MermaidDiagram(source, zoomable=False, max_url_length=100)._repr_html_()
+    assert "pako:" not in capped and "data:image/svg+xml;base64," in capped
+
+
+def test_air_loop_topology_answers_flow_queries_and_refreshes_on_changes():
+    model = osmo.Model.new()
+    loop = model.air_loop.create(name="Main Loop")
+    fan = model.fan_variable_volume.create(name="Supply Fan")
+    coil = model.coil_heating_electric.create(name="Heating Coil")
+    loop.add_to_supply(fan, coil)
+    loop.add_erv(0.7, 0.6)
+    zone = model.thermal_zone.create(name="Zone 1")
+    loop.add_branch(zone)
+
+    topology = loop.topology()
+    assert topology is loop.topology()
+    assert topology.downstream(topology.downstream(fan)[0])[0].name == "Heating Coil"
+    assert topology.upstream(loop.supply_outlet_node)[0].name == "Heating Coil"
+    assert [obj.name for obj in topology.components_of_kind("coil")] == ["Heating Coil"]
+    assert topology.side(topology.components_of_kind("heat_exchanger")[0]) == "outdoor_air"
+
+    path = topology.path(fan, zone)
+    assert path[0].name == "Supply Fan" and path[-1].name == "Zone 1"
+    assert "Main Loop OA System" in [obj.name for obj in topology.path(zone, fan)]
+    assert topology.zone("Zone 1").name == "Zone 1"
+    terminal = topology.terminal(zone)
+    assert terminal.name == "Zone 1 Air Terminal"
+    assert topology.zone_for(terminal).name == "Zone 1"
+
+    loop.add_branch(model.thermal_zone.create(name="Zone 2"))
+    refreshed = loop.topology()
+    assert refreshed is not topology
+    assert sorted(zone.name for zone in refreshed.zones) == ["Zone 1", "Zone 2"]
+
+
+def test_air_loop_topology_cache_is_per_model_and_dropped_with_it(tmp_path):
+    import gc
+    import weakref
+
+    source = osmo.Model.new()
+    source.air_loop.create(name="Main Loop").add_branch(
+        source.thermal_zone.create(name="Zone 1")
+    )
+    path = str(tmp_path / "loop.osm")
+    source.save(path, True)
+
+    first = osmo.Model.load(path)
+    second = osmo.Model.load(path)
+    first_topology = first.air_loops[0].topology()
+    second_topology = second.air_loops[0].topology()
+    assert first_topology is not second_topology
+    assert first.air_loops[0].topology() is first_topology
+    assert second.air_loops[0].topology() is second_topology
+
+    dropped = weakref.ref(first_topology)
+    del first, first_topology
+    gc.collect()
+    assert dropped() is None
+
+
+def test_air_loop_components_filter_by_category_and_include_subcomponents():
+    from osmosis.registry import idd_categories
+
+    assert idd_categories("OS:Coil:Heating:Water") == {"coil", "coil/heating", "coil/water"}
+    for idd_name in (
+        "OS:Coil:WaterHeating:AirToWaterHeatPump",
+        "OS:Coil:WaterHeating:Desuperheater",
+    ):
+        assert idd_categories(idd_name) == {"coil", "coil/water_heating"}
+    assert "coil/cooling" in idd_categories("OS:CoilSystem:Cooling:Water:HeatExchangerAssisted")
+    assert "coil/heating" in idd_categories("OS:Coil:Heating:Desuperheater")
+    assert "setpoint_manager" in idd_categories("OS:SetpointManager:Scheduled")
+    assert "zone_hvac" in idd_categories("OS:ZoneHVAC:UnitHeater")
+
+    model = osmo.Model.new()
+    loop = model.air_loop.create(name="Loop")
+    unitary = model.air_loop_hvac_unitary_system.create(name="ASHP")
+    unitary.set_supply_fan(model.fan_system_model.create(name="Core Fan"))
+    unitary.set_cooling_coil(model.coil_cooling_dx_multi_speed.create(name="ASHP Coil"))
+    unitary.set_supplemental_heating_coil(
+        model.coil_heating_electric.create(name="Backup Coil")
+    )
+    loop.add_to_supply(unitary)
+    loop.add_erv(0.7, 0.6)
+
+    assert loop.coils == []
+    assert [coil.name for coil in loop.components_in("coil", include_subcomponents=True)] == [
+        "ASHP Coil",
+        "Backup Coil",
+    ]
+    assert [
+        coil.name
+        for coil in loop.components_in("coil/heating", include_subcomponents=True)
+    ] == ["Backup Coil"]
+    assert [fan.name for fan in loop.components_in("fan", include_subcomponents=True)] == [
+        "Core Fan"
+    ]
+    assert [
+        hx.name for hx in loop.components_in("heat_exchanger", include_subcomponents=True)
+    ] == ["Loop ERV"]
+    assert [hx.name for hx in loop.topology().components_of_kind("heat_exchanger")] == [
+        "Loop ERV"
+    ]
+    # The SDK's Loop::components() is still reached as an attribute.
+    names = [component.name for component in loop.components]
+    assert {"Loop OA System", "ASHP"} <= set(names)
+
+
+def test_add_branches_clones_template_names_terminals_and_connects_reheat():
+    model = osmo.Model.new()
+    loop = model.air_loop.create(name="VAV")
+    hot_water = model.plant_loop.create(name="HW Loop")
+    zones = [model.thermal_zone.create(name=f"Zone {index}") for index in range(3)]
+    template = model.air_terminal_single_duct_vav_reheat.create(name="Template")
+    template.raw.setMaximumAirFlowRate(0.25)
+
+    terminals = loop.add_branches(
+        zones, template, name_pattern="VAV-{index} {zone}", plant_loop=hot_water
+    )
+
+    assert [terminal.name for terminal in terminals] == [
+        "VAV-0 Zone 0",
+        "VAV-1 Zone 1",
+        "VAV-2 Zone 2",
+    ]
+    assert [zone.name for zone in loop.thermal_zones] == ["Zone 0", "Zone 1", "Zone 2"]
+    assert all(t.raw.maximumAirFlowRate().get() == 0.25 for t in terminals)
+    assert terminals[1].reheat_coil.name == "VAV-1 Zone 1 Reheat Coil"
+    assert terminals[1].reheat_coil.handle != template.reheat_coil.handle
+    assert not template.raw.airLoopHVAC().is_initialized()
+    demand = {component.handle for component in hot_water.demand_components}
+    assert {terminal.reheat_coil.handle for terminal in terminals} <= demand
+
+
+def test_add_branches_rolls_back_every_branch_when_a_zone_fails():
+    model = osmo.Model.new()
+    raw = model.raw
+    loop = model.air_loop.create(name="VAV")
+    hot_water = model.plant_loop.create(name="HW Loop")
+    loop.add_branch(model.thermal_zone.create(name="Existing"))
+    zones = [model.thermal_zone.create(name=f"Zone {index}") for index in range(3)]
+    demand_before = len(hot_water.demand_components)
+
+    def factory(zone):
+        if zone.name == "Zone 2":
+            raise RuntimeError("no terminal for Zone 2")
+        return model.air_terminal_single_duct_vav_reheat.create(name="Terminal")
+
+    try:
+        loop.add_branches(zones, factory, plant_loop=hot_water)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("expected the factory error to propagate")
+
+    assert [zone.name for zone in loop.thermal_zones] == ["Existing"]
+    assert len(raw.getAirTerminalSingleDuctVAVReheats()) == 0
+    assert len(raw.getCoilHeatingWaters()) == 0
+    assert len(hot_water.demand_components) == demand_before
+    assert [zone.name for zone in loop.topology().zones] == ["Existing"]
+
+
+def test_clone_for_copies_supply_side_per_zone_group_and_remaps_plants():
+    model = osmo.Model.new()
+    hot_water = model.plant_loop.create(name="HW")
+    hot_water.add_pump(model.pump_variable_speed.create(name="HW Pump"))
+    hot_water.add_manager(model.setpoint_manager_scheduled.create(name="HW SPM", value=80.0))
+    loop = model.air_loop.create(name="AHU")
+    preheat = model.coil_heating_water.create(name="AHU Preheat")
+    loop.add_to_supply(model.fan_variable_volume.create(name="AHU Fan"), preheat)
+    hot_water.add_demand(preheat)
+    loop.add_erv(0.7, 0.6)
+    terminal = model.air_terminal_single_duct_vav_reheat.create(name="Lobby VAV")
+    hot_water.add_demand(terminal.reheat_coil)
+    loop.add_branch(model.thermal_zone.create(name="Lobby"), terminal=terminal)
+    zones = [model.thermal_zone.create(name=f"Room {index}") for index in range(3)]
+
+    second_plant = hot_water.clone("HW East", share_schedules=False)
+    copies = loop.clone_for(
+        [zones[:2], zones[2]],
+        name_pattern="AHU Floor {index}",
+        plant_loops={hot_water: second_plant},
+    )
+
+    assert [copy.name for copy in copies] == ["AHU Floor 1", "AHU Floor 2"]
+    first = copies[0]
+    assert [
+        component.name
+        for component in first.supply_components
+        if component.raw.iddObjectType().valueDescription() != "OS:Node"
+    ] == [
+        "AHU Floor 1 OA System",
+        "AHU Floor 1 Fan",
+        "AHU Floor 1 Preheat",
+    ]
+    assert [
+        hx.name for hx in first.components_in("heat_exchanger", include_subcomponents=True)
+    ] == ["AHU Floor 1 ERV"]
+    assert [zone.name for zone in first.thermal_zones] == ["Room 0", "Room 1"]
+    assert [zone.name for zone in copies[1].thermal_zones] == ["Room 2"]
+    assert [t.name for t in first.topology().components_of_kind("terminal")] == [
+        "Room 0 Air Terminal",
+        "Room 1 Air Terminal",
+    ]
+
+    east_coils = {
+        component.name
+        for component in second_plant.demand_components
+        if component.raw.iddObjectType().valueDescription() == "OS:Coil:Heating:Water"
+    }
+    assert east_coils == {
+        "AHU Floor 1 Preheat",
+        "AHU Floor 2 Preheat",
+        "Room 0 Air Terminal Reheat Coil",
+        "Room 1 Air Terminal Reheat Coil",
+        "Room 2 Air Terminal Reheat Coil",
+    }
+    assert [c.name for c in second_plant.supply_components if c.name.startswith("HW")] == [
+        "HW East Pump"
+    ]
+    east_manager = second_plant.setpoint_managers[0]
+    assert east_manager.name == "HW East SPM"
+    assert east_manager.raw.to_SetpointManagerScheduled().get().schedule().nameString() == (
+        "HW East SPM Schedule"
+    )
+
+    empty = loop.clone_for(count=2)
+    assert [len(copy.thermal_zones) for copy in empty] == [0, 0]
+    assert empty[0].topology().components_of_kind("terminal") == []
+
+
+def test_clone_for_numbers_terminals_and_rolls_back_on_failure():
+    model = osmo.Model.new()
+    hot_water = model.plant_loop.create(name="HW")
+    loop = model.air_loop.create(name="AHU")
+    preheat = model.coil_heating_water.create(name="AHU Preheat")
+    loop.add_to_supply(model.fan_variable_volume.create(name="AHU Fan"), preheat)
+    hot_water.add_demand(preheat)
+    terminal = model.air_terminal_single_duct_vav_reheat.create(name="Lobby VAV")
+    hot_water.add_demand(terminal.reheat_coil)
+    loop.add_branch(model.thermal_zone.create(name="Lobby"), terminal=terminal)
+    zones = [model.thermal_zone.create(name=f"Room {index}") for index in range(3)]
+
+    copy = loop.clone_for([zones[:2]], terminal_pattern="{zone} VAV {index}")[0]
+    assert [t.name for t in copy.topology().components_of_kind("terminal")] == [
+        "Room 0 VAV 0",
+        "Room 1 VAV 1",
+    ]
+
+    objects_before = len(model.raw.objects())
+    demand_before = len(hot_water.raw.demandComponents())
+    # A space cannot be attached as a zone; the second copy fails midway.
+    space = model.space.create(name="Not A Zone")
+    objects_before += 1
+    try:
+        loop.clone_for([zones[2], space])
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("Expected the second copy to fail")
+    assert len(model.raw.objects()) == objects_before
+    assert len(hot_water.raw.demandComponents()) == demand_before
+    assert sorted(air_loop.name for air_loop in model.air_loops) == ["AHU", copy.name]
+
+
+def test_clone_renames_parts_by_position_not_list_order():
+    from osmosis.cloning import _air_loop_parts, _rename_parts
+
+    model = osmo.Model.new()
+    loop = model.air_loop.create(name="AHU")
+    loop.add_to_supply(
+        model.fan_variable_volume.create(name="AHU Fan"),
+        model.coil_heating_electric.create(name="AHU Heating Coil"),
+    )
+    loop.add_manager(model.setpoint_manager_scheduled.create(name="AHU SPM", value=13.0))
+
+    raw_clone = loop.raw.clone(model.raw).to_AirLoopHVAC().get()
+    raw_clone.setName("Copy")
+    for component in raw_clone.supplyComponents():
+        if component.iddObjectType().valueDescription() == "OS:Fan:VariableVolume":
+            component.to_StraightComponent().get().remove()
+    _rename_parts(_air_loop_parts(loop.raw), _air_loop_parts(raw_clone), "AHU", "Copy")
+
+    names = sorted(part.nameString() for part in _air_loop_parts(raw_clone).values())
+    assert names == ["Copy Heating Coil", "Copy SPM"]
+
+
+def test_outdoor_air_controllers_configure_filters_and_reports_changes():
+    model = osmo.Model.new()
+    for name, zone_name in (("Hall AHU", "Assembly Hall"), ("Office AHU", "Office")):
+        loop = model.air_loop.create(name=name)
+        oa_system = model.air_loop_hvac_outdoor_air_system.create(name=f"{name} OA")
+        controller = oa_system.raw.getControllerOutdoorAir()
+        controller.setName(f"{name} OA Controller")
+        loop.add_outdoor_air(oa_system, controller, controller.controllerMechanicalVentilation())
+        loop.add_branch(model.thermal_zone.create(name=zone_name))
+
+    dcv = model.outdoor_air_controllers.configure(
+        filter=lambda target: any(zone.name.startswith("Assembly") for zone in target.zones),
+        demand_controlled_ventilation=True,
+    )
+
+    assert dcv["changes"] == [
+        ("Hall AHU OA Controller", "demand_controlled_ventilation", False, True)
+    ]
+    assert dcv["filtered"] == ["Office AHU OA Controller"]
+
+    economizer = model.outdoor_air_controllers.configure(
+        economizer_control_type="DifferentialDryBulb"
+    )
+    assert len(economizer["changes"]) == 2
+    again = model.outdoor_air_controllers.configure(
+        economizer_control_type="DifferentialDryBulb"
+    )
+    assert again["changes"] == []
+    assert sorted(again["unchanged"]) == ["Hall AHU OA Controller", "Office AHU OA Controller"]
+
+    try:
+        model.outdoor_air_controllers.configure(not_a_setting=1)
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("Expected unknown settings to be rejected")
@@ -0,0 +1,95 @@
+import json
+
+import osmosis as osmo
+
+
+def _save_model(path, loop_name):
+    model = osmo.Model.new()
+    loop = model.air_loop.create(name=loop_name)
+    loop.add_branch(model.thermal_zone.create(name="Zone 1"))
+    model.plant_loop.create(name="HW Loop")
+    model.save(str(path), True)
+    return model
+
+
+def test_export_diagrams_writes_loop_files_index_and_skips_unchanged(tmp_path):
+    first = tmp_path / "first.osm"
+    second = tmp_path / "second.osm"
+    _save_model(first, "AHU 1")
+    _save_model(second, "AHU 2")
+    out_dir = tmp_path / "diagrams"
+
+    report = osmo.export_diagrams([first, second], str(out_dir), workers=2)
+
+    assert sorted(report["written"]) == [
+        "first/AHU_1.mmd",
+        "first/HW_Loop.mmd",
+        "second/AHU_2.mmd",
+        "second/HW_Loop.mmd",
+    ]
+    assert report["skipped"] == []
+    assert "Zone 1" in (out_dir / "first" / "AHU_1.mmd").read_text(encoding="utf-8")
+    index = (out_dir / report["index"]).read_text(encoding="utf-8")
+    assert 'href="second/AHU_2.mmd"' in index
+    assert "first" in json.loads((out_dir / "diagrams.json").read_text())["models"]
+
+    changed = osmo.Model.load(str(first))
+    changed.air_loops[0].name = "AHU 1"
+    changed.air_loops[0].add_branch(changed.thermal_zone.create(name="Zone 2"))
+    changed.save(str(first), True)
+
+    report = osmo.export_diagrams([first, second], str(out_dir), workers=1)
+    assert report["written"] == ["first/AHU_1.mmd"]
+    assert len(report["skipped"]) == 3
+
+
+def test_export_diagrams_renders_model_objects_as_html(tmp_path):
+    model = _save_model(tmp_path / "model.osm", "AHU")
+
+    report = osmo.export_diagrams(model, str(tmp_path / "out"), format="html")
+
+    page = (tmp_path / "out" / "model" / "AHU.html").read_text(encoding="utf-8")
+    assert report["written"] == ["model/AHU.html", "model/HW_Loop.html"]
+    assert page.startswith("<!DOCTYPE html>") and "<svg" in page
+
+
+def test_export_diagrams_merges_manifest_and_prunes_stale_files(tmp_path):
+    first = tmp_path / "first.osm"
+    second = tmp_path / "second.osm"
+    _save_model(first, "AHU 1")
+    _save_model(second, "AHU 2")
+    out_dir = tmp_path / "diagrams"
+
+    osmo.export_diagrams(first, str(out_dir))
+    osmo.export_diagrams(second, str(out_dir))
+    manifest = json.loads((out_dir / "diagrams.json").read_text())["models"]
+    assert sorted(manifest) == ["first", "second"]
+    assert 'href="first/AHU_1.mmd"' in (out_dir / "index.html").read_text(encoding="utf-8")
+
+    renamed = osmo.Model.load(str(first))
+    renamed.air_loops[0].name = "AHU 9"
+    renamed.save(str(first), True)
+
+    report = osmo.export_diagrams(first, str(out_dir))
+    assert report["written"] == ["first/AHU_9.mmd"]
+    assert report["removed"] == ["first/AHU_1.mmd"]
+    assert not (out_dir / "first" / "AHU_1.mmd").exists()
+    assert (out_dir / "second" / "AHU_2.mmd").exists()
+
+
+def test_export_diagrams_keeps_in_memory_models_apart(tmp_path):
+    out_dir = tmp_path / "diagrams"
+    models = []
+    for building, loop_name in (("North Tower", "AHU N"), ("South Tower", "AHU S")):
+        model = osmo.Model.new()
+        model.raw.getBuilding().setName(building)
+        model.air_loop.create(name=loop_name)
+        models.append(model)
+
+    osmo.export_diagrams(models[0], str(out_dir))
+    report = osmo.export_diagrams(models[1], str(out_dir))
+
+    assert report["written"] == ["South_Tower/AHU_S.mmd"] and report["removed"] == []
+    assert (out_dir / "North_Tower" / "AHU_N.mmd").exists()
+    manifest = json.loads((out_dir / "diagrams.json").read_text())["models"]
+    assert sorted(manifest) == ["North_Tower", "South_Tower"]
@@ -50,3 +50,93 @@ def test_plant_loop_mermaid_shows_supply_managers_and_demand():
     assert "Setpoint Manager Outdoor Air Reset<br/>HW Reset" in diagram
     assert "SO --> DI" in diagram
     assert "DO -. return .-> SI" in diagram
+
+
+def test_plant_loop_diagram_snapshot_fingerprint_tracks_structure():
+    model = osmo.Model.new()
+    loop = model.plant_loop.create(name="Heating Loop")
+    loop.add_supply(model.boiler_hot_water.create(name="Boiler"))
+    before = loop.diagram_snapshot()
+
+    loop.add_demand(model.coil_heating_water.create(name="AHU Heating Coil"))
+    after = loop.diagram_snapshot()
+
+    assert after.fingerprint != before.fingerprint
+    assert "AHU Heating Coil" in loop._build_mermaid(snapshot=after)
+    assert "AHU Heating Coil" not in loop._build_mermaid(snapshot=before)
+
+
+def test_plant_loop_to_svg_renders_supply_and_demand():
+    model = osmo.Model.new()
+    loop = model.plant_loop.create(name="Hot Water Loop")
+    loop.add_demand(model.coil_heating_water.create(name="HW Coil"))
+
+    svg = loop.to_svg()
+
+    assert svg.startswith("<svg")
+    assert "HW Coil" in svg
+
+
+def test_water_component_index_tracks_plant_connections():
+    model = osmo.Model.new()
+    loop = model.plant_loop.create(name="HW Loop")
+    connected = model.coil_heating_water.create(name="Connected Coil")
+    loose = model.coil_heating_water.create(name="Loose Coil")
+    loop.add_demand(connected)
+
+    index = model.water_component_index()
+
+    assert index.plant_loop(connected).name == "HW Loop"
+    assert index.plant_loop(loose) is None
+    assert [coil.name for coil in index.unconnected()] == ["Loose Coil"]
+
+    loop.add_demand(loose)
+
+    assert index.unconnected() == []
+    assert index.plant_loop(loose, side="demand").name == "HW Loop"
+
+    loose.remove()
+    assert loose not in index and len(index) == 1
+    loop.remove()
+    assert len(index) == 0 and index.unconnected() == []
+
+
+def test_plant_loop_connect_all_reports_and_configures_controllers():
+    model = osmo.Model.new()
+    loop = model.plant_loop.create(name="CHW Loop")
+    other = model.plant_loop.create(name="Other Loop")
+    ahu_coil = model.coil_cooling_water.create(name="AHU Coil")
+    spare = model.coil_cooling_water.create(name="Spare Coil")
+    elsewhere = model.coil_cooling_water.create(name="Elsewhere Coil")
+    model.coil_heating_water.create(name="Left Out Coil")
+    other.add_demand(elsewhere)
+
+    assert "_water_component_index" not in model.__dict__
+    report = loop.connect_all([ahu_coil, spare, elsewhere], convergence_tolerance=0.01)
+
+    assert report["connected"] == ["AHU Coil", "Spare Coil"]
+    assert report["skipped"] == ["Elsewhere Coil"]
+    assert report["failed"] == []
+    assert report["controllers"] == 2
+    assert report["unconnected"] == ["Left Out Coil"]
+    assert ahu_coil.controller_water_coil.controller_convergence_tolerance == 0.01
+    index = model.water_component_index()
+    assert index is model.__dict__["_water_component_index"]
+    assert index.plant_loop(spare).name == "CHW Loop"
+
+
+def test_plant_loop_connect_all_reports_coils_created_after_the_index():
+    model = osmo.Model.new()
+    loop = model.plant_loop.create(name="HW Loop")
+    model.water_component_index()
+    first = model.coil_heating_water.create(name="C1")
+    model.coil_heating_water.create(name="C3")
+    model.coil_heating_water.create(name="C4")
+    raw_connected = model.coil_heating_water.create(name="Raw Coil")
+    loop.raw.addDemandBranchForComponent(raw_connected.raw)
+
+    report = loop.connect_all([first, raw_connected])
+
+    assert report["connected"] == ["C1"]
+    assert report["skipped"] == ["Raw Coil"]
+    assert sorted(report["unconnected"]) == ["C3", "C4"]
@@ -84,3 +84,64 @@ def test_outdoor_air_reset_collection_is_accessible():
     spm.setName("SAT Reset 2")
     resets = model.setpoint_manager_outdoor_air_resets
     assert any(r.name == "SAT Reset 2" for r in resets)
+
+
+def test_setpoint_manager_index_flags_conflicts_and_missing_setpoints():
+    model = osmo.Model.new()
+    air_loop = model.air_loop.create(name="AHU")
+    plant = model.plant_loop.create(name="CHW Loop")
+    coil = model.coil_cooling_water.create(name="Cooling Coil")
+    air_loop.add_to_supply(coil)
+    plant.add_demand(coil)
+    coil.configure_water_coil_controller()
+
+    first = model.setpoint_manager_scheduled.create(name="SAT 1", value=12.8)
+    second = model.setpoint_manager_scheduled.create(name="SAT 2", value=13.0)
+    air_loop.add_manager(first)
+    # OpenStudio replaces same-variable managers on addToNode; loaded files
+    # can still carry duplicates.
+    node_field = second.raw.iddObject().getFieldIndex("Setpoint Node or NodeList Name").get()
+    second.raw.setPointer(node_field, air_loop.supply_outlet_node.raw.handle())
+
+    index = model.setpoint_manager_index()
+
+    assert sorted(manager.name for manager in index.managers(air_loop.supply_outlet_node)) == [
+        "SAT 1",
+        "SAT 2",
+    ]
+    [conflict] = index.conflicts()
+    assert conflict.control_variable == "Temperature"
+    assert sorted(manager.name for manager in conflict.managers) == ["SAT 1", "SAT 2"]
+    assert index.check()["missing_supply_outlets"] == ["CHW Loop"]
+    assert index.check()["unmanaged_controller_sensors"] == []
+
+
+def test_setpoint_manager_index_place_managers_in_bulk():
+    model = osmo.Model.new()
+    air_loop = model.air_loop.create(name="AHU")
+    hot_water = model.plant_loop.create(name="HW Loop")
+    chilled_water = model.plant_loop.create(name="CHW Loop")
+    index = model.setpoint_manager_index()
+
+    report = index.place_managers(
+        {
+            air_loop: {"type": "setpoint_manager_scheduled", "value": 12.8},
+            hot_water: [{"type": "setpoint_manager_scheduled", "value": 82.0, "name": "{loop} Reset"}],
+            chilled_water: {"type": "setpoint_manager_scheduled", "value": 6.7},
+        }
+    )
+
+    assert report == {
+        "placed": ["AHU Setpoint Manager", "HW Loop Reset", "CHW Loop Setpoint Manager"],
+        "replaced": [],
+        "skipped": [],
+    }
+    assert index.check()["missing_supply_outlets"] == []
+    assert [manager.name for manager in air_loop.setpoint_managers] == ["AHU Setpoint Manager"]
+
+    skipped = index.place_managers(
+        {air_loop: {"type": "setpoint_manager_scheduled", "value": 14.0}}, replace=False
+    )
+    assert skipped["placed"] == []
+    assert len(skipped["skipped"]) == 1
+    assert len(model.setpoint_managers) == 3
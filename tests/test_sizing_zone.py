@@ -10,3 +10,39 @@ def test_sizing_zone_account_for_dedicated_outdoor_air_system_alias():
 
     assert sizing_zone.account_for_dedicated_outdoor_air_system is True
     assert sizing_zone.raw.accountforDedicatedOutdoorAirSystem() is True
+
+
+def test_configure_zone_sizing_applies_arrays_scalars_and_doas():
+    model = osmo.Model.new()
+    zones = [model.thermal_zone.create(name=f"Zone {index}") for index in range(3)]
+
+    report = model.configure_zone_sizing(
+        zones,
+        cooling=[12.0, 13.0, float("nan")],
+        heating=35.0,
+        doas={"low_setpoint_temperature": 18.0, "control_strategy": "ColdSupplyAir"},
+    )
+
+    raw_sizing = [zone.raw.sizingZone() for zone in zones]
+    assert [sizing.zoneCoolingDesignSupplyAirTemperature() for sizing in raw_sizing][:2] == [
+        12.0,
+        13.0,
+    ]
+    assert raw_sizing[2].zoneCoolingDesignSupplyAirTemperature() == 14.0
+    assert all(sizing.zoneHeatingDesignSupplyAirTemperature() == 35.0 for sizing in raw_sizing)
+    assert all(sizing.accountforDedicatedOutdoorAirSystem() for sizing in raw_sizing)
+    assert raw_sizing[0].dedicatedOutdoorAirSystemControlStrategy() == "ColdSupplyAir"
+    assert ("Zone 0", "zone_cooling_design_supply_air_temperature", 14.0, 12.0) in report["changes"]
+    assert report["failed"] == [] and report["unchanged"] == []
+
+    again = model.configure_zone_sizing({"name": ["Zone 1", "Missing"], "heating": [35.0, 30.0]})
+    assert again["changes"] == []
+    assert again["unchanged"] == ["Zone 1"]
+    assert again["unknown_zones"] == ["Missing"]
+
+    try:
+        model.configure_zone_sizing(zones, cooling=[12.0])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Expected a length mismatch to raise ValueError")
@@ -1,4 +1,5 @@
 import os
+import pytest
 import osmosis as osmo
 
 
@@ -87,3 +88,185 @@ def test_space_type():
 
     space_type = space.space_type
     assert space_type is None or hasattr(space_type, '_os_obj')
+
+
+def test_model_space_geometry_matches_per_space_values():
+    """Test whole-model geometry arrays against per-space SDK calls."""
+    np = pytest.importorskip("numpy")
+    base = os.path.dirname(__file__)
+    model = osmo.Model.load(os.path.join(base, "data", "Model.osm"))
+
+    geometry = model.space_geometry()
+
+    assert len(geometry) == len(model.spaces)
+    assert geometry.offsets[-1] == len(geometry.vertices)
+    for space in model.spaces:
+        raw = space.raw
+        row = geometry.position(space)
+        assert geometry.names[row] == space.name
+        assert geometry.floor_area[row] == raw.floorArea()
+        assert geometry.volume[row] == raw.volume()
+        if raw.floorArea() > 0:
+            expected = [
+                (point.x(), point.y())
+                for point in raw.transformation() * raw.floorPrint()
+            ]
+            assert np.allclose(geometry.polygon(row), expected)
+            assert np.all(geometry.centroid[row] >= geometry.bbox[row, :2] - 1e-9)
+            assert np.all(geometry.centroid[row] <= geometry.bbox[row, 3:5] + 1e-9)
+        story = raw.buildingStory()
+        if story.is_initialized():
+            assert geometry.stories[geometry.story[row]] == story.get().nameString()
+        else:
+            assert geometry.story[row] == -1
+
+
+def _box_space(model, name, x, y, z, width=10.0, height=3.0):
+    import openstudio
+
+    points = openstudio.Point3dVector()
+    for px, py in ((x, y), (x, y + width), (x + width, y + width), (x + width, y)):
+        points.append(openstudio.Point3d(px, py, z))
+    raw = openstudio.model.Space.fromFloorPrint(points, height, model.raw).get()
+    raw.setName(name)
+    return osmo.wrap(raw)
+
+
+def test_spatial_index_neighbors_stacking_and_surface_pairs():
+    """Test spatial index queries on a small block of box spaces."""
+    pytest.importorskip("numpy")
+    model = osmo.Model.new()
+    ground = _box_space(model, "Ground", 0, 0, 0)
+    _box_space(model, "Beside", 10, 0, 0)
+    _box_space(model, "Upper", 0, 0, 3)
+    _box_space(model, "Far", 100, 100, 0)
+
+    index = model.spatial_index()
+
+    assert sorted(space.name for space in index.neighbors(ground)) == ["Beside", "Upper"]
+    assert [space.name for space in index.stacked_above(ground)] == ["Upper"]
+    assert [space.name for space in index.spaces_in_bbox((95, 95, 120, 120))] == ["Far"]
+    assert len(index.candidate_pairs()) == 3
+
+    pairs = {
+        frozenset(
+            (surface.raw.space().get().nameString(), surface.surface_type)
+            for surface in pair
+        )
+        for pair in index.surface_pairs()
+    }
+    assert pairs == {
+        frozenset({("Ground", "Wall"), ("Beside", "Wall")}),
+        frozenset({("Ground", "RoofCeiling"), ("Upper", "Floor")}),
+    }
+
+    assert model.spatial_index() is index
+    _box_space(model, "Added", 20, 0, 0)
+    assert model.spatial_index() is not index
+
+    # Same object counts, different spaces.
+    index = model.spatial_index()
+    model.raw.getSpaceByName("Far").get().remove()
+    _box_space(model, "Replacement", 100, 100, 0)
+    assert model.spatial_index() is not index
+    assert [space.name for space in model.spatial_index().spaces_in_bbox((95, 95, 120, 120))] == [
+        "Replacement"
+    ]
+
+
+def _surface_layout(model):
+    layout = []
+    for raw_space in model.raw.getSpaces():
+        transformation = raw_space.transformation()
+        for raw_surface in raw_space.surfaces():
+            adjacent = raw_surface.adjacentSurface()
+            layout.append((
+                raw_space.nameString(),
+                tuple(sorted(
+                    (round(point.x(), 4), round(point.y(), 4), round(point.z(), 4))
+                    for point in transformation * raw_surface.vertices()
+                )),
+                adjacent.get().space().get().nameString() if adjacent.is_initialized() else None,
+            ))
+    return sorted(layout)
+
+
+def test_intersect_and_match_matches_full_sdk_pass():
+    """Test index-pruned intersection gives the same surfaces as the SDK."""
+    pytest.importorskip("numpy")
+    import openstudio
+
+    models = [osmo.Model.new(), osmo.Model.new()]
+    for model in models:
+        _box_space(model, "Ground", 0, 0, 0)
+        _box_space(model, "Small Beside", 10, 2, 0, width=5)
+        _box_space(model, "Upper", 0, 0, 3)
+        _box_space(model, "Corner", 10, 10, 3)
+        _box_space(model, "Far", 100, 100, 0)
+    indexed, full = models
+
+    report = indexed.intersect_and_match()
+    spaces = openstudio.model.SpaceVector(full.raw.getSpaces())
+    openstudio.model.intersectSurfaces(spaces)
+    openstudio.model.matchSurfaces(spaces)
+
+    assert _surface_layout(indexed) == _surface_layout(full)
+    assert report["pairs_total"] == 10
+    assert report["pairs_checked"] == 2
+    assert report["pairs_pruned"] == 8
+    assert report["surfaces_added"] > 0
+
+
+def test_auto_zone_groups_by_story_orientation_and_property():
+    """Test auto_zone plans, assigns and reuses zones."""
+    pytest.importorskip("numpy")
+    model = osmo.Model.new()
+    story = model.building_story.create(name="Level 1")
+    spaces = {}
+    for column in range(3):
+        for row in range(3):
+            space = _box_space(model, f"Space {column}{row}", column * 10, row * 10, 0)
+            space.raw.setBuildingStory(story.raw)
+            model.thermal_zone.create(name=f"Zone {column}{row}").add_space(space)
+            spaces[column, row] = space
+    import openstudio
+
+    openstudio.model.matchSurfaces(openstudio.model.SpaceVector(model.raw.getSpaces()))
+
+    plan = model.auto_zone(strategy=("story", "orientation"), dry_run=True)
+    assert plan["zones"]["Level 1 Core"] == ["Space 11"]
+    assert sorted(plan["zones"]["Level 1 West Perimeter"]) == ["Space 01"]
+    assert len(model.thermal_zones) == 9
+
+    spaces[0, 0].additional_properties.Wing = "A"
+    report = model.auto_zone(strategy="exposure", property_name="Wing")
+    zones = {zone.name: len(zone.raw.spaces()) for zone in model.thermal_zones}
+    assert zones == {
+        "Walls+Roof+Ground A": 1,
+        "Walls+Roof+Ground No Wing": 7,
+        "Roof+Ground No Wing": 1,
+    }
+    assert report["created"] == ["Walls+Roof+Ground No Wing"]
+    assert len(report["removed"]) == 7
+
+    again = model.auto_zone(strategy="exposure", property_name="Wing")
+    assert again["created"] == [] and len(again["reused"]) == 3
+
+
+def test_auto_zone_reads_stories_and_properties_after_a_dry_run():
+    """Test auto_zone sees raw SDK edits made after a dry run."""
+    pytest.importorskip("numpy")
+    model = osmo.Model.new()
+    spaces = [_box_space(model, f"Space {column}", column * 10, 0, 0) for column in range(2)]
+
+    plan = model.auto_zone(strategy="story", property_name="Wing", dry_run=True)
+    assert list(plan["zones"]) == ["No Story No Wing"]
+
+    story = model.building_story.create(name="Level 1")
+    spaces[0].raw.setBuildingStory(story.raw)
+    spaces[1].raw.additionalProperties().setFeature("Wing", "B")
+    plan = model.auto_zone(strategy="story", property_name="Wing", dry_run=True)
+    assert plan["zones"] == {
+        "Level 1 No Wing": ["Space 0"],
+        "No Story B": ["Space 1"],
+    }
@@ -1,5 +1,7 @@
 import os
 
+import pytest
+
 import osmosis as osmo
 
 
@@ -32,3 +34,119 @@ def test_space_type_load():
     assert space.space_type is not None
     assert space.space_type.name == template_space_type.name
     model.save(path_out)
+
+
+def test_internal_load_summary_matches_sdk_space_totals():
+    """Test load rollups against the SDK's per-space totals."""
+    pytest.importorskip("numpy")
+    import openstudio
+
+    base = os.path.dirname(__file__)
+    model = osmo.Model.load(os.path.join(base, "data", "Model.osm"))
+    raw_space = model.raw.getSpaces()[0]
+    definition = openstudio.model.LightsDefinition(model.raw)
+    definition.setWattsperPerson(5.0)
+    lights = openstudio.model.Lights(definition)
+    lights.setSpace(raw_space)
+    lights.setMultiplier(2.0)
+
+    spaces = model.internal_load_summary()
+    for row, raw in enumerate(model.raw.getSpaces()):
+        assert spaces["name"][row] == raw.nameString()
+        assert spaces["people"][row] == pytest.approx(raw.numberOfPeople())
+        assert spaces["lighting_power"][row] == pytest.approx(raw.lightingPower())
+        assert spaces["equipment_power"][row] == pytest.approx(raw.electricEquipmentPower())
+
+    tables = model.internal_load_summary(["zone", "story"])
+    zones = tables["zone"]
+    assert sorted(zones["name"]) == sorted(
+        raw.nameString() for raw in model.raw.getThermalZones() if len(raw.spaces())
+    )
+    assert zones["lighting_power"].sum() == pytest.approx(spaces["lighting_power"].sum())
+    assert zones["lighting_power_density"][0] == pytest.approx(
+        zones["lighting_power"][0] / zones["floor_area"][0]
+    )
+    assert all(len(names) for names in zones["people_schedules"])
+
+
+def test_space_type_library_clones_each_template_once():
+    base = os.path.dirname(__file__)
+    path = os.path.join(base, "data", "NECB2017_space_types.osm")
+    library = osmo.SpaceTypeLibrary.load(path)
+    assert osmo.SpaceTypeLibrary.load(path) is library
+    assert library.find(building_type="Space Function")
+
+    model = osmo.Model.load(os.path.join(base, "data", "Model.osm"))
+    space_types_before = len(model.raw.getSpaceTypes())
+    schedules_before = len(model.raw.getSchedules())
+    template = library.names()[0]
+    mapping = {space.name: template for space in model.spaces}
+    mapping["Missing Space"] = template
+
+    report = library.assign(model, mapping)
+
+    assert report["cloned"] == [template]
+    assert report["unknown_spaces"] == ["Missing Space"]
+    assert all(space.space_type.name == template for space in model.spaces)
+    assert len(model.raw.getSpaceTypes()) == space_types_before + 1
+    schedules_after = len(model.raw.getSchedules())
+
+    again = library.assign(model, [(model.spaces[0], library[template])])
+    assert again["cloned"] == [] and again["reused"] == [template]
+    assert library.clone_into(model, template).name == template
+    assert len(model.raw.getSpaceTypes()) == space_types_before + 1
+    assert len(model.raw.getSchedules()) == schedules_after > schedules_before
+
+
+def test_space_type_library_reports_unrelated_same_name_types():
+    base = os.path.dirname(__file__)
+    library = osmo.SpaceTypeLibrary.load(os.path.join(base, "data", "NECB2017_space_types.osm"))
+    template, other = library.names()[:2]
+
+    model = osmo.Model.load(os.path.join(base, "data", "Model.osm"))
+    model.space_type.create(name=template)
+    space_types_before = len(model.raw.getSpaceTypes())
+
+    report = library.assign(model, {space.name: template for space in model.spaces})
+    assert report["conflicts"] == [template]
+    assert report["assigned"] == [] and report["reused"] == []
+    assert len(model.raw.getSpaceTypes()) == space_types_before
+    try:
+        library.clone_into(model, template)
+    except ValueError as exc:
+        assert template in str(exc)
+    else:
+        raise AssertionError("Expected ValueError for an unrelated same-name space type")
+
+    # Marked clones are found again after a rename.
+    clone = library.clone_into(model, other)
+    clone.name = "Renamed"
+    again = library.assign(model, [(model.spaces[0], other)])
+    assert again["reused"] == ["Renamed"] and again["cloned"] == []
+    assert len(model.raw.getSpaceTypes()) == space_types_before + 1
+
+
+def test_dedupe_load_definitions_repoints_loads():
+    import openstudio
+
+    model = osmo.Model.new()
+    for index in range(3):
+        definition = openstudio.model.LightsDefinition(model.raw)
+        definition.setName(f"LPD {index}")
+        definition.setWattsperSpaceFloorArea(8.0 if index < 2 else 12.0)
+        lights = openstudio.model.Lights(definition)
+        lights.setName(f"Lights {index}")
+    for name in ("Unused People", "Unused People Copy"):
+        openstudio.model.PeopleDefinition(model.raw).setName(name)
+
+    preview = model.dedupe_load_definitions(dry_run=True)
+    assert preview["merged"] == {"LPD 0": ["LPD 1"], "Unused People": ["Unused People Copy"]}
+    assert preview["repointed"] == ["Lights 1"]
+    assert len(model.raw.getLightsDefinitions()) == 3
+
+    report = model.dedupe_load_definitions()
+    assert report == preview
+    assert sorted(raw.nameString() for raw in model.raw.getLightsDefinitions()) == ["LPD 0", "LPD 2"]
+    assert len(model.raw.getLightss()) == 3
+    assert model.raw.getLightsByName("Lights 1").get().lightsDefinition().nameString() == "LPD 0"
+    assert model.dedupe_load_definitions()["removed"] == []
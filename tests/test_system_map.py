@@ -0,0 +1,83 @@
+import openstudio
+import osmosis as osmo
+from osmosis.system_map import system_map_snapshot
+
+
+def _campus_model():
+    model = osmo.Model.new()
+    raw = model.raw
+    schedule = raw.alwaysOnDiscreteSchedule()
+
+    hot_water = model.plant_loop.create(name="HW Loop")
+    hot_water.add_supply(model.boiler_hot_water.create(name="Boiler"))
+    chilled_water = model.plant_loop.create(name="CHW Loop")
+    condenser = model.plant_loop.create(name="CW Loop")
+    chiller = openstudio.model.ChillerElectricEIR(raw)
+    chiller.setName("Chiller")
+    chilled_water.raw.addSupplyBranchForComponent(chiller)
+    condenser.raw.addDemandBranchForComponent(chiller)
+
+    loop = model.air_loop.create(name="VAV")
+    cooling = model.coil_cooling_water.create(name="CC")
+    loop.add_to_supply(cooling)
+    chilled_water.add_demand(cooling)
+
+    for index in range(3):
+        zone = model.thermal_zone.create(name=f"Zone {index}")
+        coil = model.coil_heating_water.create(name=f"Reheat {index}")
+        hot_water.add_demand(coil)
+        terminal = openstudio.model.AirTerminalSingleDuctVAVReheat(
+            raw, schedule, coil.raw
+        )
+        loop.raw.addBranchForZone(zone.raw, terminal.to_StraightComponent().get())
+
+    for index in range(2):
+        zone = model.thermal_zone.create(name=f"Heated {index}")
+        coil = model.coil_heating_water.create(name=f"UH Coil {index}")
+        hot_water.add_demand(coil)
+        fan = openstudio.model.FanConstantVolume(raw, schedule)
+        heater = openstudio.model.ZoneHVACUnitHeater(raw, schedule, fan, coil.raw)
+        heater.addToThermalZone(zone.raw)
+    return model, loop, chiller
+
+
+def test_system_map_deduplicates_shared_equipment_and_links_water_coils():
+    model, loop, chiller = _campus_model()
+    snapshot = system_map_snapshot(model.raw)
+
+    loops = {entry.name: entry for entry in snapshot.loops}
+    chiller_id = "n" + str(chiller.handle()).strip("{}").replace("-", "")[:12]
+    assert [item.name for item in loops["CHW Loop"].components] == ["Chiller"]
+    assert loops["CW Loop"].components == ()
+    assert (loops["CW Loop"].id, chiller_id) in snapshot.links
+
+    assert [group.count for group in snapshot.zone_equipment] == [2]
+    hot_water_targets = [
+        target for source, target in snapshot.links if source == loops["HW Loop"].id
+    ]
+    zone_ids = {zone.id for zone in loops["VAV"].zones}
+    assert zone_ids <= set(hot_water_targets)
+    assert snapshot.zone_equipment[0].id in hot_water_targets
+    assert len(hot_water_targets) == 4
+
+    source = str(model.system_map())
+    assert source.count(f"{chiller_id}[") == 1
+    assert '["Zone HVAC Unit Heater &times;2"]' in source
+    assert f"{loops['CW Loop'].id} -.-> {chiller_id}" in source
+
+
+def test_system_map_summarizes_zone_fan_out_and_collapses_loops():
+    model, loop, _chiller = _campus_model()
+    loops = {entry.name: entry for entry in system_map_snapshot(model.raw).loops}
+    vav_id = loops["VAV"].id
+
+    summarized = str(model.system_map(max_zones=2))
+    assert f'{vav_id}_ZONES[["3 Zones"]]' in summarized
+    assert "Zone 0" not in summarized
+    assert f"{loops['HW Loop'].id} -.-> {vav_id}_ZONES" in summarized
+
+    diagram = model.system_map(collapse=["VAV"])
+    assert f'{vav_id}["Air Loop: VAV<br/>3 Zones"]' in diagram.source
+    assert f"subgraph {loops['HW Loop'].id} " in diagram.source
+    assert f"{loops['CHW Loop'].id} -.-> {vav_id}" in diagram.source
+    assert diagram.minimized_source.count("subgraph") == 1
@@ -0,0 +1,176 @@
+import copy
+
+import osmosis as osmo
+from osmosis import SystemTemplate
+
+VAV_REHEAT = {
+    "name": "VAV Reheat",
+    "air_loop": {
+        "name": "{group} VAV",
+        "supply": [
+            {"type": "fan_variable_volume", "name": "{loop} Fan"},
+            {"type": "coil_cooling_water", "name": "{loop} Cooling Coil", "plant": "chw"},
+        ],
+        "outdoor_air": True,
+        "managers": [{"type": "setpoint_manager_scheduled", "value": 12.8}],
+        "terminal": {
+            "type": "air_terminal_single_duct_vav_reheat",
+            "name": "{zone} VAV",
+            "plant": "hw",
+            "maximum_air_flow_rate": 0.3,
+        },
+    },
+    "plants": {
+        "hw": {
+            "name": "Hot Water Loop",
+            "supply": ["boiler_hot_water"],
+            "managers": [{"type": "setpoint_manager_scheduled", "value": 82.0}],
+            "sizing": {"loop_type": "Heating"},
+        },
+        "chw": {
+            "name": "Chilled Water Loop",
+            "supply": ["chiller_electric_eir"],
+            "sizing": {"loop_type": "Cooling"},
+        },
+    },
+}
+
+
+def test_system_template_builds_grouped_loops_on_shared_plants():
+    model = osmo.Model.new()
+    zones = [model.thermal_zone.create(name=f"Zone {index}") for index in range(4)]
+
+    build = model.apply_system_template(
+        VAV_REHEAT, {"East": zones[:2], "West": zones[2:]}
+    )
+    model.apply_system_template(VAV_REHEAT, {"Annex": [model.thermal_zone.create(name="Annex")]})
+
+    assert list(build.air_loops) == ["East VAV", "West VAV"]
+    assert sorted(loop.name for loop in model.plant_loops) == [
+        "Chilled Water Loop",
+        "Hot Water Loop",
+    ]
+    assert [terminal.name for terminal in build.terminals["West VAV"]] == [
+        "Zone 2 VAV",
+        "Zone 3 VAV",
+    ]
+    west = build.air_loops["West VAV"]
+    assert [zone.name for zone in west.thermal_zones] == ["Zone 2", "Zone 3"]
+    assert [coil.name for coil in west.coils] == ["West VAV Cooling Coil"]
+    assert west.raw.airLoopHVACOutdoorAirSystem().is_initialized()
+    assert west.supply_outlet_node.raw.setpointManagers()[0].nameString() == (
+        "West VAV Setpoint Manager"
+    )
+
+    hot_water = build.plant_loops["Hot Water Loop"]
+    assert hot_water.raw.sizingPlant().loopType() == "Heating"
+    reheat = [
+        component.name
+        for component in hot_water.demand_components
+        if component.raw.iddObjectType().valueDescription() == "OS:Coil:Heating:Water"
+    ]
+    assert reheat == [
+        "Zone 0 VAV Reheat Coil",
+        "Zone 1 VAV Reheat Coil",
+        "Zone 2 VAV Reheat Coil",
+        "Zone 3 VAV Reheat Coil",
+        "Annex VAV Reheat Coil",
+    ]
+    chilled_water = build.plant_loops["Chilled Water Loop"]
+    assert sum(
+        component.name.endswith("Cooling Coil")
+        for component in chilled_water.demand_components
+    ) == 3
+    assert len(model.raw.getAirTerminalSingleDuctVAVReheats()) == 5
+
+
+def test_per_zone_template_builds_one_loop_per_zone_and_validates_plants():
+    template = SystemTemplate.from_dict(
+        {
+            "name": "PSZ-AC",
+            "per_zone": True,
+            "air_loop": {
+                "name": "{zone} PSZ-AC",
+                "supply": [
+                    {"type": "fan_constant_volume", "name": "{loop} Fan"},
+                    {"type": "coil_heating_gas", "name": "{loop} Heating Coil"},
+                    {"type": "coil_cooling_dx_single_speed", "name": "{loop} DX Coil"},
+                ],
+                "managers": ["setpoint_manager_single_zone_reheat"],
+            },
+        }
+    )
+    model = osmo.Model.new()
+    zones = [model.thermal_zone.create(name=f"Office {index}") for index in range(2)]
+
+    build = template.apply(model, zones)
+
+    assert list(build.air_loops) == ["Office 0 PSZ-AC", "Office 1 PSZ-AC"]
+    assert build.plant_loops == {}
+    loop = build.air_loops["Office 1 PSZ-AC"]
+    assert [zone.name for zone in loop.thermal_zones] == ["Office 1"]
+    assert [terminal.name for terminal in build.terminals["Office 1 PSZ-AC"]] == [
+        "Office 1 Air Terminal"
+    ]
+    manager = loop.supply_outlet_node.raw.setpointManagers()[0]
+    assert manager.to_SetpointManagerSingleZoneReheat().get().controlZone().get().nameString() == (
+        "Office 1"
+    )
+
+    try:
+        SystemTemplate.from_dict(
+            {"name": "Bad", "air_loop": {"supply": [{"type": "coil_heating_water", "plant": "hw"}]}}
+        )
+    except ValueError as error:
+        assert "unknown plant 'hw'" in str(error)
+    else:
+        raise AssertionError("Expected an unknown plant to raise ValueError")
+
+
+def test_system_template_rejects_duplicate_zones_and_rolls_back_failures():
+    model = osmo.Model.new()
+    zones = [model.thermal_zone.create(name=f"Zone {index}") for index in range(3)]
+    before = len(model.raw.objects())
+
+    try:
+        model.apply_system_template(VAV_REHEAT, {"East": zones[:2], "West": zones[1:]})
+    except ValueError as error:
+        assert "Zone 1" in str(error)
+    else:
+        raise AssertionError("Expected a zone listed twice to raise ValueError")
+    assert len(model.raw.objects()) == before
+
+    # Fails on the terminal, after both air loops and plants are built.
+    broken = copy.deepcopy(VAV_REHEAT)
+    broken["air_loop"]["terminal"]["no_such_field"] = 1.0
+    try:
+        model.apply_system_template(broken, {"East": zones[:2], "West": zones[2:]})
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("Expected an unknown terminal field to raise AttributeError")
+    assert len(model.raw.objects()) == before
+    assert len(model.raw.getAirLoopHVACs()) == 0
+    assert len(model.raw.getPlantLoops()) == 0
+
+
+def test_system_template_names_loops_with_loop_field_and_rejects_bad_sizing():
+    model = osmo.Model.new()
+    zones = [model.thermal_zone.create(name=f"Zone {index}") for index in range(2)]
+    before = len(model.raw.objects())
+
+    bad_sizing = copy.deepcopy(VAV_REHEAT)
+    bad_sizing["plants"]["hw"]["sizing"] = {"loop_type": "Lukewarm"}
+    try:
+        model.apply_system_template(bad_sizing, {"East": zones})
+    except ValueError as error:
+        assert "loop_type" in str(error)
+    else:
+        raise AssertionError("Expected a rejected sizing value to raise ValueError")
+    assert len(model.raw.objects()) == before
+
+    named = copy.deepcopy(VAV_REHEAT)
+    named["air_loop"]["name"] = "{group} {loop}"
+    build = model.apply_system_template(named, {"East": zones})
+    assert list(build.air_loops) == ["East VAV Reheat"]
+    assert model.raw.getFanVariableVolumes()[0].nameString() == "East VAV Reheat Fan"